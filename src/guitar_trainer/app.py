@@ -1,6 +1,15 @@
+import os
 import sys
+import time
+from datetime import date, datetime, timedelta
 
 from guitar_trainer.cli import run_cli
+from guitar_trainer.core.attempt_query import AttemptIndex
+from guitar_trainer.core.pitch_report import pitch_report
+from guitar_trainer.core.profile_export import COLUMNAR_SUFFIX, export_profile, import_profile
+from guitar_trainer.core.session_log import read_sessions
+from guitar_trainer.core.stats import load_stats, merge_stats_files
+from guitar_trainer.core.stats_migrate import migrate_directory
 from guitar_trainer.gui.app_tk import run_gui
 
 
@@ -12,10 +21,265 @@ def _print_help() -> None:
         "  guitar-trainer            Run CLI (default)\n"
         "  guitar-trainer cli        Run CLI\n"
         "  guitar-trainer gui        Run GUI\n"
+        "  guitar-trainer migrate [DIR] [--jobs N]\n"
+        "                            Upgrade stats files in DIR (default: .) to the current format\n"
+        "  guitar-trainer merge TARGET FILE...\n"
+        "                            Merge profiles from other devices into TARGET\n"
+        "  guitar-trainer export PROFILE OUT\n"
+        f"                            Export counters and history to OUT (*{COLUMNAR_SUFFIX} file or CSV directory)\n"
+        "  guitar-trainer import SRC PROFILE [--force]\n"
+        "                            Create PROFILE from an export\n"
+        "  guitar-trainer notes [DIR] [--jobs N]\n"
+        "                            Accuracy per note across all tunings in DIR (default: .)\n"
+        "  guitar-trainer sessions PROFILE [-n N]\n"
+        "                            List the last N (default: 10) quiz/practice sessions\n"
+        "  guitar-trainer days PROFILE [-n N]\n"
+        "                            Attempts per day over the last N (default: 7) days, by string and fret\n"
+        "  guitar-trainer query PROFILE [--mode M] [--note N] [--string S,...] [--fret F,...] [--days D]\n"
+        "                            Accuracy and answer times of the matching recorded attempts\n"
         "  guitar-trainer -h|--help  Show this help\n"
     )
 
 
+def _parse_dir_jobs(args: list[str]) -> tuple[str, int | None] | None:
+    directory = "."
+    jobs = None
+    it = iter(args)
+    for arg in it:
+        if arg in {"-j", "--jobs"}:
+            try:
+                jobs = int(next(it))
+            except (StopIteration, ValueError):
+                print("--jobs needs a number")
+                return None
+        else:
+            directory = arg
+    return directory, jobs
+
+
+def _run_migrate(args: list[str]) -> int:
+    parsed = _parse_dir_jobs(args)
+    if parsed is None:
+        return 2
+    directory, jobs = parsed
+
+    results = migrate_directory(directory, jobs=jobs)
+    if not results:
+        print(f"No stats files found in {directory}")
+        return 0
+
+    failed = 0
+    for path, status in results.items():
+        print(f"{status:10} {path}")
+        failed += status.startswith("failed")
+    return 1 if failed else 0
+
+
+def _run_merge(args: list[str]) -> int:
+    if len(args) < 2:
+        print("Usage: guitar-trainer merge TARGET FILE...")
+        return 2
+
+    target, sources = args[0], args[1:]
+    try:
+        merged = merge_stats_files(target, sources)
+    except FileNotFoundError as e:
+        print(f"No such stats file: {e}")
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Failed to merge into {target}: {e}")
+        return 1
+
+    print(f"Merged {len(sources)} file(s) into {target}: {merged.total_attempts} attempts")
+    return 0
+
+
+def _run_export(args: list[str]) -> int:
+    if len(args) != 2:
+        print("Usage: guitar-trainer export PROFILE OUT")
+        return 2
+
+    profile, out = args
+    if not os.path.exists(profile):
+        print(f"No such stats file: {profile}")
+        return 1
+    try:
+        export_profile(profile, out)
+    except (OSError, ValueError) as e:
+        print(f"Failed to export {profile}: {e}")
+        return 1
+    print(f"Exported {profile} to {out}")
+    return 0
+
+
+def _run_import(args: list[str]) -> int:
+    force = "--force" in args
+    args = [a for a in args if a != "--force"]
+    if len(args) != 2:
+        print("Usage: guitar-trainer import SRC PROFILE [--force]")
+        return 2
+
+    src, profile = args
+    if os.path.exists(profile) and not force:
+        print(f"{profile} already exists (use --force to replace it)")
+        return 1
+    try:
+        stats = import_profile(src, profile)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Failed to import {src}: {e}")
+        return 1
+    print(f"Imported {src} into {profile}: {stats.total_attempts} attempts")
+    return 0
+
+
+def _run_notes(args: list[str]) -> int:
+    parsed = _parse_dir_jobs(args)
+    if parsed is None:
+        return 2
+    directory, jobs = parsed
+
+    report = pitch_report(directory, jobs=jobs)
+    if not report.profiles:
+        print(f"No profiles with a known tuning found in {directory}")
+        return 0
+
+    print(f"{len(report.profiles)} profile(s)")
+    for title, counters in (("Note", report.by_note), ("Open string", report.by_string_pitch)):
+        print(f"\n{title:12} {'Attempts':>8} {'Accuracy':>9}")
+        for name, bucket in counters.items():
+            acc = bucket["correct"] / bucket["attempts"] * 100.0 if bucket["attempts"] else 0.0
+            print(f"{name:12} {bucket['attempts']:>8} {acc:>8.1f}%")
+    for p in report.skipped:
+        print(f"skipped (unknown tuning): {p}")
+    return 0
+
+
+def _run_sessions(args: list[str]) -> int:
+    last = 10
+    if len(args) == 3 and args[1] in {"-n", "--last"}:
+        try:
+            last = int(args[2])
+        except ValueError:
+            print("-n needs a number")
+            return 2
+    elif len(args) != 1:
+        print("Usage: guitar-trainer sessions PROFILE [-n N]")
+        return 2
+
+    profile = args[0]
+    try:
+        sessions = read_sessions(profile, last)
+    except OSError as e:
+        print(f"Failed to read sessions of {profile}: {e}")
+        return 1
+    if not sessions:
+        print(f"No sessions recorded for {profile}")
+        return 0
+
+    print(f"{'Started':16} {'Mode':15} {'Min':>5} {'Answered':>8} {'Accuracy':>9} {'Avg s':>6} {'P90 s':>6} {'Cells':>5}")
+    for rec in sessions:
+        started = datetime.fromtimestamp(rec.started).strftime("%Y-%m-%d %H:%M")
+        print(
+            f"{started:16} {rec.mode:15} {rec.duration_sec / 60:>5.1f} {rec.answered:>8} "
+            f"{rec.accuracy * 100:>8.1f}% {rec.avg_ms / 1000:>6.2f} {rec.p90_ms / 1000:>6.2f} {len(rec.positions):>5}"
+        )
+    return 0
+
+
+def _run_days(args: list[str]) -> int:
+    last = 7
+    if len(args) == 3 and args[1] in {"-n", "--last"}:
+        try:
+            last = int(args[2])
+        except ValueError:
+            print("-n needs a number")
+            return 2
+    elif len(args) != 1:
+        print("Usage: guitar-trainer days PROFILE [-n N]")
+        return 2
+
+    profile = args[0]
+    if not os.path.exists(profile):
+        print(f"No such stats file: {profile}")
+        return 1
+    try:
+        daily = load_stats(profile).daily
+    except (OSError, ValueError) as e:
+        print(f"Failed to load {profile}: {e}")
+        return 1
+    start = date.today() - timedelta(days=max(last, 1) - 1)
+    total = daily.total(start)
+    if not total.attempts:
+        print(f"No attempts in the last {last} day(s)")
+        return 0
+
+    print(f"{'Day':10} {'Attempts':>8} {'Accuracy':>9}")
+    for day, counters in daily.between(start):
+        print(f"{day.isoformat():10} {counters.attempts:>8} {counters.accuracy * 100:>8.1f}%")
+    print(f"{'Total':10} {total.attempts:>8} {total.accuracy * 100:>8.1f}%")
+
+    for title, keys, counts in (
+        ("String", sorted({s for s, _f in total.by_position}), total.string_counts),
+        ("Fret", sorted({f for _s, f in total.by_position}), total.fret_counts),
+    ):
+        print(f"\n{title:10} {'Attempts':>8} {'Accuracy':>9}")
+        for key in keys:
+            a, c = counts(key)
+            print(f"{key:<10} {a:>8} {c / a * 100 if a else 0.0:>8.1f}%")
+    return 0
+
+
+def _parse_query(args: list[str]) -> tuple[str, dict] | None:
+    profile = None
+    filters: dict = {}
+    it = iter(args)
+    try:
+        for arg in it:
+            if arg == "--mode":
+                filters["mode"] = next(it)
+            elif arg == "--note":
+                filters["note"] = next(it)
+            elif arg in {"--string", "--fret"}:
+                values = {int(v) for v in next(it).split(",") if v.strip()}
+                filters["strings" if arg == "--string" else "frets"] = values
+            elif arg == "--days":
+                filters["since"] = time.time() - float(next(it)) * 24 * 3600
+            elif profile is None and not arg.startswith("-"):
+                profile = arg
+            else:
+                return None
+    except (StopIteration, ValueError):
+        return None
+    return (profile, filters) if profile is not None else None
+
+
+def _run_query(args: list[str]) -> int:
+    parsed = _parse_query(args)
+    if parsed is None:
+        print("Usage: guitar-trainer query PROFILE [--mode M] [--note N] [--string S,...] [--fret F,...] [--days D]")
+        return 2
+
+    profile, filters = parsed
+    if not os.path.exists(profile):
+        print(f"No such stats file: {profile}")
+        return 1
+    try:
+        agg = AttemptIndex.for_profile(profile).attempts(**filters)
+    except (OSError, ValueError) as e:
+        print(f"Failed to query {profile}: {e}")
+        return 1
+    if not agg.attempts:
+        print("No matching attempts")
+        return 0
+
+    print(f"{'Attempts':>8} {'Accuracy':>9} {'Timed':>6} {'Avg s':>6} {'Median s':>8} {'P90 s':>6}")
+    print(
+        f"{agg.attempts:>8} {agg.accuracy * 100:>8.1f}% {agg.timed:>6} {agg.mean_response_ms / 1000:>6.2f} "
+        f"{agg.median_response_ms / 1000:>8.2f} {agg.p90_response_ms / 1000:>6.2f}"
+    )
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = list(sys.argv[1:] if argv is None else argv)
 
@@ -37,6 +301,30 @@ def main(argv: list[str] | None = None) -> int:
         run_cli()
         return 0
 
+    if cmd == "migrate":
+        return _run_migrate(argv[1:])
+
+    if cmd == "merge":
+        return _run_merge(argv[1:])
+
+    if cmd == "notes":
+        return _run_notes(argv[1:])
+
+    if cmd == "sessions":
+        return _run_sessions(argv[1:])
+
+    if cmd == "days":
+        return _run_days(argv[1:])
+
+    if cmd == "query":
+        return _run_query(argv[1:])
+
+    if cmd == "export":
+        return _run_export(argv[1:])
+
+    if cmd == "import":
+        return _run_import(argv[1:])
+
     print(f"Unknown command: {argv[0]}\n")
     _print_help()
     return 2
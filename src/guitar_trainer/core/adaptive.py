@@ -1,20 +1,12 @@
 from __future__ import annotations
 
 import random
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 
 from guitar_trainer.core.stats import Stats
 
-
-def _pos_key(s: int, f: int) -> str:
-    return f"{s},{f}"
-
-
-def _attempts_correct(stats: Stats, s: int, f: int) -> tuple[int, int]:
-    data = stats.by_position.get(_pos_key(s, f))
-    if not data:
-        return 0, 0
-    return int(data.get("attempts", 0)), int(data.get("correct", 0))
+# Extra weight for a position whose note is the most confused one (scaled down for others).
+CONFUSION_WEIGHT = 1.0
 
 
 def choose_adaptive_position(
@@ -23,32 +15,45 @@ def choose_adaptive_position(
     rng: random.Random,
     *,
     num_strings: int = 6,
+    tuning: Optional[Sequence[int]] = None,
 ) -> Tuple[int, int]:
     """
     Returns a position (string_index, fret) focusing weak/unseen positions.
     Works for 6/7 strings (or any num_strings >= 1).
+
+    A position weighs its time-decayed error rate plus half the width of
+    the Wilson interval of its recent accuracy (Stats.accuracy_bounds), so
+    positions with little evidence keep coming up until their answers
+    settle, however lucky or unlucky the first few were.
+
+    With the open-string notes of a tuning, positions whose note the user
+    keeps mixing up with another (Stats.confusion_weights) come up more.
     """
     if num_strings <= 0:
         raise ValueError("num_strings must be >= 1")
     if max_fret < 0:
         raise ValueError("max_fret must be >= 0")
 
-    positions: list[tuple[int, int]] = []
+    # One contiguous pass over the flat board (index = s * width + f).
+    width = max_fret + 1
+    attempts_grid, correct_grid = stats.recent_grid(num_strings, max_fret)
+    lower, upper = stats.accuracy_bounds_grid(num_strings, max_fret)
+    confused = stats.confusion_weights() if tuning is not None else None
     weights: list[float] = []
 
-    for s in range(num_strings):
-        for f in range(max_fret + 1):
-            attempts, correct = _attempts_correct(stats, s, f)
-
-            if attempts == 0:
-                weight = 5.0
-            else:
-                acc = correct / attempts
-                # prefer low accuracy + low attempts
-                weight = (1.0 - acc) + (1.0 / (attempts + 1)) + 0.05
-
-            positions.append((s, f))
-            weights.append(weight)
+    for i, (attempts, correct, lo, hi) in enumerate(zip(attempts_grid, correct_grid, lower, upper)):
+        if attempts == 0:
+            weights.append(5.0)
+        else:
+            acc = correct / attempts
+            # prefer low accuracy + uncertain accuracy
+            w = (1.0 - acc) + (hi - lo) / 2.0 + 0.05
+            if confused is not None:
+                s, f = divmod(i, width)
+                if s < len(tuning):
+                    w += CONFUSION_WEIGHT * confused[(tuning[s] + f) % 12]
+            weights.append(w)
 
     # rng.choices works well
-    return rng.choices(positions, weights=weights, k=1)[0]
+    i = rng.choices(range(num_strings * width), weights=weights, k=1)[0]
+    return divmod(i, width)
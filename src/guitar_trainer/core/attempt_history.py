@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional
+
+from guitar_trainer.core.notes import parse_note_name
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# Per-attempt history lives next to the profile: stats_6__e_standard.history.
+# The file is a header followed by blocks appended at each save. A block
+# stores its attempts column by column (little-endian), so a reader turns
+# each column into an array with one frombytes() call:
+#
+#   header: b"GTHI" + uint16 version
+#   block:  b"BLK" + uint8 0 + uint32 count, then the columns in COLUMNS
+#           order, count items each
+HISTORY_SUFFIX = ".history"
+
+_MAGIC = b"GTHI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH")
+_BLOCK = struct.Struct("<4sI")
+_BLOCK_TAG = b"BLK\x00"
+
+# (name, array typecode, item size). Missing string/fret/note are -1,
+# an unknown response time is 0.
+COLUMNS = (
+    ("timestamp_ms", "q", 8),
+    ("string", "b", 1),
+    ("fret", "b", 1),
+    ("note", "b", 1),
+    ("mode", "B", 1),
+    ("correct", "B", 1),
+    ("response_ms", "I", 4),
+)
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def history_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, HISTORY_SUFFIX)
+
+
+def _small(value: Optional[int]) -> int:
+    if value is None or not 0 <= value <= 127:
+        return -1
+    return value
+
+
+class Attempt(NamedTuple):
+    timestamp_ms: int
+    string: int
+    fret: int
+    note: int
+    mode: str
+    correct: bool
+    response_ms: int
+
+
+class AttemptColumns:
+    """Attempts stored as one array per column (see COLUMNS)."""
+
+    def __init__(self) -> None:
+        for name, code, _size in COLUMNS:
+            setattr(self, name, array(code))
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ms)
+
+    def append(
+        self,
+        *,
+        timestamp_ms: int,
+        mode: str,
+        correct: bool,
+        note_name: str,
+        string_index: Optional[int] = None,
+        fret: Optional[int] = None,
+        response_ms: Optional[int] = None,
+    ) -> None:
+        self.timestamp_ms.append(int(timestamp_ms))
+        self.string.append(_small(string_index))
+        self.fret.append(_small(fret))
+        self.note.append(_small(parse_note_name(note_name)))
+        self.mode.append(ord((mode or "A")[:1]) & 0x7F)
+        self.correct.append(1 if correct else 0)
+        self.response_ms.append(min(max(0, int(response_ms or 0)), 0xFFFFFFFF))
+
+    def row(self, i: int) -> Attempt:
+        return Attempt(
+            self.timestamp_ms[i],
+            self.string[i],
+            self.fret[i],
+            self.note[i],
+            chr(self.mode[i]),
+            bool(self.correct[i]),
+            self.response_ms[i],
+        )
+
+    def __iter__(self) -> Iterator[Attempt]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def copy(self) -> "AttemptColumns":
+        out = AttemptColumns()
+        out.extend(self)
+        return out
+
+    def extend(self, other: "AttemptColumns") -> None:
+        for name, _code, _size in COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def drop_front(self, n: int) -> None:
+        """Remove the first n attempts (the ones already written)."""
+        if n <= 0:
+            return
+        for name, _code, _size in COLUMNS:
+            del getattr(self, name)[:n]
+
+    def encode_block(self) -> bytes:
+        parts = [_BLOCK.pack(_BLOCK_TAG, len(self))]
+        for name, _code, _size in COLUMNS:
+            col = getattr(self, name)
+            if _BIG_ENDIAN:
+                col = array(col.typecode, col)
+                col.byteswap()
+            parts.append(col.tobytes())
+        return b"".join(parts)
+
+
+def _block_size(count: int) -> int:
+    return sum(size for _name, _code, size in COLUMNS) * count
+
+
+def decode_history(data: bytes) -> AttemptColumns:
+    """Decode a history file. A truncated last block (crash mid-append) is ignored.
+
+    Raises ValueError if the header is not a history header.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("history file too short")
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("not a history file")
+
+    out = AttemptColumns()
+    pos = _HEADER.size
+    view = memoryview(data)
+    while pos + _BLOCK.size <= len(data):
+        tag, count = _BLOCK.unpack_from(data, pos)
+        end = pos + _BLOCK.size + _block_size(count)
+        if tag != _BLOCK_TAG or end > len(data):
+            break
+        _decode_columns(view[pos + _BLOCK.size : end], count, out)
+        pos = end
+    return out
+
+
+def _decode_columns(view: memoryview, count: int, out: AttemptColumns) -> None:
+    pos = 0
+    for name, code, size in COLUMNS:
+        col = array(code)
+        col.frombytes(view[pos : pos + size * count])
+        if _BIG_ENDIAN:
+            col.byteswap()
+        getattr(out, name).extend(col)
+        pos += size * count
+
+
+def iter_history_stream(f: BinaryIO) -> Iterator[AttemptColumns]:
+    """Yield the blocks of a history stream (header first) one at a time.
+
+    Stops at a truncated or unknown block. Raises ValueError if the stream
+    does not start with a history header.
+    """
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size or _HEADER.unpack(head) != (_MAGIC, _VERSION):
+        raise ValueError("not a history file")
+    while True:
+        head = f.read(_BLOCK.size)
+        if len(head) < _BLOCK.size:
+            return
+        tag, count = _BLOCK.unpack(head)
+        if tag != _BLOCK_TAG:
+            return
+        body = f.read(_block_size(count))
+        if len(body) < _block_size(count):
+            return
+        block = AttemptColumns()
+        _decode_columns(memoryview(body), count, block)
+        yield block
+
+
+def iter_history_blocks(stats_path: str) -> Iterator[AttemptColumns]:
+    """Yield a profile's history one stored block at a time (nothing if it has none).
+
+    Only one block is held in memory. Raises ValueError if the file is not a
+    history file.
+    """
+    try:
+        f = open(history_path_for(stats_path), "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from iter_history_stream(f)
+
+
+def write_history_stream(f: BinaryIO, blocks: Iterable[AttemptColumns]) -> None:
+    """Write a history header and blocks to f (the history file layout)."""
+    f.write(_HEADER.pack(_MAGIC, _VERSION))
+    for block in blocks:
+        if len(block):
+            f.write(block.encode_block())
+
+
+def read_history(stats_path: str) -> AttemptColumns:
+    """All recorded attempts of a profile (empty if it has no history).
+
+    Raises ValueError if the history file is not in the expected format.
+    """
+    try:
+        with open(history_path_for(stats_path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return AttemptColumns()
+    return decode_history(data)
+
+
+# (size, mtime_ns) of each history file right after this process appended
+# to it, so appends only walk the block headers again if the file changed.
+_appended: Dict[str, tuple] = {}
+
+
+def _complete_prefix(f: BinaryIO, size: int) -> int:
+    """Length of the header and the complete blocks at the start of f (0 if the header is torn)."""
+    if size < _HEADER.size:
+        return 0
+    pos = _HEADER.size
+    while pos + _BLOCK.size <= size:
+        f.seek(pos)
+        tag, count = _BLOCK.unpack(f.read(_BLOCK.size))
+        end = pos + _BLOCK.size + _block_size(count)
+        if tag != _BLOCK_TAG or end > size:
+            break
+        pos = end
+    return pos
+
+
+def append_history(stats_path: str, attempts: AttemptColumns) -> None:
+    """Append attempts as one block. Callers hold file_lock(stats_path).
+
+    A block torn by a crash mid-append is cut off first; otherwise the new
+    block would be read as the rest of it.
+    """
+    if not len(attempts):
+        return
+    path = history_path_for(stats_path)
+    key = os.path.abspath(path)
+    block = attempts.encode_block()
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        f = open(path, "w+b")
+    with f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        end = size if _appended.get(key) == (size, st.st_mtime_ns) else _complete_prefix(f, size)
+        if end < size:
+            f.truncate(end)
+        f.seek(end)
+        if end == 0:
+            f.write(_HEADER.pack(_MAGIC, _VERSION))
+        f.write(block)
+        f.flush()
+        st = os.fstat(f.fileno())
+        _appended[key] = (st.st_size, st.st_mtime_ns)
+
+
+def replace_history(stats_path: str, attempts: AttemptColumns) -> None:
+    """Make attempts the whole history (used when a profile is rewritten)."""
+    path = history_path_for(stats_path)
+    if not len(attempts):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    write_history_blocks(stats_path, [attempts])
+
+
+def write_history_blocks(stats_path: str, blocks: Iterable[AttemptColumns]) -> None:
+    """Atomically replace the history with blocks, written as they come."""
+    path = history_path_for(stats_path)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            write_history_stream(f, blocks)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import bisect
+import math
+import statistics
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, Optional, Union
+
+from guitar_trainer.core.attempt_history import AttemptColumns, read_history
+from guitar_trainer.core.notes import parse_note_name
+
+if TYPE_CHECKING:
+    from guitar_trainer.core.session_log import SessionRecord
+    from guitar_trainer.core.stats import Stats
+
+# Time index granularity: one bucket per hour.
+BUCKET_SEC = 3600
+
+TimeArg = Union[float, int, datetime, None]
+
+
+def _ms(t: TimeArg) -> Optional[int]:
+    if t is None:
+        return None
+    if isinstance(t, datetime):
+        return int(t.timestamp() * 1000)
+    return int(float(t) * 1000)
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values), max(1, math.ceil(q * len(sorted_values)))) - 1
+    return float(sorted_values[i])
+
+
+@dataclass(frozen=True)
+class AttemptAggregate:
+    """Counts and response-time figures of the attempts matching a query.
+
+    Response times only cover attempts that recorded one (timed).
+    """
+
+    attempts: int = 0
+    correct: int = 0
+    timed: int = 0
+    mean_response_ms: float = 0.0
+    median_response_ms: float = 0.0
+    p90_response_ms: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        return (self.correct / self.attempts) if self.attempts else 0.0
+
+
+def _session_kind(name: str) -> Optional[str]:
+    # Imported here: session_log uses percentile() from this module.
+    from guitar_trainer.core.session_log import SESSION_KINDS
+
+    kind = name.strip().lower()
+    return kind if kind in SESSION_KINDS else None
+
+
+class AttemptIndex:
+    """Recorded attempts with in-memory indexes by string, fret, note, mode and hour.
+
+    Each index maps a value to the row numbers holding it. A query starts
+    from the smallest matching row list and checks the other conditions
+    against the columns, so narrow questions ("F# on strings 4-5 this week")
+    touch only the rows that can match. Rows answered during a recorded
+    session are also indexed by the session kind (see tag_sessions()).
+    """
+
+    def __init__(self, history: Optional[AttemptColumns] = None) -> None:
+        self.columns = AttemptColumns()
+        self._by_string: Dict[int, array] = {}
+        self._by_fret: Dict[int, array] = {}
+        self._by_note: Dict[int, array] = {}
+        self._by_mode: Dict[str, array] = {}
+        self._by_bucket: Dict[int, array] = {}
+        self._by_kind: Dict[str, array] = {}
+        self._buckets: list = []
+        if history is not None:
+            self.extend(history)
+
+    @classmethod
+    def for_profile(cls, stats_path: str, stats: Optional["Stats"] = None) -> "AttemptIndex":
+        """Index a profile's history plus the attempts stats has not saved yet.
+
+        Rows are tagged with the kinds of the profile's recorded sessions;
+        attempts of a session still running have no kind yet. Raises
+        ValueError if the history file is malformed (OSError if the
+        session table cannot be read).
+        """
+        from guitar_trainer.core.session_log import read_sessions
+
+        index = cls(read_history(stats_path))
+        if stats is not None:
+            index.extend(stats.pending_delta().history)
+        index.tag_sessions(read_sessions(stats_path))
+        return index
+
+    def tag_sessions(self, sessions: Iterable["SessionRecord"]) -> None:
+        """Index the rows answered between each session's start and end by its kind.
+
+        Sessions run one at a time, so their time ranges do not overlap.
+        Only the hour buckets a session spans are visited.
+        """
+        cols = self.columns
+        for session in sessions:
+            lo, hi = math.floor(session.started * 1000), math.ceil(session.ended * 1000)
+            rows = [row for rows in self._time_rows(lo, hi) for row in rows if lo <= cols.timestamp_ms[row] <= hi]
+            if rows:
+                self._by_kind.setdefault(session.mode, array("I")).extend(sorted(rows))
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @staticmethod
+    def _add(index: Dict, key, row: int) -> None:
+        rows = index.get(key)
+        if rows is None:
+            rows = index[key] = array("I")
+        rows.append(row)
+
+    def extend(self, history: AttemptColumns) -> None:
+        """Append attempts and index them (O(len(history)))."""
+        start = len(self.columns)
+        self.columns.extend(history)
+        cols = self.columns
+        for row in range(start, len(cols)):
+            self._add(self._by_string, cols.string[row], row)
+            self._add(self._by_fret, cols.fret[row], row)
+            self._add(self._by_note, cols.note[row], row)
+            self._add(self._by_mode, chr(cols.mode[row]), row)
+            bucket = cols.timestamp_ms[row] // (BUCKET_SEC * 1000)
+            if bucket not in self._by_bucket:
+                bisect.insort(self._buckets, bucket)
+            self._add(self._by_bucket, bucket, row)
+
+    def _rows_for(self, index: Dict, keys: Iterable) -> list:
+        out: list = []
+        for key in keys:
+            rows = index.get(key)
+            if rows is not None:
+                out.append(rows)
+        return out
+
+    def _time_rows(self, since_ms: Optional[int], until_ms: Optional[int]) -> list:
+        per = BUCKET_SEC * 1000
+        lo = 0 if since_ms is None else bisect.bisect_left(self._buckets, since_ms // per)
+        hi = len(self._buckets) if until_ms is None else bisect.bisect_right(self._buckets, until_ms // per)
+        return [self._by_bucket[b] for b in self._buckets[lo:hi]]
+
+    def attempts(
+        self,
+        *,
+        mode: Optional[str] = None,
+        strings: Optional[Collection[int]] = None,
+        frets: Optional[Collection[int]] = None,
+        note: Optional[str] = None,
+        since: TimeArg = None,
+        until: TimeArg = None,
+    ) -> AttemptAggregate:
+        """Aggregate the attempts matching every given filter.
+
+        mode is a recorded mode letter ("A", "B", "C") or a session kind
+        ("practice", "note_quiz", ...; any case), which matches the rows
+        tagged with it. strings use core indexing (0 = lowest string); note
+        accepts sharps or flats; since and until are unix seconds or
+        datetimes (both inclusive).
+
+        Raises ValueError if mode is neither.
+        """
+        cols = self.columns
+        mode_key: Optional[str] = None
+        kind: Optional[str] = None
+        if mode is not None:
+            if len(mode.strip()) == 1 and mode.strip().isalpha():
+                mode_key = mode.strip().upper()
+            else:
+                kind = _session_kind(mode)
+                if kind is None:
+                    raise ValueError(f"unknown attempt mode {mode!r} (expected a mode letter or a session kind)")
+        note_idx: Optional[int] = None
+        if note is not None:
+            note_idx = parse_note_name(note)
+            if note_idx is None:
+                return AttemptAggregate()
+        string_set = set(strings) if strings is not None else None
+        fret_set = set(frets) if frets is not None else None
+        since_ms, until_ms = _ms(since), _ms(until)
+
+        # Row lists per condition; the query walks the smallest one.
+        candidates: list = []
+        if mode_key is not None:
+            candidates.append(self._rows_for(self._by_mode, [mode_key]))
+        kind_rows: Optional[set] = None
+        if kind is not None:
+            kind_lists = self._rows_for(self._by_kind, [kind])
+            candidates.append(kind_lists)
+            kind_rows = {row for rows in kind_lists for row in rows}
+        if note_idx is not None:
+            candidates.append(self._rows_for(self._by_note, [note_idx]))
+        if string_set is not None:
+            candidates.append(self._rows_for(self._by_string, string_set))
+        if fret_set is not None:
+            candidates.append(self._rows_for(self._by_fret, fret_set))
+        if since_ms is not None or until_ms is not None:
+            candidates.append(self._time_rows(since_ms, until_ms))
+
+        if candidates:
+            lists = min(candidates, key=lambda ls: sum(len(rows) for rows in ls))
+            rows_iter: Iterable[int] = (row for rows in lists for row in rows)
+        else:
+            rows_iter = range(len(cols))
+
+        attempts = correct = 0
+        times: list = []
+        for row in rows_iter:
+            if mode_key is not None and cols.mode[row] != ord(mode_key):
+                continue
+            if kind_rows is not None and row not in kind_rows:
+                continue
+            if note_idx is not None and cols.note[row] != note_idx:
+                continue
+            if string_set is not None and cols.string[row] not in string_set:
+                continue
+            if fret_set is not None and cols.fret[row] not in fret_set:
+                continue
+            ts = cols.timestamp_ms[row]
+            if (since_ms is not None and ts < since_ms) or (until_ms is not None and ts > until_ms):
+                continue
+            attempts += 1
+            correct += cols.correct[row]
+            if cols.response_ms[row]:
+                times.append(cols.response_ms[row])
+
+        times.sort()
+        return AttemptAggregate(
+            attempts=attempts,
+            correct=correct,
+            timed=len(times),
+            mean_response_ms=(sum(times) / len(times)) if times else 0.0,
+            median_response_ms=float(statistics.median(times)) if times else 0.0,
+            p90_response_ms=percentile(times, 0.9),
+        )
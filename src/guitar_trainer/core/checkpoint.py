@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+# Checkpoint after this many new attempts or once the oldest unsaved
+# attempt is this old, whichever comes first.
+CHECKPOINT_EVERY_ATTEMPTS = 10
+CHECKPOINT_EVERY_SEC = 15.0
+
+
+class SessionCheckpoint:
+    """Decide when a running session should persist its new attempts.
+
+    The save callback is expected to be cheap and non-blocking (the GUI
+    passes StatsWriter.request_save). Saves only write what changed since the
+    previous one (journal records / delta records / row increments), so each
+    checkpoint costs O(attempts since the last checkpoint), and load_stats()
+    replays them into the profile after a crash.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[], None],
+        *,
+        every_attempts: int = CHECKPOINT_EVERY_ATTEMPTS,
+        every_sec: float = CHECKPOINT_EVERY_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._save = save
+        self.every_attempts = max(1, int(every_attempts))
+        self.every_sec = max(0.0, float(every_sec))
+        self._clock = clock
+        self._unsaved = 0
+        self._first_unsaved_at = 0.0
+
+    @property
+    def unsaved(self) -> int:
+        return self._unsaved
+
+    def record(self) -> bool:
+        """Note one new attempt; checkpoint if a limit is reached. True if saved."""
+        if self._unsaved == 0:
+            self._first_unsaved_at = self._clock()
+        self._unsaved += 1
+        if self._unsaved >= self.every_attempts:
+            return self.flush()
+        return self.poll()
+
+    def poll(self) -> bool:
+        """Checkpoint if unsaved attempts are older than every_sec. True if saved."""
+        if self._unsaved and self._clock() - self._first_unsaved_at >= self.every_sec:
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """Checkpoint now if anything is unsaved. True if saved."""
+        if not self._unsaved:
+            return False
+        self._unsaved = 0
+        self._save()
+        return True
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+from array import array
+from typing import Tuple
+
+from guitar_trainer.core.note_counters import PITCH_CLASSES
+from guitar_trainer.core.sidecar_file import atomic_write_bytes, from_le, le_bytes, read_sidecar
+from guitar_trainer.core.stats_journal import sidecar_path
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+CONFUSION_SUFFIX = ".confusion"
+
+# b"GTCM" + uint16 version + uint16 size, then size x size uint32 counts
+# (row = correct pitch class, column = the one answered). The file is this
+# one fixed-size table, updated in place at each save.
+_HEADER = struct.Struct("<4sHH")
+_MAGIC = b"GTCM"
+_VERSION = 1
+
+_CELLS = PITCH_CLASSES * PITCH_CLASSES
+_FILE_SIZE = _HEADER.size + 4 * _CELLS
+
+
+def confusion_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, CONFUSION_SUFFIX)
+
+
+class ConfusionMatrix:
+    """Wrong note answers by (correct pitch class, answered pitch class).
+
+    One fixed 144-slot array('I') indexed by correct * 12 + answered, so
+    the size never changes and add() is O(1). Counts merge and subtract
+    like the other counters.
+    """
+
+    def __init__(self) -> None:
+        self.counts = array("I", bytes(4 * _CELLS))
+
+    def __len__(self) -> int:
+        """Number of recorded confusions."""
+        return sum(self.counts)
+
+    def add(self, correct_pc: int, answered_pc: int, n: int = 1) -> None:
+        self.counts[(correct_pc % PITCH_CLASSES) * PITCH_CLASSES + answered_pc % PITCH_CLASSES] += n
+
+    def count(self, correct_pc: int, answered_pc: int) -> int:
+        return self.counts[(correct_pc % PITCH_CLASSES) * PITCH_CLASSES + answered_pc % PITCH_CLASSES]
+
+    def merge(self, other: "ConfusionMatrix") -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+
+    def subtract(self, other: "ConfusionMatrix") -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] = max(0, self.counts[i] - n)
+
+    def copy(self) -> "ConfusionMatrix":
+        out = ConfusionMatrix()
+        out.counts = array("I", self.counts)
+        return out
+
+    def most_common(self, top: int = 5) -> list[Tuple[int, int, int]]:
+        """(correct pitch class, answered pitch class, count), most frequent first."""
+        cells = [(n, i) for i, n in enumerate(self.counts) if n]
+        cells.sort(key=lambda item: (-item[0], item[1]))
+        return [(i // PITCH_CLASSES, i % PITCH_CLASSES, n) for n, i in cells[:top]]
+
+    def involvement(self) -> list[float]:
+        """Per pitch class, the share (0..1, of the busiest note) of confusions it is part of.
+
+        A note counts whether it was the one asked or the one wrongly given,
+        since both are worth asking again.
+        """
+        totals = [0] * PITCH_CLASSES
+        for i, n in enumerate(self.counts):
+            if n:
+                totals[i // PITCH_CLASSES] += n
+                totals[i % PITCH_CLASSES] += n
+        peak = max(totals)
+        return [t / peak for t in totals] if peak else [0.0] * PITCH_CLASSES
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_MAGIC, _VERSION, PITCH_CLASSES) + le_bytes(self.counts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ConfusionMatrix":
+        """Raises ValueError on malformed data."""
+        if len(data) < _HEADER.size:
+            raise ValueError("confusion data too short")
+        magic, version, size = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or size != PITCH_CLASSES:
+            raise ValueError("not a confusion file")
+        if len(data) != _FILE_SIZE:
+            raise ValueError("confusion data has the wrong size")
+        out = cls()
+        out.counts = from_le("I", data[_HEADER.size :])
+        return out
+
+
+def read_confusion(stats_path: str) -> ConfusionMatrix:
+    """Matrix stored next to a profile (empty if there is none).
+
+    Raises ValueError if the file is malformed.
+    """
+    # read_sidecar() also merges files written as appended frames.
+    matrix = read_sidecar(confusion_path_for(stats_path), ConfusionMatrix)
+    return matrix if matrix is not None else ConfusionMatrix()
+
+
+def write_confusion(stats_path: str, matrix: ConfusionMatrix) -> None:
+    """Atomically replace the matrix file (removed if the matrix is empty)."""
+    path = confusion_path_for(stats_path)
+    if not len(matrix):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    atomic_write_bytes(path, matrix.to_bytes())
+
+
+def append_confusion(stats_path: str, increment: ConfusionMatrix) -> None:
+    """Add increment to the stored matrix, overwriting the fixed-size table in place.
+
+    Files in another layout (or unreadable ones, with a warning) are
+    replaced. Callers hold file_lock(stats_path).
+    """
+    if not len(increment):
+        return
+    path = confusion_path_for(stats_path)
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        write_confusion(stats_path, increment)
+        return
+    with f:
+        data = f.read(_FILE_SIZE + 1)
+        try:
+            current = ConfusionMatrix.from_bytes(data)
+        except ValueError:
+            current = None
+        if current is not None:
+            current.merge(increment)
+            f.seek(0)
+            f.write(current.to_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+            return
+
+    try:
+        current = read_confusion(stats_path)
+    except ValueError as e:
+        logger.warning("Replacing unreadable confusion file '%s': %s", path, e)
+        current = ConfusionMatrix()
+    current.merge(increment)
+    write_confusion(stats_path, current)
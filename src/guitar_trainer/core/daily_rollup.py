@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import bisect
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from guitar_trainer.core.attempt_history import AttemptColumns, read_history
+from guitar_trainer.core.notes import index_to_name
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+from guitar_trainer.core.sidecar_file import append_sidecar, read_sidecar, write_sidecar
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# Per-day counters live next to the profile: stats_6__e_standard.daily, in
+# sidecar frames (see sidecar_file) holding compact JSON documents
+# {"v": 1, "days": {"YYYY-MM-DD": <day record>}} where a day record uses the
+# delta journal layout (n / mode / note / pos). A save appends a document
+# with just the days it touched.
+DAILY_SUFFIX = ".daily"
+_VERSION = 1
+
+
+def daily_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, DAILY_SUFFIX)
+
+
+def day_of(timestamp: float) -> int:
+    """Local calendar day (date ordinal) of a unix time."""
+    return date.fromtimestamp(timestamp).toordinal()
+
+
+def _bump(counters: Dict[Any, list], key: Any, a: int, c: int) -> None:
+    cur = counters.get(key)
+    if cur is None:
+        counters[key] = [a, c]
+    else:
+        cur[0] += a
+        cur[1] += c
+
+
+class DayCounters:
+    """Attempts/correct of one day (or a range of days) by mode, note and position."""
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.correct = 0
+        self.by_mode: Dict[str, list] = {}
+        self.by_note: Dict[str, list] = {}
+        self.by_position: Dict[Tuple[int, int], list] = {}
+
+    @property
+    def accuracy(self) -> float:
+        return (self.correct / self.attempts) if self.attempts else 0.0
+
+    def add(self, mode: str, note_name: str, correct: bool, string_index: Optional[int], fret: Optional[int]) -> None:
+        c = 1 if correct else 0
+        self.attempts += 1
+        self.correct += c
+        _bump(self.by_mode, mode, 1, c)
+        _bump(self.by_note, note_name, 1, c)
+        if string_index is not None and fret is not None:
+            _bump(self.by_position, (string_index, fret), 1, c)
+
+    def merge(self, other: "DayCounters", sign: int = 1) -> None:
+        self.attempts += sign * other.attempts
+        self.correct += sign * other.correct
+        for mine, theirs in (
+            (self.by_mode, other.by_mode),
+            (self.by_note, other.by_note),
+            (self.by_position, other.by_position),
+        ):
+            for key, (a, c) in theirs.items():
+                _bump(mine, key, sign * a, sign * c)
+                if mine[key][0] <= 0 and mine[key][1] <= 0:
+                    del mine[key]
+
+    def is_empty(self) -> bool:
+        return self.attempts <= 0 and not self.by_mode
+
+    def string_counts(self, string_index: int) -> Tuple[int, int]:
+        """(attempts, correct) summed over one string."""
+        a = c = 0
+        for (s, _f), (pa, pc) in self.by_position.items():
+            if s == string_index:
+                a += pa
+                c += pc
+        return a, c
+
+    def fret_counts(self, fret: int) -> Tuple[int, int]:
+        """(attempts, correct) summed over one fret."""
+        a = c = 0
+        for (_s, f), (pa, pc) in self.by_position.items():
+            if f == fret:
+                a += pa
+                c += pc
+        return a, c
+
+    def copy(self) -> "DayCounters":
+        out = DayCounters()
+        out.merge(self)
+        return out
+
+    def to_record(self) -> dict:
+        rec: dict = {"n": [self.attempts, self.correct]}
+        if self.by_mode:
+            rec["mode"] = self.by_mode
+        if self.by_note:
+            rec["note"] = self.by_note
+        if self.by_position:
+            rec["pos"] = {pos_key(s, f): v for (s, f), v in self.by_position.items()}
+        return rec
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "DayCounters":
+        out = cls()
+        n = rec.get("n") or [0, 0]
+        out.attempts, out.correct = int(n[0]), int(n[1])
+        out.by_mode = {str(k): [int(v[0]), int(v[1])] for k, v in (rec.get("mode") or {}).items()}
+        out.by_note = {str(k): [int(v[0]), int(v[1])] for k, v in (rec.get("note") or {}).items()}
+        for key, v in (rec.get("pos") or {}).items():
+            parsed = parse_pos_key(key)
+            if parsed is not None:
+                out.by_position[parsed] = [int(v[0]), int(v[1])]
+        return out
+
+
+class DailyRollups:
+    """DayCounters per local calendar day.
+
+    add() is O(1); between()/total() only visit the days in the requested
+    range (found by bisecting the sorted day list), so a month-long query
+    costs about 30 day records however long the history is.
+    """
+
+    def __init__(self) -> None:
+        self.days: Dict[int, DayCounters] = {}
+        self._sorted: Optional[list] = None
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _day(self, day: int) -> DayCounters:
+        counters = self.days.get(day)
+        if counters is None:
+            counters = DayCounters()
+            self.days[day] = counters
+            self._sorted = None
+        return counters
+
+    def add(
+        self,
+        timestamp: float,
+        mode: str,
+        note_name: str,
+        correct: bool,
+        string_index: Optional[int] = None,
+        fret: Optional[int] = None,
+    ) -> None:
+        self._day(day_of(timestamp)).add(mode, note_name, correct, string_index, fret)
+
+    def merge(self, other: "DailyRollups") -> None:
+        for day, counters in other.days.items():
+            self._day(day).merge(counters)
+
+    def subtract(self, other: "DailyRollups") -> None:
+        for day, counters in other.days.items():
+            mine = self.days.get(day)
+            if mine is None:
+                continue
+            mine.merge(counters, -1)
+            if mine.is_empty():
+                del self.days[day]
+                self._sorted = None
+
+    def copy(self) -> "DailyRollups":
+        out = DailyRollups()
+        out.days = {day: counters.copy() for day, counters in self.days.items()}
+        return out
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[Tuple[date, DayCounters]]:
+        """Days with attempts from start to end (both inclusive), oldest first."""
+        if self._sorted is None:
+            self._sorted = sorted(self.days)
+        lo = 0 if start is None else bisect.bisect_left(self._sorted, start.toordinal())
+        hi = len(self._sorted) if end is None else bisect.bisect_right(self._sorted, end.toordinal())
+        for day in self._sorted[lo:hi]:
+            yield date.fromordinal(day), self.days[day]
+
+    def total(self, start: Optional[date] = None, end: Optional[date] = None) -> DayCounters:
+        """All counters from start to end (both inclusive) added up."""
+        out = DayCounters()
+        for _day, counters in self.between(start, end):
+            out.merge(counters)
+        return out
+
+    @classmethod
+    def from_history(cls, history: AttemptColumns) -> "DailyRollups":
+        """Rebuild rollups from recorded attempts (notes get their sharp names)."""
+        out = cls()
+        for row in history:
+            note = index_to_name(row.note) if row.note >= 0 else "?"
+            s = row.string if row.string >= 0 else None
+            f = row.fret if row.fret >= 0 else None
+            out.add(row.timestamp_ms / 1000.0, row.mode, note, row.correct, s, f)
+        return out
+
+    def to_bytes(self) -> bytes:
+        doc = {
+            "v": _VERSION,
+            "days": {date.fromordinal(day).isoformat(): self.days[day].to_record() for day in sorted(self.days)},
+        }
+        return json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DailyRollups":
+        """Raises ValueError on malformed data."""
+        try:
+            doc = json.loads(data.decode("utf-8"))
+            if not isinstance(doc, dict) or doc.get("v") != _VERSION:
+                raise ValueError("not a daily rollup file")
+            out = cls()
+            for day, rec in (doc.get("days") or {}).items():
+                out.days[date.fromisoformat(day).toordinal()] = DayCounters.from_record(rec)
+            return out
+        except (TypeError, AttributeError, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"malformed daily rollup file: {e}") from e
+
+
+def read_daily(stats_path: str) -> Optional[DailyRollups]:
+    """Rollups stored next to a profile (None if there is no rollup file).
+
+    Raises ValueError if the file is malformed.
+    """
+    return read_sidecar(daily_path_for(stats_path), DailyRollups)
+
+
+def write_daily(stats_path: str, rollups: DailyRollups) -> None:
+    write_sidecar(daily_path_for(stats_path), rollups)
+
+
+def append_daily(stats_path: str, increment: DailyRollups) -> None:
+    """Add the days in increment to the stored rollups (only their records are written).
+
+    A profile without a rollup file gets it rebuilt from history first, so
+    call this before appending the same attempts to the history.
+    """
+    append_sidecar(
+        daily_path_for(stats_path),
+        increment,
+        DailyRollups,
+        missing=lambda: DailyRollups.from_history(read_history(stats_path)),
+    )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from guitar_trainer.core.sidecar_file import atomic_write_bytes
+from guitar_trainer.core.stats_delta import StatsDelta
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# Overrides the stored device id (tests, portable installs).
+DEVICE_ID_ENV = "GUITAR_TRAINER_DEVICE_ID"
+DEVICE_ID_FILE = ".guitar_trainer_device"
+
+# meta key of the device that owns the profile's own counters.
+META_DEVICE_ID = "device_id"
+# meta key the other devices' counters were kept under before they moved to
+# the .devices file; load_stats() moves them out.
+META_DEVICES = "devices"
+
+# The counters of every other device live next to the profile, not in its
+# meta (which summaries, the index and every delta record carry):
+# {"version": 1, "devices": {device_id: delta record}}.
+DEVICES_SUFFIX = ".devices"
+_DEVICES_VERSION = 1
+
+_cached_id: Optional[str] = None
+
+
+def local_device_id() -> str:
+    """Stable id of this machine, created on first use in the home directory."""
+    global _cached_id
+    env = os.environ.get(DEVICE_ID_ENV, "").strip()
+    if env:
+        return env
+    if _cached_id is not None:
+        return _cached_id
+
+    path = Path.home() / DEVICE_ID_FILE
+    try:
+        device_id = path.read_text(encoding="utf-8").strip()
+    except OSError:
+        device_id = ""
+    if not device_id:
+        device_id = uuid.uuid4().hex[:16]
+        try:
+            path.write_text(device_id + "\n", encoding="utf-8")
+        except OSError:
+            pass  # still usable for this process
+    _cached_id = device_id
+    return device_id
+
+
+def legacy_device_id(counters: StatsDelta) -> str:
+    """Id for a profile saved before device tracking, derived from its counters.
+
+    The same file always gets the same id, so merging it twice is a no-op.
+    """
+    data = json.dumps(counters.to_record(), sort_keys=True).encode("utf-8")
+    return "legacy-" + hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def devices_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, DEVICES_SUFFIX)
+
+
+def slices_from_records(raw: Any) -> Dict[str, StatsDelta]:
+    """{device_id: delta record} as counters (bad entries are skipped)."""
+    out: Dict[str, StatsDelta] = {}
+    if not isinstance(raw, dict):
+        return out
+    for device_id, rec in raw.items():
+        try:
+            out[str(device_id)] = StatsDelta.from_record(rec)
+        except (TypeError, ValueError, IndexError, AttributeError):
+            continue
+    return out
+
+
+def read_device_slices(stats_path: str) -> Dict[str, StatsDelta]:
+    """Counters of the other devices stored next to a profile (empty if there are none).
+
+    Raises ValueError if the file is malformed.
+    """
+    try:
+        with open(devices_path_for(stats_path), "rb") as f:
+            raw = json.loads(f.read().decode("utf-8"))
+    except FileNotFoundError:
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != _DEVICES_VERSION:
+        raise ValueError("not a devices file")
+    return slices_from_records(raw.get("devices"))
+
+
+def write_device_slices(stats_path: str, slices: Dict[str, StatsDelta]) -> None:
+    """Atomically replace the other devices' counters (the file is removed if there are none)."""
+    path = devices_path_for(stats_path)
+    if not slices:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    doc = {"version": _DEVICES_VERSION, "devices": {k: slices[k].to_record() for k in sorted(slices)}}
+    atomic_write_bytes(path, json.dumps(doc, separators=(",", ":")).encode("utf-8"))
+
+
+def _clamp(counters: Dict[Any, list]) -> None:
+    for key in list(counters):
+        a, c = counters[key]
+        if a <= 0 and c <= 0:
+            del counters[key]
+        else:
+            counters[key] = [max(0, a), max(0, c)]
+
+
+def own_slice(counters: StatsDelta, others: Dict[str, StatsDelta]) -> StatsDelta:
+    """The part of counters not accounted for by the other devices."""
+    own = counters.copy()
+    for other in others.values():
+        own.subtract(other)
+    own.attempts = max(0, own.attempts)
+    own.correct = max(0, own.correct)
+    _clamp(own.by_mode)
+    _clamp(own.by_note)
+    _clamp(own.by_position)
+    return own
+
+
+def profile_slices(counters: StatsDelta, devices: Dict[str, StatsDelta], owner: str) -> Dict[str, StatsDelta]:
+    """Split a profile's counters into per-device grow-only counters.
+
+    devices are the other devices' counters stored with the profile; owner
+    is the device the rest belongs to.
+    """
+    slices = {k: v.copy() for k, v in devices.items()}
+    own = own_slice(counters, slices)
+    if owner in slices:
+        slices[owner].merge_max(own)
+    else:
+        slices[owner] = own
+    return slices
+
+
+def merge_slices(into: Dict[str, StatsDelta], slices: Dict[str, StatsDelta]) -> None:
+    """Fold slices into into (element-wise max per device; commutative and idempotent)."""
+    for device_id, counters in slices.items():
+        cur = into.get(device_id)
+        if cur is None:
+            into[device_id] = counters.copy()
+        else:
+            cur.merge_max(counters)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None  # type: ignore[assignment]
+
+LOCK_SUFFIX = ".lock"
+# Lock files live in a hidden folder next to the locked file, so taking and
+# releasing a lock leaves the mtime of that file's own directory alone (the
+# stats index relies on it).
+LOCK_DIR = ".locks"
+
+
+def lock_path_for(path: str) -> str:
+    directory, name = os.path.split(os.fspath(path))
+    return os.path.join(directory, LOCK_DIR, name + LOCK_SUFFIX)
+
+
+class _PathLock:
+    def __init__(self) -> None:
+        self.mutex = threading.RLock()
+        self.depth = 0
+        self.fd: Optional[int] = None
+
+
+_locks: Dict[str, _PathLock] = {}
+_locks_guard = threading.Lock()
+
+
+def _os_lock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _os_unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _acquire(lock_path: str) -> int:
+    """Open and lock lock_path, retrying if its holder removed it meanwhile."""
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            # First lock in this directory, or remove_lock_dir() just ran.
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            continue
+        try:
+            _os_lock(fd)
+            if fcntl is None:
+                return fd
+            # The previous holder unlinks the file before unlocking it; a lock
+            # taken on that unlinked inode excludes nobody, so start over.
+            try:
+                same = os.path.samestat(os.fstat(fd), os.stat(lock_path))
+            except FileNotFoundError:
+                same = False
+        except OSError:
+            os.close(fd)
+            raise
+        if same:
+            return fd
+        os.close(fd)
+
+
+def _release(lock_path: str, fd: int) -> None:
+    try:
+        if fcntl is not None:
+            # Removed while still held, so no one can be waiting on a file
+            # that is about to disappear (see _acquire()). Windows cannot
+            # delete an open file and keeps it.
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+        _os_unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def remove_lock_dir(path: str) -> None:
+    """Remove the folder holding path's lock file if no lock file is left in it."""
+    try:
+        os.rmdir(os.path.dirname(os.path.abspath(lock_path_for(path))))
+    except OSError:
+        pass
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path (via lock_path_for(path)).
+
+    Serializes threads of this process and, where fcntl/msvcrt is available,
+    other processes using the same lock. Re-entrant within a thread. On
+    POSIX the lock file is removed again when the lock is released.
+    """
+    lock_path = os.path.abspath(lock_path_for(path))
+    with _locks_guard:
+        lock = _locks.setdefault(lock_path, _PathLock())
+
+    with lock.mutex:
+        if lock.depth == 0:
+            lock.fd = _acquire(lock_path)
+        lock.depth += 1
+        try:
+            yield
+        finally:
+            lock.depth -= 1
+            if lock.depth == 0 and lock.fd is not None:
+                fd, lock.fd = lock.fd, None
+                _release(lock_path, fd)
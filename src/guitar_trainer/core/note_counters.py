@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Optional, Tuple
+
+from guitar_trainer.core.notes import NOTES_SHARPS, index_to_name, parse_note_name
+
+PITCH_CLASSES = 12
+
+
+def note_key(name: Any) -> Optional[str]:
+    """Canonical (sharp) name of a note in any spelling; None if it is not a note."""
+    idx = parse_note_name(name) if isinstance(name, str) else None
+    return NOTES_SHARPS[idx] if idx is not None else None
+
+
+class NoteCounters(MutableMapping):
+    """Attempts/correct per pitch class in two fixed 12-slot array('I') buffers.
+
+    Enharmonic spellings share a slot, so "C#" and "Db" are one bucket. The
+    object still reads like the old {"<note>": {"attempts": n, "correct": m}}
+    dict: keys are listed by their sharp names, any spelling can be used to
+    look a bucket up, reading returns a fresh bucket dict and assigning a
+    whole bucket stores it. Names that are not notes cannot be stored.
+    Use named(prefer_flats=True) for display.
+    """
+
+    def __init__(self) -> None:
+        self.attempts = array("I", bytes(4 * PITCH_CLASSES))
+        self.correct = array("I", bytes(4 * PITCH_CLASSES))
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "NoteCounters":
+        """Build counters from the JSON {"note": {...}} layout, folding enharmonic keys.
+
+        Keys that are not notes and malformed buckets are skipped.
+        """
+        if isinstance(data, NoteCounters):
+            return data.copy()
+
+        out = cls()
+        for name, bucket in dict(data or {}).items():
+            idx = parse_note_name(name) if isinstance(name, str) else None
+            if idx is None or not isinstance(bucket, dict):
+                continue
+            try:
+                a = max(0, int(bucket.get("attempts", 0)))
+                c = max(0, int(bucket.get("correct", 0)))
+            except (TypeError, ValueError):
+                continue
+            out.attempts[idx] += a
+            out.correct[idx] += c
+        return out
+
+    def copy(self) -> "NoteCounters":
+        out = NoteCounters()
+        out.attempts = array("I", self.attempts)
+        out.correct = array("I", self.correct)
+        return out
+
+    def to_dict(self) -> dict[str, dict[str, int]]:
+        return {key: self[key] for key in self}
+
+    def named(self, *, prefer_flats: bool = False) -> dict[str, dict[str, int]]:
+        """Buckets keyed by display name (sharps, or flats with prefer_flats)."""
+        return {
+            index_to_name(i, prefer_flats=prefer_flats): {"attempts": a, "correct": c}
+            for i, (a, c) in enumerate(zip(self.attempts, self.correct))
+            if a or c
+        }
+
+    # -------------------------
+    # Dense access
+    # -------------------------
+    def add(self, note_name: str, correct: bool) -> bool:
+        """Count one attempt; False (nothing counted) if note_name is not a note."""
+        idx = parse_note_name(note_name)
+        if idx is None:
+            return False
+        self.attempts[idx] += 1
+        if correct:
+            self.correct[idx] += 1
+        return True
+
+    def counts(self, pitch_class: int) -> Tuple[int, int]:
+        """Return (attempts, correct) for a pitch class (0 = C)."""
+        i = pitch_class % PITCH_CLASSES
+        return self.attempts[i], self.correct[i]
+
+    def set_counts(self, pitch_class: int, attempts: int, correct: int) -> None:
+        i = pitch_class % PITCH_CLASSES
+        self.attempts[i] = max(0, int(attempts))
+        self.correct[i] = max(0, int(correct))
+
+    # -------------------------
+    # Mapping API (note name keys)
+    # -------------------------
+    def _index_for_key(self, key: Any) -> int:
+        idx = parse_note_name(key) if isinstance(key, str) else None
+        if idx is None:
+            raise KeyError(key)
+        return idx
+
+    def __getitem__(self, key: str) -> dict[str, int]:
+        i = self._index_for_key(key)
+        if self.attempts[i] == 0 and self.correct[i] == 0:
+            raise KeyError(key)
+        return {"attempts": self.attempts[i], "correct": self.correct[i]}
+
+    def __setitem__(self, key: str, bucket: dict) -> None:
+        i = self._index_for_key(key)
+        bucket = bucket or {}
+        self.set_counts(i, int(bucket.get("attempts", 0)), int(bucket.get("correct", 0)))
+
+    def __delitem__(self, key: str) -> None:
+        i = self._index_for_key(key)
+        if self.attempts[i] == 0 and self.correct[i] == 0:
+            raise KeyError(key)
+        self.attempts[i] = 0
+        self.correct[i] = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i, (a, c) in enumerate(zip(self.attempts, self.correct)):
+            if a or c:
+                yield NOTES_SHARPS[i]
+
+    def __len__(self) -> int:
+        return sum(1 for a, c in zip(self.attempts, self.correct) if a or c)
+
+    def __repr__(self) -> str:
+        return f"NoteCounters({self.to_dict()!r})"
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+from guitar_trainer.core.attempt_history import AttemptColumns, read_history
+from guitar_trainer.core.sidecar_file import append_sidecar, read_sidecar, write_sidecar
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# Answers remembered per position.
+OUTCOME_BITS = 16
+_MASK = (1 << OUTCOME_BITS) - 1
+
+OUTCOMES_SUFFIX = ".outcomes"
+
+# b"GTOB" + uint16 version + uint16 width + uint32 count,
+# then count x (uint16 string, uint16 fret, uint16 bits, uint32 seen).
+_HEADER = struct.Struct("<4sHHI")
+_CELL = struct.Struct("<HHHI")
+_MAGIC = b"GTOB"
+_VERSION = 1
+
+
+def outcomes_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, OUTCOMES_SUFFIX)
+
+
+def _low(bits: int, n: int) -> int:
+    return bits & ((1 << min(n, OUTCOME_BITS)) - 1)
+
+
+class OutcomeBits:
+    """The last OUTCOME_BITS answers per (string, fret) as a shift register.
+
+    Each cell is [bits, seen]: bit 0 is the newest answer (1 = correct) and
+    seen counts every answer shifted in, so min(seen, OUTCOME_BITS) bits are
+    valid. add() is one shift and recent() one popcount, whatever the
+    number of answers, and a cell never grows.
+
+    Registers compose: merging b into a shifts b's answers in after a's, so
+    outcomes recorded since the last save can be applied to what another
+    process stored in the meantime.
+    """
+
+    def __init__(self) -> None:
+        self.cells: Dict[Tuple[int, int], list] = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.cells)
+
+    def _shift_in(self, key: Tuple[int, int], bits: int, seen: int) -> None:
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [_low(bits, seen), seen]
+            return
+        n = min(seen, OUTCOME_BITS)
+        cell[0] = ((cell[0] << n) | _low(bits, n)) & _MASK
+        cell[1] += seen
+
+    def add(self, string_index: int, fret: int, correct: bool) -> None:
+        self._shift_in((string_index, fret), 1 if correct else 0, 1)
+
+    def merge(self, other: "OutcomeBits") -> None:
+        """Shift other's answers in after ours (other holds the newer ones)."""
+        for key, (bits, seen) in other.cells.items():
+            self._shift_in(key, bits, seen)
+
+    def subtract(self, other: "OutcomeBits") -> None:
+        """Drop as many of the oldest answers per cell as other holds."""
+        for key, (_bits, seen) in other.cells.items():
+            cell = self.cells.get(key)
+            if cell is None:
+                continue
+            left = cell[1] - seen
+            if left <= 0:
+                del self.cells[key]
+            else:
+                cell[0] = _low(cell[0], left)
+                cell[1] = left
+
+    def copy(self) -> "OutcomeBits":
+        out = OutcomeBits()
+        out.cells = {k: list(v) for k, v in self.cells.items()}
+        return out
+
+    @classmethod
+    def from_history(cls, history: AttemptColumns) -> "OutcomeBits":
+        """Registers for recorded attempts (oldest first); attempts without a position are skipped."""
+        out = cls()
+        for s, f, ok in zip(history.string, history.fret, history.correct):
+            if s >= 0 and f >= 0:
+                out.add(s, f, bool(ok))
+        return out
+
+    def recent(self, string_index: int, fret: int) -> Tuple[int, int]:
+        """(answers, correct) over the last OUTCOME_BITS answers at a position."""
+        cell = self.cells.get((string_index, fret))
+        if cell is None:
+            return 0, 0
+        n = min(cell[1], OUTCOME_BITS)
+        return n, _low(cell[0], n).bit_count()
+
+    def grid(self, num_strings: int, max_fret: int) -> Tuple[array, array]:
+        """Flat (answers, correct) arrays, row-major like PositionCounters.grid()."""
+        width = max_fret + 1
+        answers = array("B", bytes(num_strings * width))
+        correct = array("B", bytes(num_strings * width))
+        for (s, f), (bits, seen) in self.cells.items():
+            if 0 <= s < num_strings and 0 <= f < width:
+                n = min(seen, OUTCOME_BITS)
+                answers[s * width + f] = n
+                correct[s * width + f] = _low(bits, n).bit_count()
+        return answers, correct
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _VERSION, OUTCOME_BITS, len(self.cells))]
+        for (s, f), (bits, seen) in sorted(self.cells.items()):
+            parts.append(_CELL.pack(s, f, bits, min(seen, 0xFFFFFFFF)))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OutcomeBits":
+        """Raises ValueError on malformed data."""
+        if len(data) < _HEADER.size:
+            raise ValueError("outcome data too short")
+        magic, version, width, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or width != OUTCOME_BITS:
+            raise ValueError("not an outcome file")
+        if len(data) != _HEADER.size + count * _CELL.size:
+            raise ValueError("outcome data has the wrong size")
+        out = cls()
+        for s, f, bits, seen in _CELL.iter_unpack(data[_HEADER.size :]):
+            if seen:
+                out.cells[(s, f)] = [_low(bits, seen), seen]
+        return out
+
+
+def read_outcomes(stats_path: str) -> Optional[OutcomeBits]:
+    """Registers stored next to a profile (None if there is no outcome file).
+
+    Raises ValueError if the file is malformed.
+    """
+    return read_sidecar(outcomes_path_for(stats_path), OutcomeBits)
+
+
+def write_outcomes(stats_path: str, outcomes: OutcomeBits) -> None:
+    # Written even when empty: a missing file means "rebuild from history".
+    write_sidecar(outcomes_path_for(stats_path), outcomes, keep_empty=True)
+
+
+def append_outcomes(stats_path: str, increment: OutcomeBits) -> None:
+    """Shift increment's answers into the stored registers.
+
+    Call this before appending the same attempts to the history (a missing
+    file is rebuilt from it).
+    """
+    append_sidecar(
+        outcomes_path_for(stats_path),
+        increment,
+        OutcomeBits,
+        missing=lambda: OutcomeBits.from_history(read_history(stats_path)),
+        keep_empty=True,
+    )
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from guitar_trainer.core.note_counters import NoteCounters
+from guitar_trainer.core.stats import list_stats_profiles, load_stats, stats_signature
+from guitar_trainer.core.stats_index import index_is_fresh, restamp_index
+from guitar_trainer.core.tuning import get_tuning_presets
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# (note attempts, note correct, open-string attempts, open-string correct),
+# each a 12-slot list indexed by pitch class; None if the tuning is unknown.
+_Partial = Optional[Tuple[list, list, list, list]]
+
+
+def profile_tuning(meta: Dict[str, Any]) -> Optional[list[int]]:
+    """The tuning a profile was recorded in (meta "tuning", else a preset by name)."""
+    tuning = meta.get("tuning")
+    if isinstance(tuning, list) and tuning and all(isinstance(x, int) for x in tuning):
+        return [x % 12 for x in tuning]
+    try:
+        num_strings = int(meta.get("num_strings", 0))
+    except (TypeError, ValueError):
+        return None
+    preset = get_tuning_presets(num_strings).get(str(meta.get("tuning_name", "")))
+    if preset is None or len(preset) != num_strings:
+        return None
+    return list(preset)
+
+
+def _profile_partial(path: str) -> _Partial:
+    # Runs in a worker process.
+    stats = load_stats(path)
+    tuning = profile_tuning(stats.meta)
+    if tuning is None:
+        return None
+
+    note_a, note_c = [0] * 12, [0] * 12
+    open_a, open_c = [0] * 12, [0] * 12
+    positions = stats.by_position
+    for s in range(min(len(tuning), positions.num_strings)):
+        open_pc = tuning[s]
+        for f in range(positions.stride):
+            a, c = positions.counts(s, f)
+            if not (a or c):
+                continue
+            pc = (open_pc + f) % 12
+            note_a[pc] += a
+            note_c[pc] += c
+            open_a[open_pc] += a
+            open_c[open_pc] += c
+    return note_a, note_c, open_a, open_c
+
+
+@dataclass
+class PitchReport:
+    """Position attempts of several profiles folded onto pitch classes.
+
+    by_note counts the note played (the fretted position mapped through each
+    profile's tuning); by_string_pitch counts by the open-string note, so a
+    D string in Drop D and in D Standard add up. Profiles whose tuning is
+    unknown are listed in skipped.
+    """
+
+    by_note: NoteCounters = field(default_factory=NoteCounters)
+    by_string_pitch: NoteCounters = field(default_factory=NoteCounters)
+    profiles: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+
+    def _add(self, partial: Tuple[list, list, list, list]) -> None:
+        note_a, note_c, open_a, open_c = partial
+        for pc in range(12):
+            a, c = self.by_note.counts(pc)
+            self.by_note.set_counts(pc, a + note_a[pc], c + note_c[pc])
+            a, c = self.by_string_pitch.counts(pc)
+            self.by_string_pitch.set_counts(pc, a + open_a[pc], c + open_c[pc])
+
+
+# Hidden so the "stats_*" profile globs never pick it up.
+CACHE_NAME = ".pitch_report.json"
+CACHE_VERSION = 1
+
+
+def cache_path_for(directory: str) -> str:
+    return os.path.join(directory or ".", CACHE_NAME)
+
+
+def _signature_json(signature: tuple) -> list:
+    return [list(s) if s is not None else None for s in signature]
+
+
+def _valid_partial(partial: Any) -> bool:
+    return partial is None or (
+        isinstance(partial, list)
+        and len(partial) == 4
+        and all(isinstance(col, list) and len(col) == 12 and all(isinstance(n, int) for n in col) for col in partial)
+    )
+
+
+def _read_cache(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Per-profile partials by file name, each with the stats_signature() it was computed for."""
+    path = cache_path_for(directory)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable pitch report cache '%s': %s", path, e)
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != CACHE_VERSION or not isinstance(raw.get("profiles"), dict):
+        return {}
+    return {str(k): v for k, v in raw["profiles"].items() if isinstance(v, dict)}
+
+
+def _write_cache(directory: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Replace the cache file; like the stats index it can always be rebuilt, so it is not fsynced."""
+    index_fresh = index_is_fresh(directory)
+    fd, tmp_path = tempfile.mkstemp(prefix=CACHE_NAME + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "profiles": entries}, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path_for(directory))
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception:
+            pass
+    if index_fresh:
+        restamp_index(directory)
+
+
+def pitch_report(directory: str = ".", pattern: str = "stats_*", *, jobs: Optional[int] = None) -> PitchReport:
+    """Combine every profile in directory into one PitchReport.
+
+    Profiles are loaded in a process pool. Each profile's result is kept in
+    the directory's .pitch_report.json keyed by the mtimes/sizes of its
+    files, so a later run only reloads the profiles that changed since.
+    """
+    paths = sorted(p for p, _summary in list_stats_profiles(directory, pattern))
+    cached = _read_cache(directory)
+    entries: Dict[str, Dict[str, Any]] = {}
+    stale = []
+    for p in paths:
+        name = os.path.basename(p)
+        signature = _signature_json(stats_signature(p))
+        entry = cached.get(name)
+        if entry is not None and entry.get("signature") == signature and _valid_partial(entry.get("partial")):
+            entries[name] = entry
+        else:
+            entries[name] = {"signature": signature}
+            stale.append(p)
+
+    if stale:
+        workers = max(1, min(len(stale), jobs or os.cpu_count() or 1))
+        if workers == 1:
+            results = [_profile_partial(p) for p in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_profile_partial, stale))
+        for p, partial in zip(stale, results):
+            entries[os.path.basename(p)]["partial"] = partial
+    if stale or entries.keys() != cached.keys():
+        try:
+            _write_cache(directory, entries)
+        except OSError as e:
+            logger.warning("Failed to write pitch report cache in '%s': %s", directory, e)
+
+    report = PitchReport()
+    for p in paths:
+        partial = entries[os.path.basename(p)].get("partial")
+        if partial is None:
+            report.skipped.append(p)
+        else:
+            report._add(partial)
+            report.profiles.append(p)
+    return report
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Tuple
+
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+
+# Initial board allocated on first write; grows on demand.
+DEFAULT_STRINGS = 6
+DEFAULT_FRETS = 25  # frets 0..24
+
+
+def _zeros(n: int) -> array:
+    return array("I", bytes(array("I").itemsize * n))
+
+
+class PositionCounters(MutableMapping):
+    """Dense attempts/correct counters per (string, fret).
+
+    Counts live in two flat array('I') buffers indexed by
+    string_index * stride + fret, where stride = max_fret + 1 of the current
+    allocation. The object still behaves like the old
+    {"<s>,<f>": {"attempts": n, "correct": m}} dict: reading a key returns a
+    fresh bucket dict (changing it does not write back), assigning a whole
+    bucket stores it, and only positions with data are listed as keys.
+    """
+
+    def __init__(self, num_strings: int = 0, num_frets: int = 0) -> None:
+        self.num_strings = max(0, int(num_strings))
+        self.stride = max(0, int(num_frets))
+        self.attempts = _zeros(self.num_strings * self.stride)
+        self.correct = _zeros(self.num_strings * self.stride)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "PositionCounters":
+        """Build counters from the JSON {"s,f": {...}} layout (bad keys are skipped)."""
+        if isinstance(data, PositionCounters):
+            return data.copy()
+
+        items: list[tuple[int, int, int, int]] = []
+        for key, bucket in dict(data or {}).items():
+            parsed = parse_pos_key(key)
+            if parsed is None or parsed[0] < 0 or parsed[1] < 0 or not isinstance(bucket, dict):
+                continue
+            try:
+                a = int(bucket.get("attempts", 0))
+                c = int(bucket.get("correct", 0))
+            except (TypeError, ValueError):
+                continue
+            items.append((parsed[0], parsed[1], max(0, a), max(0, c)))
+
+        num_strings = max([s + 1 for s, _f, _a, _c in items] + [0])
+        num_frets = max([f + 1 for _s, f, _a, _c in items] + [0])
+        out = cls(num_strings, num_frets)
+        for s, f, a, c in items:
+            i = s * out.stride + f
+            out.attempts[i] = a
+            out.correct[i] = c
+        return out
+
+    @classmethod
+    def from_arrays(cls, num_strings: int, num_frets: int, attempts: array, correct: array) -> "PositionCounters":
+        """Adopt ready-made row-major buffers (no per-position work, no copy)."""
+        size = max(0, int(num_strings)) * max(0, int(num_frets))
+        if len(attempts) != size or len(correct) != size:
+            raise ValueError("position arrays do not match the board size")
+        out = cls()
+        out.num_strings = int(num_strings)
+        out.stride = int(num_frets)
+        out.attempts = attempts
+        out.correct = correct
+        return out
+
+    def copy(self) -> "PositionCounters":
+        out = PositionCounters()
+        out.num_strings = self.num_strings
+        out.stride = self.stride
+        out.attempts = array("I", self.attempts)
+        out.correct = array("I", self.correct)
+        return out
+
+    def to_dict(self) -> dict[str, dict[str, int]]:
+        return {key: self[key] for key in self}
+
+    # -------------------------
+    # Dense access
+    # -------------------------
+    def _grow(self, num_strings: int, stride: int) -> None:
+        if num_strings <= self.num_strings and stride <= self.stride:
+            return
+        num_strings = max(num_strings, self.num_strings, DEFAULT_STRINGS)
+        stride = max(stride, self.stride, DEFAULT_FRETS)
+
+        attempts = _zeros(num_strings * stride)
+        correct = _zeros(num_strings * stride)
+        for s in range(self.num_strings):
+            src = s * self.stride
+            dst = s * stride
+            attempts[dst:dst + self.stride] = self.attempts[src:src + self.stride]
+            correct[dst:dst + self.stride] = self.correct[src:src + self.stride]
+
+        self.num_strings = num_strings
+        self.stride = stride
+        self.attempts = attempts
+        self.correct = correct
+
+    def add(self, string_index: int, fret: int, correct: bool) -> None:
+        if string_index >= self.num_strings or fret >= self.stride:
+            self._grow(string_index + 1, fret + 1)
+        i = string_index * self.stride + fret
+        self.attempts[i] += 1
+        if correct:
+            self.correct[i] += 1
+
+    def counts(self, string_index: int, fret: int) -> Tuple[int, int]:
+        """Return (attempts, correct) for one position; (0, 0) if unseen."""
+        if 0 <= string_index < self.num_strings and 0 <= fret < self.stride:
+            i = string_index * self.stride + fret
+            return self.attempts[i], self.correct[i]
+        return 0, 0
+
+    def set_counts(self, string_index: int, fret: int, attempts: int, correct: int) -> None:
+        if string_index >= self.num_strings or fret >= self.stride:
+            if attempts <= 0 and correct <= 0:
+                return
+            self._grow(string_index + 1, fret + 1)
+        i = string_index * self.stride + fret
+        self.attempts[i] = max(0, int(attempts))
+        self.correct[i] = max(0, int(correct))
+
+    def grid(self, num_strings: int, max_fret: int) -> Tuple[array, array]:
+        """Return flat (attempts, correct) arrays for a num_strings x (max_fret+1) board.
+
+        Row-major like the internal buffers (index s * (max_fret + 1) + f);
+        cells outside the stored range are zero.
+        """
+        width = max_fret + 1
+        if num_strings == self.num_strings and width == self.stride:
+            return array("I", self.attempts), array("I", self.correct)
+
+        attempts = _zeros(num_strings * width)
+        correct = _zeros(num_strings * width)
+        n = min(width, self.stride)
+        for s in range(min(num_strings, self.num_strings)):
+            src = s * self.stride
+            dst = s * width
+            attempts[dst:dst + n] = self.attempts[src:src + n]
+            correct[dst:dst + n] = self.correct[src:src + n]
+        return attempts, correct
+
+    # -------------------------
+    # Mapping API ("s,f" keys)
+    # -------------------------
+    def _index_for_key(self, key: Any) -> int:
+        parsed = parse_pos_key(key) if isinstance(key, str) else None
+        if parsed is None:
+            raise KeyError(key)
+        s, f = parsed
+        if not (0 <= s < self.num_strings and 0 <= f < self.stride):
+            raise KeyError(key)
+        return s * self.stride + f
+
+    def __getitem__(self, key: str) -> dict[str, int]:
+        i = self._index_for_key(key)
+        if self.attempts[i] == 0 and self.correct[i] == 0:
+            raise KeyError(key)
+        return {"attempts": self.attempts[i], "correct": self.correct[i]}
+
+    def __setitem__(self, key: str, bucket: dict) -> None:
+        parsed = parse_pos_key(key)
+        if parsed is None or parsed[0] < 0 or parsed[1] < 0:
+            raise KeyError(key)
+        bucket = bucket or {}
+        self.set_counts(parsed[0], parsed[1], int(bucket.get("attempts", 0)), int(bucket.get("correct", 0)))
+
+    def __delitem__(self, key: str) -> None:
+        i = self._index_for_key(key)
+        if self.attempts[i] == 0 and self.correct[i] == 0:
+            raise KeyError(key)
+        self.attempts[i] = 0
+        self.correct[i] = 0
+
+    def __iter__(self) -> Iterator[str]:
+        stride = self.stride
+        for i, (a, c) in enumerate(zip(self.attempts, self.correct)):
+            if a or c:
+                yield pos_key(i // stride, i % stride)
+
+    def __len__(self) -> int:
+        return sum(1 for a, c in zip(self.attempts, self.correct) if a or c)
+
+    def __repr__(self) -> str:
+        return f"PositionCounters({self.to_dict()!r})"
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import struct
+from typing import Iterable, Iterator, Tuple
+
+from guitar_trainer.core.attempt_history import (
+    AttemptColumns,
+    iter_history_blocks,
+    iter_history_stream,
+    write_history_blocks,
+    write_history_stream,
+)
+from guitar_trainer.core.device_counters import META_DEVICES, merge_slices, slices_from_records
+from guitar_trainer.core.file_lock import file_lock
+from guitar_trainer.core.note_counters import note_key
+from guitar_trainer.core.notes import index_to_name, parse_note_name
+from guitar_trainer.core.outcome_bits import OutcomeBits, write_outcomes
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+from guitar_trainer.core.recency import RecencyCounters, write_recency
+from guitar_trainer.core.response_sketch import ResponseTimes, write_response_times
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+# Export layouts:
+# - CSV: a directory with counters.csv (section,key,attempts,correct),
+#   where "confusion" rows are keyed "<asked>><given>" and count in attempts,
+#   attempts.csv (one row per recorded attempt), meta.json and, if the
+#   profile holds other devices' counters, devices.json.
+# - Columnar: one file, b"GTEX" + uint16 version + uint32 length + the
+#   counters (and devices) as JSON, followed by the history in the .history
+#   file layout.
+COLUMNAR_SUFFIX = ".gtexport"
+
+COUNTERS_CSV = "counters.csv"
+ATTEMPTS_CSV = "attempts.csv"
+META_JSON = "meta.json"
+DEVICES_JSON = "devices.json"
+
+COUNTER_FIELDS = ("section", "key", "attempts", "correct")
+ATTEMPT_FIELDS = ("timestamp_ms", "mode", "correct", "note", "string", "fret", "response_ms")
+
+_MAGIC = b"GTEX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+
+# Attempts read back from CSV are written to the history in blocks of this size.
+IMPORT_BLOCK_ROWS = 4096
+
+
+def is_columnar_export(path: str) -> bool:
+    return os.fspath(path).lower().endswith(COLUMNAR_SUFFIX)
+
+
+def iter_counter_rows(stats: Stats) -> Iterator[Tuple[str, str, int, int]]:
+    """Yield (section, key, attempts, correct) for every counter of stats."""
+    yield "total", "", stats.total_attempts, stats.total_correct
+    for section, buckets in (("mode", stats.by_mode), ("note", stats.by_note)):
+        for key, bucket in buckets.items():
+            yield section, key, int(bucket.get("attempts", 0)), int(bucket.get("correct", 0))
+    for key in stats.by_position:
+        parsed = parse_pos_key(key)
+        if parsed is not None:
+            a, c = stats.by_position.counts(*parsed)
+            yield "position", pos_key(*parsed), a, c
+    for asked, given, n in stats.confusion.most_common(len(stats.confusion.counts)):
+        yield "confusion", f"{index_to_name(asked)}>{index_to_name(given)}", n, 0
+
+
+def iter_attempt_rows(stats_path: str) -> Iterator[tuple]:
+    """Yield a profile's recorded attempts as CSV rows (see ATTEMPT_FIELDS), block by block."""
+    for block in iter_history_blocks(stats_path):
+        for row in block:
+            yield (
+                row.timestamp_ms,
+                row.mode,
+                int(row.correct),
+                index_to_name(row.note) if row.note >= 0 else "",
+                row.string if row.string >= 0 else "",
+                row.fret if row.fret >= 0 else "",
+                row.response_ms or "",
+            )
+
+
+def _stats_from_counter_rows(rows: Iterable[Tuple[str, str, int, int]], meta: dict) -> Stats:
+    stats = Stats(meta=dict(meta))
+    for section, key, a, c in rows:
+        a, c = max(0, int(a)), max(0, int(c))
+        if section == "total":
+            stats.total_attempts, stats.total_correct = a, c
+        elif section == "mode":
+            stats.by_mode[key] = {"attempts": a, "correct": c}
+        elif section == "note":
+            if note_key(key) is None:
+                raise ValueError(f"bad note: {key!r}")
+            stats.by_note[key] = {"attempts": a, "correct": c}
+        elif section == "position":
+            parsed = parse_pos_key(key)
+            if parsed is None or parsed[0] < 0 or parsed[1] < 0:
+                raise ValueError(f"bad position key: {key!r}")
+            stats.by_position.set_counts(parsed[0], parsed[1], a, c)
+        elif section == "confusion":
+            asked, _sep, given = key.partition(">")
+            asked_pc, given_pc = parse_note_name(asked), parse_note_name(given)
+            if asked_pc is None or given_pc is None:
+                raise ValueError(f"bad confusion key: {key!r}")
+            stats.confusion.add(asked_pc, given_pc, a)
+        else:
+            raise ValueError(f"unknown counter section: {section!r}")
+    for mode in ("A", "B"):
+        stats.by_mode.setdefault(mode, {"attempts": 0, "correct": 0})
+    return stats
+
+
+def _devices_record(stats: Stats) -> dict:
+    return {k: stats.devices[k].to_record() for k in sorted(stats.devices)}
+
+
+def _set_devices(stats: Stats, raw) -> None:
+    # Exports made while the counters were kept in meta carry them there.
+    stats.devices = slices_from_records(raw)
+    if META_DEVICES in stats.meta:
+        merge_slices(stats.devices, slices_from_records(stats.meta.pop(META_DEVICES)))
+
+
+def _blocks_from_csv_rows(rows: Iterable[dict]) -> Iterator[AttemptColumns]:
+    block = AttemptColumns()
+    for row in rows:
+        s, f, ms = row.get("string"), row.get("fret"), row.get("response_ms")
+        block.append(
+            timestamp_ms=int(row["timestamp_ms"]),
+            mode=row.get("mode") or "A",
+            correct=row.get("correct") in ("1", "true", "True"),
+            note_name=row.get("note") or "",
+            string_index=int(s) if s else None,
+            fret=int(f) if f else None,
+            response_ms=int(ms) if ms else None,
+        )
+        if len(block) >= IMPORT_BLOCK_ROWS:
+            yield block
+            block = AttemptColumns()
+    if len(block):
+        yield block
+
+
+def _tracking_positions(
+    blocks: Iterable[AttemptColumns], recency: RecencyCounters, outcomes: OutcomeBits, times: ResponseTimes
+) -> Iterator[AttemptColumns]:
+    # Rebuild the per-position sidecars while the history streams past.
+    for block in blocks:
+        for row in block:
+            if row.string >= 0 and row.fret >= 0:
+                recency.add(row.string, row.fret, row.correct, row.timestamp_ms / 1000.0)
+                outcomes.add(row.string, row.fret, row.correct)
+            if row.correct and row.response_ms:
+                times.add(row.response_ms, row.string, row.fret, row.note)
+        yield block
+
+
+def _write_profile(stats_path: str, stats: Stats, blocks: Iterable[AttemptColumns]) -> None:
+    if not save_stats(stats_path, stats):
+        raise OSError(f"could not write {stats_path}")
+    recency = RecencyCounters()
+    outcomes = OutcomeBits()
+    times = ResponseTimes()
+    with file_lock(stats_path):
+        write_history_blocks(stats_path, _tracking_positions(blocks, recency, outcomes, times))
+        write_recency(stats_path, recency)
+        write_outcomes(stats_path, outcomes)
+        write_response_times(stats_path, times)
+
+
+def export_profile(stats_path: str, out: str) -> None:
+    """Export a profile to out (a COLUMNAR_SUFFIX file, otherwise a CSV directory).
+
+    Counters are written from the loaded stats; the history is streamed one
+    stored block at a time, so memory does not grow with the history.
+    Raises OSError/ValueError on failure.
+    """
+    stats = load_stats(stats_path)
+    if is_columnar_export(out):
+        doc = json.dumps(
+            {"meta": stats.meta, "counters": list(iter_counter_rows(stats)), "devices": _devices_record(stats)},
+            ensure_ascii=False,
+        )
+        data = doc.encode("utf-8")
+        with open(out, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(data)))
+            f.write(data)
+            write_history_stream(f, iter_history_blocks(stats_path))
+        return
+
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, COUNTERS_CSV), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COUNTER_FIELDS)
+        writer.writerows(iter_counter_rows(stats))
+    with open(os.path.join(out, ATTEMPTS_CSV), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ATTEMPT_FIELDS)
+        writer.writerows(iter_attempt_rows(stats_path))
+    with open(os.path.join(out, META_JSON), "w", encoding="utf-8") as f:
+        json.dump(stats.meta, f, indent=2, ensure_ascii=False)
+    devices_path = os.path.join(out, DEVICES_JSON)
+    if stats.devices:
+        with open(devices_path, "w", encoding="utf-8") as f:
+            json.dump(_devices_record(stats), f, indent=2, ensure_ascii=False)
+    elif os.path.exists(devices_path):
+        os.remove(devices_path)
+
+
+def import_profile(src: str, stats_path: str) -> Stats:
+    """Replace the profile at stats_path with an export made by export_profile().
+
+    src is a CSV directory or a columnar export file. The history is
+    streamed into the profile's history file block by block.
+    Raises OSError/ValueError if src cannot be read.
+    """
+    if os.path.isdir(src):
+        meta: dict = {}
+        meta_path = os.path.join(src, META_JSON)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        with open(os.path.join(src, COUNTERS_CSV), newline="", encoding="utf-8") as f:
+            rows = ((r["section"], r["key"], r["attempts"], r["correct"]) for r in csv.DictReader(f))
+            stats = _stats_from_counter_rows(rows, meta if isinstance(meta, dict) else {})
+        devices: dict = {}
+        devices_path = os.path.join(src, DEVICES_JSON)
+        if os.path.exists(devices_path):
+            with open(devices_path, encoding="utf-8") as f:
+                devices = json.load(f)
+        _set_devices(stats, devices)
+        attempts_path = os.path.join(src, ATTEMPTS_CSV)
+        if not os.path.exists(attempts_path):
+            _write_profile(stats_path, stats, [])
+            return stats
+        with open(attempts_path, newline="", encoding="utf-8") as f:
+            _write_profile(stats_path, stats, _blocks_from_csv_rows(csv.DictReader(f)))
+        return stats
+
+    with open(src, "rb") as f:
+        head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise ValueError("export file too short")
+        magic, version, size = _HEADER.unpack(head)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a profile export")
+        doc = json.loads(f.read(size).decode("utf-8"))
+        meta = doc.get("meta") if isinstance(doc.get("meta"), dict) else {}
+        stats = _stats_from_counter_rows(doc.get("counters") or [], meta)
+        _set_devices(stats, doc.get("devices"))
+        _write_profile(stats_path, stats, iter_history_stream(f))
+    return stats
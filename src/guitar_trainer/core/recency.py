@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import struct
+import time
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+from guitar_trainer.core.sidecar_file import append_sidecar, read_sidecar, write_sidecar
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# An attempt counts half as much after this long.
+HALF_LIFE_SEC = 14 * 24 * 3600.0
+
+# Cells whose decayed mass drops below this after a subtraction are dropped.
+_EPSILON = 1e-9
+
+RECENCY_SUFFIX = ".recency"
+
+# b"GTRC" + uint16 version + float64 half-life + uint32 count,
+# then count x (uint16 string, uint16 fret, float64 mass, float64 correct, float64 updated).
+_HEADER = struct.Struct("<4sHdI")
+_CELL = struct.Struct("<HHddd")
+_MAGIC = b"GTRC"
+_VERSION = 1
+
+
+def recency_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, RECENCY_SUFFIX)
+
+
+class RecencyCounters:
+    """Exponentially decayed attempts/correct per (string, fret).
+
+    Each cell is [mass, correct, updated]: the decayed attempt and correct
+    counts as of the unix time updated. Decay is applied lazily, only when a
+    cell is updated or read, so add() is O(1). correct / mass is the
+    recency-weighted accuracy (it does not change as time passes).
+
+    Cells with the same half-life add up exactly after decaying to a common
+    time, so increments recorded by different processes merge like counters.
+    """
+
+    def __init__(self, half_life_sec: float = HALF_LIFE_SEC) -> None:
+        self.half_life_sec = float(half_life_sec)
+        self.cells: Dict[Tuple[int, int], list] = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.cells)
+
+    def _decay(self, seconds: float) -> float:
+        if seconds <= 0:
+            return 1.0
+        return 0.5 ** (seconds / self.half_life_sec)
+
+    def _merge(self, key: Tuple[int, int], mass: float, correct: float, updated: float) -> None:
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [mass, correct, updated]
+            return
+        now = max(cell[2], updated)
+        k_old = self._decay(now - cell[2])
+        k_new = self._decay(now - updated)
+        cell[0] = cell[0] * k_old + mass * k_new
+        cell[1] = cell[1] * k_old + correct * k_new
+        cell[2] = now
+        if cell[0] <= _EPSILON:
+            del self.cells[key]
+
+    def add(self, string_index: int, fret: int, correct: bool, now: Optional[float] = None) -> None:
+        self._merge((string_index, fret), 1.0, 1.0 if correct else 0.0, time.time() if now is None else now)
+
+    def merge(self, other: "RecencyCounters") -> None:
+        for key, (mass, correct, updated) in other.cells.items():
+            self._merge(key, mass, correct, updated)
+
+    def subtract(self, other: "RecencyCounters") -> None:
+        for key, (mass, correct, updated) in other.cells.items():
+            if key in self.cells:
+                self._merge(key, -mass, -correct, updated)
+
+    def copy(self) -> "RecencyCounters":
+        out = RecencyCounters(self.half_life_sec)
+        out.cells = {k: list(v) for k, v in self.cells.items()}
+        return out
+
+    def mass(self, string_index: int, fret: int, now: Optional[float] = None) -> float:
+        """Decayed number of attempts at a position as of now."""
+        cell = self.cells.get((string_index, fret))
+        if cell is None:
+            return 0.0
+        return cell[0] * self._decay((time.time() if now is None else now) - cell[2])
+
+    def accuracy(self, string_index: int, fret: int) -> Optional[float]:
+        """Recency-weighted accuracy at a position; None if it has no data."""
+        cell = self.cells.get((string_index, fret))
+        if cell is None or cell[0] <= _EPSILON:
+            return None
+        return min(1.0, max(0.0, cell[1] / cell[0]))
+
+    def grid(self, num_strings: int, max_fret: int, now: Optional[float] = None) -> Tuple[array, array]:
+        """Flat (mass, correct) arrays decayed to now, row-major like PositionCounters.grid()."""
+        width = max_fret + 1
+        now = time.time() if now is None else now
+        mass = array("d", bytes(8 * num_strings * width))
+        correct = array("d", bytes(8 * num_strings * width))
+        for (s, f), (m, c, updated) in self.cells.items():
+            if 0 <= s < num_strings and 0 <= f < width:
+                k = self._decay(now - updated)
+                mass[s * width + f] = m * k
+                correct[s * width + f] = c * k
+        return mass, correct
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _VERSION, self.half_life_sec, len(self.cells))]
+        for (s, f), (m, c, updated) in sorted(self.cells.items()):
+            parts.append(_CELL.pack(s, f, m, c, updated))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RecencyCounters":
+        """Raises ValueError on malformed data."""
+        if len(data) < _HEADER.size:
+            raise ValueError("recency data too short")
+        magic, version, half_life, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or half_life <= 0:
+            raise ValueError("not a recency file")
+        if len(data) != _HEADER.size + count * _CELL.size:
+            raise ValueError("recency data has the wrong size")
+        out = cls(half_life)
+        for s, f, m, c, updated in _CELL.iter_unpack(data[_HEADER.size :]):
+            out.cells[(s, f)] = [m, c, updated]
+        return out
+
+
+def read_recency(stats_path: str) -> RecencyCounters:
+    """Decayed counters stored next to a profile (empty if there are none).
+
+    Raises ValueError if the file is malformed.
+    """
+    recency = read_sidecar(recency_path_for(stats_path), RecencyCounters)
+    return recency if recency is not None else RecencyCounters()
+
+
+def write_recency(stats_path: str, recency: RecencyCounters) -> None:
+    write_sidecar(recency_path_for(stats_path), recency)
+
+
+def append_recency(stats_path: str, increment: RecencyCounters) -> None:
+    """Merge increment into the stored counters, so other processes' updates stay."""
+    append_sidecar(recency_path_for(stats_path), increment, RecencyCounters, missing=RecencyCounters)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import math
+import struct
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+from guitar_trainer.core.attempt_history import AttemptColumns, read_history
+from guitar_trainer.core.sidecar_file import append_sidecar, from_le, le_bytes, read_sidecar, write_sidecar
+from guitar_trainer.core.stats_journal import sidecar_path
+
+# Log-spaced buckets: bucket 0 holds answers under MIN_MS, bucket i >= 1
+# holds [MIN_MS * RATIO**(i-1), MIN_MS * RATIO**i) and the last one is
+# open-ended (from about 80 s). Each bucket is ~19% wide, which bounds the
+# relative error of a quantile read back from it.
+SKETCH_BUCKETS = 40
+MIN_MS = 100.0
+RATIO = 2.0 ** 0.25
+_LOG_RATIO = math.log(RATIO)
+
+RESPONSE_SUFFIX = ".latency"
+
+# b"GTRT" + uint16 version + uint16 buckets + uint32 positions + uint32 notes,
+# then positions x (uint16 string, uint16 fret, buckets x uint32)
+# and notes x (uint16 pitch class, buckets x uint32).
+_HEADER = struct.Struct("<4sHHII")
+_POS = struct.Struct("<HH")
+_NOTE = struct.Struct("<H")
+_MAGIC = b"GTRT"
+_VERSION = 1
+
+def response_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, RESPONSE_SUFFIX)
+
+
+def bucket_of(ms: float) -> int:
+    if ms < MIN_MS:
+        return 0
+    return min(SKETCH_BUCKETS - 1, int(math.log(ms / MIN_MS) / _LOG_RATIO) + 1)
+
+
+def bucket_value(i: int) -> float:
+    """Representative time of a bucket (its geometric middle; the lower edge for the last)."""
+    if i <= 0:
+        return MIN_MS / 2.0
+    if i >= SKETCH_BUCKETS - 1:
+        return MIN_MS * RATIO ** (SKETCH_BUCKETS - 2)
+    return MIN_MS * RATIO ** (i - 0.5)
+
+
+def _zeros() -> array:
+    return array("I", bytes(4 * SKETCH_BUCKETS))
+
+
+def _quantile(counts: Optional[array], q: float) -> Optional[float]:
+    if counts is None:
+        return None
+    total = sum(counts)
+    if not total:
+        return None
+    rank = min(total, max(1, math.ceil(q * total)))
+    seen = 0
+    for i, n in enumerate(counts):
+        seen += n
+        if seen >= rank:
+            return bucket_value(i)
+    return bucket_value(SKETCH_BUCKETS - 1)
+
+
+def _add_into(into: Dict, key, counts: Iterable[int], sign: int) -> None:
+    cur = into.get(key)
+    if cur is None:
+        if sign < 0:
+            return
+        cur = into[key] = _zeros()
+    for i, n in enumerate(counts):
+        cur[i] = max(0, cur[i] + sign * n)
+    if not any(cur):
+        del into[key]
+
+
+class ResponseTimes:
+    """Answer-time histograms per (string, fret) and per pitch class.
+
+    Each histogram has SKETCH_BUCKETS log-spaced counters, so a cell costs
+    the same whatever the number of answers, add() is O(1) and a quantile
+    is one pass over the buckets. Only correct answers are counted: the
+    point is finding what the user knows but still has to think about.
+    Histograms are counters, so increments merge and subtract exactly.
+    """
+
+    def __init__(self) -> None:
+        self.positions: Dict[Tuple[int, int], array] = {}
+        self.notes: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions) + len(self.notes)
+
+    def add(self, response_ms: int, string_index: Optional[int], fret: Optional[int], pitch_class: Optional[int]) -> None:
+        b = bucket_of(response_ms)
+        if string_index is not None and fret is not None and string_index >= 0 and fret >= 0:
+            cell = self.positions.get((string_index, fret))
+            if cell is None:
+                cell = self.positions[(string_index, fret)] = _zeros()
+            cell[b] += 1
+        if pitch_class is not None and pitch_class >= 0:
+            cell = self.notes.get(pitch_class % 12)
+            if cell is None:
+                cell = self.notes[pitch_class % 12] = _zeros()
+            cell[b] += 1
+
+    def merge(self, other: "ResponseTimes") -> None:
+        for key, counts in other.positions.items():
+            _add_into(self.positions, key, counts, 1)
+        for key, counts in other.notes.items():
+            _add_into(self.notes, key, counts, 1)
+
+    def subtract(self, other: "ResponseTimes") -> None:
+        for key, counts in other.positions.items():
+            _add_into(self.positions, key, counts, -1)
+        for key, counts in other.notes.items():
+            _add_into(self.notes, key, counts, -1)
+
+    def copy(self) -> "ResponseTimes":
+        out = ResponseTimes()
+        out.positions = {k: array("I", v) for k, v in self.positions.items()}
+        out.notes = {k: array("I", v) for k, v in self.notes.items()}
+        return out
+
+    @classmethod
+    def from_history(cls, history: AttemptColumns) -> "ResponseTimes":
+        """Histograms of the timed correct answers among recorded attempts."""
+        out = cls()
+        for row in history:
+            if row.correct and row.response_ms:
+                out.add(row.response_ms, row.string, row.fret, row.note)
+        return out
+
+    def position_count(self, string_index: int, fret: int) -> int:
+        cell = self.positions.get((string_index, fret))
+        return sum(cell) if cell is not None else 0
+
+    def position_quantile(self, string_index: int, fret: int, q: float = 0.5) -> Optional[float]:
+        """Approximate q-quantile answer time (ms) at a position; None without data."""
+        return _quantile(self.positions.get((string_index, fret)), q)
+
+    def note_quantile(self, pitch_class: int, q: float = 0.5) -> Optional[float]:
+        return _quantile(self.notes.get(pitch_class % 12), q)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _VERSION, SKETCH_BUCKETS, len(self.positions), len(self.notes))]
+        for (s, f), counts in sorted(self.positions.items()):
+            parts.append(_POS.pack(s, f))
+            parts.append(le_bytes(counts))
+        for pc, counts in sorted(self.notes.items()):
+            parts.append(_NOTE.pack(pc))
+            parts.append(le_bytes(counts))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ResponseTimes":
+        """Raises ValueError on malformed data."""
+        if len(data) < _HEADER.size:
+            raise ValueError("response time data too short")
+        magic, version, buckets, num_pos, num_notes = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or buckets != SKETCH_BUCKETS:
+            raise ValueError("not a response time file")
+        size = 4 * SKETCH_BUCKETS
+        if len(data) != _HEADER.size + num_pos * (_POS.size + size) + num_notes * (_NOTE.size + size):
+            raise ValueError("response time data has the wrong size")
+
+        out = cls()
+        offset = _HEADER.size
+        for _ in range(num_pos):
+            s, f = _POS.unpack_from(data, offset)
+            offset += _POS.size
+            out.positions[(s, f)] = from_le("I", data[offset : offset + size])
+            offset += size
+        for _ in range(num_notes):
+            (pc,) = _NOTE.unpack_from(data, offset)
+            offset += _NOTE.size
+            out.notes[pc % 12] = from_le("I", data[offset : offset + size])
+            offset += size
+        return out
+
+
+def read_response_times(stats_path: str) -> Optional[ResponseTimes]:
+    """Histograms stored next to a profile (None if there is no file).
+
+    Raises ValueError if the file is malformed.
+    """
+    return read_sidecar(response_path_for(stats_path), ResponseTimes)
+
+
+def write_response_times(stats_path: str, times: ResponseTimes) -> None:
+    # Written even when empty: a missing file means "rebuild from history".
+    write_sidecar(response_path_for(stats_path), times, keep_empty=True)
+
+
+def append_response_times(stats_path: str, increment: ResponseTimes) -> None:
+    """Add increment's counts to the stored histograms.
+
+    Call this before appending the same attempts to the history (a missing
+    file is rebuilt from it).
+    """
+    append_sidecar(
+        response_path_for(stats_path),
+        increment,
+        ResponseTimes,
+        missing=lambda: ResponseTimes.from_history(read_history(stats_path)),
+        keep_empty=True,
+    )
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+from guitar_trainer.core.attempt_query import percentile
+from guitar_trainer.core.file_lock import file_lock
+from guitar_trainer.core.stats_journal import sidecar_path
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# One JSON object per line, appended next to the profile when a quiz or
+# practice run ends: stats_6__e_standard.sessions. Reading the last N
+# sessions only reads the tail of the file.
+SESSIONS_SUFFIX = ".sessions"
+
+# Session kinds (the GUI screen that ran the session).
+PRACTICE = "practice"
+NOTE_QUIZ = "note_quiz"
+ADAPTIVE_QUIZ = "adaptive_quiz"
+POSITIONS_QUIZ = "positions_quiz"
+STRING_QUIZ = "string_quiz"
+SESSION_KINDS = (PRACTICE, NOTE_QUIZ, ADAPTIVE_QUIZ, POSITIONS_QUIZ, STRING_QUIZ)
+
+_TAIL_CHUNK = 8192
+
+
+def sessions_path_for(stats_path: str) -> str:
+    return sidecar_path(stats_path, SESSIONS_SUFFIX)
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """Aggregates of one finished quiz/practice run.
+
+    started/ended are unix seconds; latencies are in milliseconds over the
+    answers that were timed; positions lists the distinct (string, fret)
+    cells asked, in first-seen order.
+    """
+
+    started: float
+    ended: float
+    mode: str
+    settings: Dict[str, Any] = field(default_factory=dict)
+    answered: int = 0
+    correct: int = 0
+    avg_ms: float = 0.0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    positions: Tuple[Tuple[int, int], ...] = ()
+
+    @property
+    def accuracy(self) -> float:
+        return (self.correct / self.answered) if self.answered else 0.0
+
+    @property
+    def duration_sec(self) -> float:
+        return max(0.0, self.ended - self.started)
+
+    def to_record(self) -> dict:
+        return {
+            "start": round(self.started, 3),
+            "end": round(self.ended, 3),
+            "mode": self.mode,
+            "settings": self.settings,
+            "answered": self.answered,
+            "correct": self.correct,
+            "avg_ms": round(self.avg_ms, 1),
+            "p50_ms": round(self.p50_ms, 1),
+            "p90_ms": round(self.p90_ms, 1),
+            "positions": [list(p) for p in self.positions],
+        }
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "SessionRecord":
+        """Raises ValueError/TypeError/KeyError if rec is malformed."""
+        if not isinstance(rec, dict):
+            raise ValueError("session record must be an object")
+        settings = rec.get("settings") or {}
+        if not isinstance(settings, dict):
+            raise ValueError("session settings must be an object")
+        return cls(
+            started=float(rec["start"]),
+            ended=float(rec["end"]),
+            mode=str(rec["mode"]),
+            settings=settings,
+            answered=int(rec.get("answered", 0)),
+            correct=int(rec.get("correct", 0)),
+            avg_ms=float(rec.get("avg_ms", 0.0)),
+            p50_ms=float(rec.get("p50_ms", 0.0)),
+            p90_ms=float(rec.get("p90_ms", 0.0)),
+            positions=tuple((int(s), int(f)) for s, f in rec.get("positions") or ()),
+        )
+
+
+class SessionRecorder:
+    """Collect the answers of a running session and build its SessionRecord.
+
+    record() is called once per answer next to the Stats.record_* call; the
+    recorder keeps only what the record needs (counts, latencies, touched
+    positions), so it stays small for any session length.
+    """
+
+    def __init__(self, mode: str, settings: Optional[Dict[str, Any]] = None, *, clock: Callable[[], float] = time.time) -> None:
+        self.mode = mode
+        self.settings = dict(settings or {})
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over: drop the answers collected so far and restart the clock."""
+        self.started = self._clock()
+        self.answered = 0
+        self.correct = 0
+        self._times: list = []
+        self._positions: Dict[Tuple[int, int], None] = {}
+
+    def record(self, correct: bool, *, response_ms: Optional[int] = None, position: Optional[Tuple[int, int]] = None) -> None:
+        self.answered += 1
+        if correct:
+            self.correct += 1
+        if response_ms is not None and response_ms > 0:
+            self._times.append(int(response_ms))
+        if position is not None:
+            self._positions.setdefault((int(position[0]), int(position[1])), None)
+
+    def finish(self) -> SessionRecord:
+        times = sorted(self._times)
+        return SessionRecord(
+            started=self.started,
+            ended=self._clock(),
+            mode=self.mode,
+            settings=dict(self.settings),
+            answered=self.answered,
+            correct=self.correct,
+            avg_ms=(sum(times) / len(times)) if times else 0.0,
+            p50_ms=float(statistics.median(times)) if times else 0.0,
+            p90_ms=percentile(times, 0.9),
+            positions=tuple(self._positions),
+        )
+
+
+def _complete_lines_end(f: BinaryIO, size: int) -> int:
+    """Offset just past the last newline of f (0 if there is none)."""
+    pos = size
+    while pos > 0:
+        step = min(_TAIL_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        i = f.read(step).rfind(b"\n")
+        if i >= 0:
+            return pos + i + 1
+    return 0
+
+
+def append_session(stats_path: str, record: SessionRecord) -> None:
+    """Append one session to the profile's session table. Raises OSError on failure.
+
+    A line cut short by a crash is dropped first, so the new line is not
+    joined to it.
+    """
+    line = json.dumps(record.to_record(), ensure_ascii=False, separators=(",", ":")) + "\n"
+    path = sessions_path_for(stats_path)
+    with file_lock(stats_path):
+        try:
+            f = open(path, "r+b")
+        except FileNotFoundError:
+            f = open(path, "w+b")
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            end = size
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    end = _complete_lines_end(f, size)
+                    f.truncate(end)
+            f.seek(end)
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _tail_lines(path: str, count: int) -> list:
+    # Read backwards in chunks until count complete lines are in the buffer.
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= count:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = buf.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # may start mid-line
+    return lines[-count:]
+
+
+def read_sessions(stats_path: str, last: Optional[int] = None) -> list[SessionRecord]:
+    """Sessions of a profile, oldest first; only the last `last` ones if given.
+
+    Lines that cannot be parsed (e.g. a write cut short by a crash) are
+    skipped. Raises OSError if the file exists but cannot be read.
+    """
+    path = sessions_path_for(stats_path)
+    if last is not None and last <= 0:
+        return []
+    try:
+        if last is None:
+            with open(path, "rb") as f:
+                lines = f.read().splitlines()
+        else:
+            lines = _tail_lines(path, last)
+    except FileNotFoundError:
+        return []
+
+    out: list[SessionRecord] = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            out.append(SessionRecord.from_record(json.loads(line)))
+        except (ValueError, TypeError, KeyError):
+            continue
+    return out
+
+
+def save_session(
+    stats_path: str,
+    recorder: SessionRecorder,
+    *,
+    append: Callable[[str, SessionRecord], None] = append_session,
+) -> Optional[SessionRecord]:
+    """Append the recorder's session to the table and reset it for the next one.
+
+    Sessions without answers are not stored. Returns the stored record.
+    Write errors are logged rather than raised, since screens call this on
+    their way out. Screens pass append=get_stats_writer().request_session,
+    so the write happens on the writer thread instead of theirs.
+    """
+    if not recorder.answered:
+        return None
+    record = recorder.finish()
+    recorder.reset()
+    try:
+        append(stats_path, record)
+    except OSError as e:
+        logger.warning("Failed to record session for '%s': %s", stats_path, e)
+        return None
+    return record
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, Protocol, Type, TypeVar
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# Counter sidecars (recency, outcomes, response times, confusions, daily
+# rollups) are a header followed by frames appended at each save:
+#
+#   header: b"GTSL" + uint16 version
+#   frame:  b"FRM" + uint8 0 + uint32 length + uint32 crc32, then length bytes
+#
+# The first frame holds the whole object (its to_bytes()), every later one
+# an increment in the same encoding, so reading merges the frames in order
+# and a save writes only its increment. A frame torn by a crash (short, or
+# failing its checksum) ends the file: readers stop there and the next
+# append cuts it off before writing. Files written before frames existed
+# hold one bare to_bytes() and are read as a single frame; version 1 frames
+# had no checksum. Both are rewritten at the next append.
+_MAGIC = b"GTSL"
+_VERSION = 2
+_HEADER = struct.Struct("<4sH")
+_FRAME_V1 = struct.Struct("<4sI")
+_FRAME = struct.Struct("<4sII")
+_FRAME_TAG = b"FRM\x00"
+
+# Fold the increments into one frame once they outweigh the first frame
+# (and this many bytes), so each byte is rewritten O(1) times on average.
+FOLD_MIN_BYTES = 64 * 1024
+
+# Files are little-endian; array('I') uses the machine byte order.
+_SWAP = sys.byteorder != "little"
+
+
+class Counters(Protocol):
+    def __len__(self) -> int: ...
+
+    def merge(self, other) -> None: ...
+
+    def to_bytes(self) -> bytes: ...
+
+
+C = TypeVar("C", bound=Counters)
+
+
+def le_bytes(values: array) -> bytes:
+    """values as little-endian bytes."""
+    if not _SWAP:
+        return values.tobytes()
+    out = array(values.typecode, values)
+    out.byteswap()
+    return out.tobytes()
+
+
+def from_le(typecode: str, data: bytes) -> array:
+    """Array of typecode items read from little-endian bytes."""
+    out = array(typecode, data)
+    if _SWAP:
+        out.byteswap()
+    return out
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write bytes atomically (temp file + fsync + replace)."""
+    p = Path(path)
+    parent = p.parent
+
+    # Ensure directory exists (if path contains directories).
+    if str(parent) not in ("", "."):
+        parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=p.name + ".", suffix=".tmp", dir=str(parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, str(p))
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception:
+            pass
+
+
+def _frame(data: bytes) -> bytes:
+    return _FRAME.pack(_FRAME_TAG, len(data), zlib.crc32(data)) + data
+
+
+def _frames(data: bytes) -> list[bytes]:
+    """Payloads of a sidecar file, up to the first torn or corrupt frame."""
+    if data[: len(_MAGIC)] != _MAGIC:
+        return [data]
+    version = _HEADER.unpack_from(data, 0)[1] if len(data) >= _HEADER.size else None
+    if version not in (1, _VERSION):
+        raise ValueError("unsupported sidecar file version")
+    frame = _FRAME if version == _VERSION else _FRAME_V1
+    out = []
+    pos = _HEADER.size
+    while pos + frame.size <= len(data):
+        tag, length, *crc = frame.unpack_from(data, pos)
+        end = pos + frame.size + length
+        if tag != _FRAME_TAG or end > len(data):
+            break
+        payload = data[pos + frame.size : end]
+        if crc and zlib.crc32(payload) != crc[0]:
+            break
+        out.append(payload)
+        pos = end
+    if not out:
+        raise ValueError("sidecar file has no data")
+    return out
+
+
+def read_sidecar(path: str, kind: Type[C]) -> Optional[C]:
+    """The object stored in a sidecar file with its increments merged (None if there is no file).
+
+    kind provides from_bytes(). Raises ValueError if the file is malformed.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    frames = _frames(data)
+    out = kind.from_bytes(frames[0])
+    for frame in frames[1:]:
+        out.merge(kind.from_bytes(frame))
+    return out
+
+
+def write_sidecar(path: str, obj: Counters, *, keep_empty: bool = False) -> None:
+    """Atomically replace a sidecar file with obj as its only frame.
+
+    An empty obj removes the file, unless keep_empty (for sidecars where a
+    missing file means "rebuild from history"). Callers hold
+    file_lock(stats_path).
+    """
+    if not len(obj) and not keep_empty:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    atomic_write_bytes(path, _HEADER.pack(_MAGIC, _VERSION) + _frame(obj.to_bytes()))
+
+
+# (size, mtime_ns) of each sidecar file right after this process appended to
+# it, so appends only walk the frame headers again if the file changed since.
+_appended: Dict[str, tuple] = {}
+
+
+def _intact_prefix(f: BinaryIO, size: int) -> Optional[int]:
+    """Length of the header and intact frames of a current-version file (None if it is not one).
+
+    Walks the frame headers and checks the last frame's checksum, which is
+    where a crash mid-append leaves its damage.
+    """
+    f.seek(0)
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size or _HEADER.unpack(head) != (_MAGIC, _VERSION):
+        return None
+    pos, last = _HEADER.size, None
+    while pos + _FRAME.size <= size:
+        f.seek(pos)
+        tag, length, crc = _FRAME.unpack(f.read(_FRAME.size))
+        end = pos + _FRAME.size + length
+        if tag != _FRAME_TAG or end > size:
+            break
+        last, pos = (pos, length, crc), end
+    if last is not None:
+        start, length, crc = last
+        f.seek(start + _FRAME.size)
+        if zlib.crc32(f.read(length)) != crc:
+            pos = start
+    return pos if pos > _HEADER.size else None
+
+
+def _first_frame_size(f: BinaryIO) -> int:
+    f.seek(_HEADER.size)
+    return _FRAME.unpack(f.read(_FRAME.size))[1]
+
+
+def _try_append(path: str, payload: bytes) -> bool:
+    """Append payload as one frame; False if the file has to be rewritten instead.
+
+    That is the case when it is missing, in an older layout, damaged from
+    its first frame on or due for folding. A torn last frame is cut off
+    before appending.
+    """
+    key = os.path.abspath(path)
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return False
+    with f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        end = size if _appended.get(key) == (size, st.st_mtime_ns) else _intact_prefix(f, size)
+        if end is None:
+            return False
+        first = _first_frame_size(f)
+        if end - (_HEADER.size + _FRAME.size + first) > max(first, FOLD_MIN_BYTES):
+            return False
+        if end < size:
+            f.truncate(end)
+        f.seek(end)
+        f.write(_frame(payload))
+        f.flush()
+        os.fsync(f.fileno())
+        st = os.fstat(f.fileno())
+        _appended[key] = (st.st_size, st.st_mtime_ns)
+    return True
+
+
+def append_sidecar(
+    path: str,
+    increment: C,
+    kind: Type[C],
+    *,
+    missing: Callable[[], C],
+    keep_empty: bool = False,
+) -> None:
+    """Add increment to a sidecar file, usually by appending one frame.
+
+    The file is rewritten as one frame when it is missing (starting from
+    missing()), unreadable (likewise, with a warning), in an older layout
+    or due for folding. Callers hold file_lock(stats_path).
+    """
+    if not len(increment):
+        return
+    if _try_append(path, increment.to_bytes()):
+        return
+
+    try:
+        current = read_sidecar(path, kind)
+    except ValueError as e:
+        logger.warning("Replacing unreadable sidecar file '%s': %s", path, e)
+        current = None
+    if current is None:
+        current = missing()
+    current.merge(increment)
+    write_sidecar(path, current, keep_empty=keep_empty)
@@ -1,18 +1,130 @@
 from __future__ import annotations
 
+from array import array
+import copy
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from fnmatch import fnmatch
+from typing import Dict, Iterable, Optional, Any, Tuple
+import glob
+import hashlib
 import json
 import logging
 import os
 from pathlib import Path
-import tempfile
+import sqlite3
+import threading
+import time
 
-from guitar_trainer.core.position_key import pos_key
+from guitar_trainer.core.attempt_history import append_history, history_path_for, read_history, replace_history
+from guitar_trainer.core.daily_rollup import DailyRollups, append_daily, daily_path_for, read_daily, write_daily
+from guitar_trainer.core.device_counters import (
+    META_DEVICE_ID,
+    META_DEVICES,
+    devices_path_for,
+    legacy_device_id,
+    local_device_id,
+    merge_slices,
+    profile_slices,
+    read_device_slices,
+    slices_from_records,
+    write_device_slices,
+)
+from guitar_trainer.core.confusion import (
+    ConfusionMatrix,
+    append_confusion,
+    confusion_path_for,
+    read_confusion,
+    write_confusion,
+)
+from guitar_trainer.core.file_lock import file_lock, remove_lock_dir
+from guitar_trainer.core.note_counters import NoteCounters, note_key
+from guitar_trainer.core.notes import parse_note_name
+from guitar_trainer.core.outcome_bits import (
+    OutcomeBits,
+    append_outcomes,
+    outcomes_path_for,
+    read_outcomes,
+    write_outcomes,
+)
+from guitar_trainer.core.position_counters import PositionCounters
+from guitar_trainer.core.position_key import parse_pos_key
+from guitar_trainer.core.recency import (
+    RecencyCounters,
+    append_recency,
+    read_recency,
+    recency_path_for,
+    write_recency,
+)
+from guitar_trainer.core.response_sketch import (
+    ResponseTimes,
+    append_response_times,
+    read_response_times,
+    response_path_for,
+    write_response_times,
+)
+from guitar_trainer.core.session_log import sessions_path_for
+from guitar_trainer.core.sidecar_file import atomic_write_bytes
+from guitar_trainer.core.stats_binary import (
+    BINARY_SUFFIX,
+    decode_stats,
+    encode_stats,
+    is_binary_path,
+    is_binary_stats,
+    read_binary_head,
+)
+from guitar_trainer.core.stats_delta import StatsDelta
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION, document_version, migrate_document
+from guitar_trainer.core.stats_index import (
+    index_is_fresh,
+    index_path_for,
+    read_index,
+    remove_from_index,
+    replace_index,
+    update_index,
+)
+from guitar_trainer.core.stats_journal import (
+    REC_ATTEMPT,
+    REC_DELTA,
+    REC_META,
+    StatsJournal,
+    compacting_path_for,
+    delta_record,
+    iter_journal_records,
+    journal_path_for,
+    meta_record,
+    read_journal_id,
+)
+from guitar_trainer.core.stats_sqlite import (
+    SQLITE_SUFFIXES,
+    add_sqlite_delta,
+    is_sqlite_path,
+    read_sqlite_stats,
+    read_sqlite_summary,
+    upgrade_sqlite_stats,
+    write_sqlite_stats,
+)
+from guitar_trainer.core.wilson import wilson_bounds
 
 
 logger = logging.getLogger("guitar_trainer.stats")
 
+# Fold the journal into the snapshot once it grows past this size.
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# "json" (default), "binary" or "sqlite"; picks the file suffix for new profiles.
+STATS_BACKEND_ENV = "GUITAR_TRAINER_STATS_BACKEND"
+
+_BACKEND_SUFFIXES = {"json": ".json", "binary": BINARY_SUFFIX, "sqlite": ".sqlite"}
+
+# Every suffix a profile file can have.
+PROFILE_SUFFIXES = (".json", BINARY_SUFFIX, *SQLITE_SUFFIXES)
+
+
+def stats_file_suffix() -> str:
+    """Return the stats file suffix for the configured storage backend."""
+    backend = os.environ.get(STATS_BACKEND_ENV, "").strip().lower()
+    return _BACKEND_SUFFIXES.get(backend, ".json")
+
 
 def _ensure_bucket(d: Dict[str, Dict[str, int]], key: str) -> Dict[str, int]:
     bucket = d.get(key)
@@ -34,26 +146,7 @@ def _safe_int(value: Any, default: int = 0) -> int:
 
 def _atomic_write_json(path: str, data: dict) -> None:
     """Write JSON atomically (temp file + replace)."""
-    p = Path(path)
-    parent = p.parent
-
-    # Ensure directory exists (if path contains directories).
-    if str(parent) not in ("", "."):
-        parent.mkdir(parents=True, exist_ok=True)
-
-    fd, tmp_path = tempfile.mkstemp(prefix=p.name + ".", suffix=".tmp", dir=str(parent))
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, str(p))
-    finally:
-        try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        except Exception:
-            pass
+    atomic_write_bytes(path, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
 
 
 @dataclass
@@ -62,24 +155,302 @@ class Stats:
     total_correct: int = 0
 
     by_mode: Dict[str, Dict[str, int]] = field(default_factory=dict)
-    by_note: Dict[str, Dict[str, int]] = field(default_factory=dict)
-    by_position: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Per pitch class (C#/Db share a bucket); still readable like {"C#": {...}}.
+    by_note: NoteCounters = field(default_factory=NoteCounters)
+    # Dense per-position counters; still readable like {"s,f": {...}}.
+    by_position: PositionCounters = field(default_factory=PositionCounters)
 
     meta: Dict[str, Any] = field(default_factory=dict)
 
+    # Time-decayed attempts/correct per position (recent results weigh more).
+    recency: RecencyCounters = field(default_factory=RecencyCounters, repr=False, compare=False)
+    # The last OUTCOME_BITS answers per position as bit registers.
+    outcomes: OutcomeBits = field(default_factory=OutcomeBits, repr=False, compare=False)
+    # Answer-time histograms of correct answers per position and per note.
+    response_times: ResponseTimes = field(default_factory=ResponseTimes, repr=False, compare=False)
+    # Wrong note-name answers by (correct, answered) pitch class.
+    confusion: ConfusionMatrix = field(default_factory=ConfusionMatrix, repr=False, compare=False)
+    # Attempts/correct per calendar day, for progress over weeks and months.
+    daily: DailyRollups = field(default_factory=DailyRollups, repr=False, compare=False)
+    # Counters of the other devices this profile holds progress from, by
+    # device id (see claim_for_device() and merge_stats_files()).
+    devices: Dict[str, StatsDelta] = field(default_factory=dict, repr=False, compare=False)
+
+    # Optional append-only log; when attached every recorded attempt is
+    # appended to it and save_stats() only has to flush the new lines.
+    journal: Optional[StatsJournal] = field(default=None, repr=False, compare=False)
+
+    # Guards the counters so a background writer can take a consistent copy.
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+
+    # Increments since the last persist, the meta that was persisted, and the
+    # file these counters mirror. save_stats() uses them to write a delta
+    # record instead of the whole document.
+    _delta: StatsDelta = field(default_factory=StatsDelta, init=False, repr=False, compare=False)
+    _persisted_meta: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _source: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # True while _source is stored in an older schema; the next save upgrades it.
+    _outdated: bool = field(default=False, init=False, repr=False, compare=False)
+    # True if devices changed since the last persist.
+    _devices_changed: bool = field(default=False, init=False, repr=False, compare=False)
+    # (mtime, size) of the profile files right after the last load/save.
+    _disk_signature: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Wilson bounds per position; an entry is dropped when its position changes.
+    _bounds: Dict[Tuple[int, int], Tuple[float, float]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.by_position, PositionCounters):
+            self.by_position = PositionCounters.from_dict(self.by_position)
+        if not isinstance(self.by_note, NoteCounters):
+            self.by_note = NoteCounters.from_dict(self.by_note)
+
+    def snapshot(self) -> "Stats":
+        """Return an independent copy of the counters (shares the journal)."""
+        with self._lock:
+            snap = Stats(
+                total_attempts=self.total_attempts,
+                total_correct=self.total_correct,
+                by_mode={k: dict(v) for k, v in self.by_mode.items()},
+                by_note=self.by_note.copy(),
+                by_position=self.by_position.copy(),
+                meta=copy.deepcopy(self.meta),
+                recency=self.recency.copy(),
+                outcomes=self.outcomes.copy(),
+                response_times=self.response_times.copy(),
+                confusion=self.confusion.copy(),
+                daily=self.daily.copy(),
+                devices={k: v.copy() for k, v in self.devices.items()},
+                journal=self.journal,
+            )
+            snap._delta = self.pending_delta()
+            snap._persisted_meta = copy.deepcopy(self._persisted_meta)
+            snap._source = self._source
+            snap._outdated = self._outdated
+            snap._devices_changed = self._devices_changed
+            snap._disk_signature = self._disk_signature
+            return snap
+
+    def pending_delta(self) -> StatsDelta:
+        """Copy of the increments not persisted yet (with the current meta)."""
+        with self._lock:
+            delta = self._delta.copy()
+            delta.meta = copy.deepcopy(self.meta)
+            return delta
+
+    def mark_persisted(self, delta: StatsDelta, path: str) -> None:
+        """Record that delta (from pending_delta()) is now stored in path.
+
+        Increments recorded after delta was taken stay pending.
+        """
+        with self._lock:
+            self._delta.subtract(delta)
+            self._persisted_meta = copy.deepcopy(delta.meta)
+            self._source = os.fspath(path)
+            self._outdated = False
+            self._devices_changed = False
+            self._disk_signature = stats_signature(self._source)
+
+    def _reset_persisted(self, path: Optional[str], outdated: bool = False) -> None:
+        self._delta = StatsDelta()
+        self._persisted_meta = copy.deepcopy(self.meta)
+        self._source = path
+        self._outdated = outdated
+        self._devices_changed = False
+        self._disk_signature = stats_signature(path) if path is not None else None
+
+    def has_unsaved_changes(self, path: str) -> bool:
+        """True if these stats hold data that path does not have yet."""
+        with self._lock:
+            return self._source != os.fspath(path) or not self._delta.is_empty() or self.meta != self._persisted_meta
+
+    def is_current(self, path: str) -> bool:
+        """True unless path changed on disk since these stats last loaded or saved it.
+
+        Stats with unsaved changes count as current: they are newer than the file.
+        """
+        path = os.fspath(path)
+        return self.has_unsaved_changes(path) or self._disk_signature == stats_signature(path)
+
+    def recent_counts(self, string_index: int, fret: int, now: Optional[float] = None) -> Tuple[float, float]:
+        """Decayed (attempts, correct) at a position as of now.
+
+        Positions without recency data (e.g. practised before it was
+        tracked) fall back to their lifetime counts.
+        """
+        mass = self.recency.mass(string_index, fret, now)
+        acc = self.recency.accuracy(string_index, fret)
+        if mass <= 0.0 or acc is None:
+            attempts, correct = self.by_position.counts(string_index, fret)
+            return float(attempts), float(correct)
+        return mass, mass * acc
+
+    def last_outcomes(self, string_index: int, fret: int) -> Tuple[int, int]:
+        """(answers, correct) over the last OUTCOME_BITS answers at a position (O(1))."""
+        return self.outcomes.recent(string_index, fret)
+
+    def last_outcomes_grid(self, num_strings: int, max_fret: int) -> Tuple[array, array]:
+        """Flat (answers, correct) arrays of last_outcomes(), row-major like by_position.grid()."""
+        return self.outcomes.grid(num_strings, max_fret)
+
+    def response_quantile(self, string_index: int, fret: int, q: float = 0.5) -> Optional[float]:
+        """Approximate q-quantile time (ms) of correct answers at a position; None without data."""
+        return self.response_times.position_quantile(string_index, fret, q)
+
+    def note_response_quantile(self, note_name: str, q: float = 0.5) -> Optional[float]:
+        """Like response_quantile() for a note (any spelling); None without data."""
+        idx = parse_note_name(note_name)
+        return self.response_times.note_quantile(idx, q) if idx is not None else None
+
+    def slow_positions(
+        self, num_strings: int, max_fret: int, *, q: float = 0.5, min_answers: int = 3, top: int = 3
+    ) -> list[Tuple[int, int, float]]:
+        """Positions answered correctly but slowly: (string, fret, q-quantile ms), slowest first.
+
+        Only positions with at least min_answers timed correct answers count.
+        """
+        found = []
+        for s, f in list(self.response_times.positions):
+            if s < num_strings and f <= max_fret and self.response_times.position_count(s, f) >= min_answers:
+                found.append((s, f, self.response_times.position_quantile(s, f, q)))
+        found.sort(key=lambda item: item[2], reverse=True)
+        return found[:top]
+
+    def confusions(self, top: int = 5) -> list[Tuple[int, int, int]]:
+        """Most frequent wrong answers: (correct pitch class, answered pitch class, count)."""
+        return self.confusion.most_common(top)
+
+    def confusion_weights(self) -> list[float]:
+        """Per pitch class, 0..1 by how often it is involved in a confusion (either side)."""
+        return self.confusion.involvement()
+
+    def accuracy_bounds(self, string_index: int, fret: int) -> Tuple[float, float]:
+        """Wilson score interval (lower, upper) of the accuracy at a position.
+
+        Based on the last answers there (last_outcomes()), or on
+        recent_counts() where none are tracked; (0.0, 1.0) for an unseen
+        position. Cached: recording an answer only drops the entry of its
+        own position, so repeated reads cost a dict lookup. Bounds from
+        time-decayed counts widen as they age and are never cached.
+        """
+        key = (string_index, fret)
+        with self._lock:
+            bounds = self._bounds.get(key)
+            if bounds is None:
+                answered, right = self.outcomes.recent(string_index, fret)
+                if answered:
+                    bounds = self._bounds[key] = wilson_bounds(right, answered)
+                elif self.recency.mass(string_index, fret) > 0.0:
+                    answered, right = self.recent_counts(string_index, fret)
+                    bounds = wilson_bounds(right, answered)
+                else:
+                    answered, right = self.by_position.counts(string_index, fret)
+                    bounds = self._bounds[key] = wilson_bounds(right, answered)
+            return bounds
+
+    def accuracy_bounds_grid(self, num_strings: int, max_fret: int) -> Tuple[array, array]:
+        """Flat (lower, upper) arrays of accuracy_bounds(), row-major like by_position.grid()."""
+        width = max_fret + 1
+        lower = array("d", bytes(8 * num_strings * width))
+        upper = array("d", bytes(8 * num_strings * width))
+        with self._lock:
+            for s in range(num_strings):
+                for f in range(width):
+                    lower[s * width + f], upper[s * width + f] = self.accuracy_bounds(s, f)
+        return lower, upper
+
+    def recent_grid(self, num_strings: int, max_fret: int, now: Optional[float] = None) -> Tuple[array, array]:
+        """Flat (attempts, correct) arrays like by_position.grid(), but decayed.
+
+        Cells without recency data keep their lifetime counts.
+        """
+        attempts_grid, correct_grid = self.by_position.grid(num_strings, max_fret)
+        mass, correct = self.recency.grid(num_strings, max_fret, now)
+        attempts_out = array("d", attempts_grid)
+        correct_out = array("d", correct_grid)
+        for i, m in enumerate(mass):
+            if m > 0.0:
+                attempts_out[i] = m
+                correct_out[i] = correct[i]
+        return attempts_out, correct_out
+
     def _record_mode(self, mode: str, correct: bool) -> None:
-        mode = (mode or "A").strip().upper()
         bucket = _ensure_bucket(self.by_mode, mode)
         bucket["attempts"] += 1
         if correct:
             bucket["correct"] += 1
 
     def _record_note(self, note_name: str, correct: bool) -> None:
+        self.by_note.add(note_name, correct)
+
+    def _record_position(self, string_index: int, fret: int, correct: bool) -> None:
+        self.by_position.add(string_index, fret, correct)
+        self._bounds.pop((string_index, fret), None)
+        self._delta.add_position(string_index, fret, correct)
+
+    def _apply_attempt(self, mode: str, correct: bool, note_name: str) -> None:
+        mode = (mode or "A").strip().upper()
         note_name = str(note_name)
-        bucket = _ensure_bucket(self.by_note, note_name)
-        bucket["attempts"] += 1
+
+        self.total_attempts += 1
         if correct:
-            bucket["correct"] += 1
+            self.total_correct += 1
+
+        self._record_mode(mode, correct)
+        self._record_note(note_name, correct)
+        self._delta.add_attempt(mode, note_key(note_name), correct)
+
+    def _apply_delta(self, delta: StatsDelta) -> None:
+        self.total_attempts += delta.attempts
+        self.total_correct += delta.correct
+        for key, (a, c) in delta.by_mode.items():
+            bucket = _ensure_bucket(self.by_mode, key)
+            bucket["attempts"] += a
+            bucket["correct"] += c
+        for key, (a, c) in delta.by_note.items():
+            idx = parse_note_name(key)
+            if idx is not None:
+                a0, c0 = self.by_note.counts(idx)
+                self.by_note.set_counts(idx, a0 + a, c0 + c)
+        for (s, f), (a, c) in delta.by_position.items():
+            a0, c0 = self.by_position.counts(s, f)
+            self.by_position.set_counts(s, f, a0 + a, c0 + c)
+            self._bounds.pop((s, f), None)
+
+    def _log(
+        self,
+        mode: str,
+        correct: bool,
+        note_name: str,
+        string_index: Optional[int],
+        fret: Optional[int],
+        response_ms: Optional[int],
+        now: float,
+        answer: Optional[str] = None,
+    ) -> None:
+        mode = (mode or "A").strip().upper()
+        note = note_key(note_name) or str(note_name)
+        if not correct and answer is not None:
+            correct_pc, answered_pc = parse_note_name(note), parse_note_name(str(answer))
+            if correct_pc is not None and answered_pc is not None and correct_pc != answered_pc:
+                self.confusion.add(correct_pc, answered_pc)
+                self._delta.confusion.add(correct_pc, answered_pc)
+        self.daily.add(now, mode, note, correct, string_index, fret)
+        self._delta.daily.add(now, mode, note, correct, string_index, fret)
+        if correct and response_ms:
+            pitch_class = parse_note_name(note)
+            self.response_times.add(response_ms, string_index, fret, pitch_class)
+            self._delta.response_times.add(response_ms, string_index, fret, pitch_class)
+        self._delta.history.append(
+            timestamp_ms=int(now * 1000),
+            mode=mode,
+            correct=correct,
+            note_name=str(note_name),
+            string_index=string_index,
+            fret=fret,
+            response_ms=response_ms,
+        )
+        if self.journal is not None:
+            self.journal.append([REC_ATTEMPT, mode, int(bool(correct)), str(note_name), string_index, fret])
 
     def record_attempt(
         self,
@@ -88,20 +459,20 @@ class Stats:
         correct: bool,
         note_name: str,
         string_index: Optional[int] = None,
+        response_ms: Optional[int] = None,
+        answer: Optional[str] = None,
     ) -> None:
+        """answer is the note name the user gave, if any; wrong ones feed the confusion matrix."""
         # Defensive: ignore obviously invalid indices (do not crash).
         if string_index is not None and _safe_int(string_index, -1) < 0:
             return
 
-        self.total_attempts += 1
-        if correct:
-            self.total_correct += 1
-
-        self._record_mode(mode, correct)
-        self._record_note(note_name, correct)
+        with self._lock:
+            self._apply_attempt(mode, correct, note_name)
+            self._log(mode, correct, note_name, None, None, response_ms, time.time(), answer)
 
-    def record_attempt_mode_b(self, *, correct: bool, note_name: str) -> None:
-        self.record_attempt(mode="B", correct=correct, note_name=note_name, string_index=None)
+    def record_attempt_mode_b(self, *, correct: bool, note_name: str, response_ms: Optional[int] = None) -> None:
+        self.record_attempt(mode="B", correct=correct, note_name=note_name, string_index=None, response_ms=response_ms)
 
     def record_position_attempt(
         self,
@@ -111,19 +482,39 @@ class Stats:
         string_index: int,
         fret: int,
         mode: str = "A",
+        response_ms: Optional[int] = None,
+        answer: Optional[str] = None,
     ) -> None:
         string_index = _safe_int(string_index, -1)
         fret = _safe_int(fret, -1)
         if string_index < 0 or fret < 0:
             return
 
-        self.record_attempt(mode=mode, correct=correct, note_name=note_name, string_index=string_index)
+        with self._lock:
+            self._apply_attempt(mode, correct, note_name)
+            self._record_position(string_index, fret, correct)
+            now = time.time()
+            self.recency.add(string_index, fret, correct, now)
+            self._delta.recency.add(string_index, fret, correct, now)
+            self.outcomes.add(string_index, fret, correct)
+            self._delta.outcomes.add(string_index, fret, correct)
+            self._log(mode, correct, note_name, string_index, fret, response_ms, now, answer)
 
-        key = pos_key(string_index, fret)
-        bucket = _ensure_bucket(self.by_position, key)
-        bucket["attempts"] += 1
-        if correct:
-            bucket["correct"] += 1
+
+def _replay_record(stats: Stats, rec: list) -> None:
+    """Apply one journal record to stats (without journaling it again)."""
+    tag = rec[0]
+    if tag == REC_ATTEMPT and len(rec) >= 6:
+        _tag, mode, correct, note_name, string_index, fret = rec[:6]
+        stats._apply_attempt(str(mode), bool(correct), str(note_name))
+        if string_index is not None and fret is not None:
+            stats._record_position(_safe_int(string_index), _safe_int(fret), bool(correct))
+    elif tag == REC_DELTA and len(rec) >= 2 and isinstance(rec[1], dict):
+        stats._apply_delta(StatsDelta.from_record(rec[1]))
+        if isinstance(rec[1].get("meta"), dict):
+            stats.meta = dict(rec[1]["meta"])
+    elif tag == REC_META and len(rec) >= 2 and isinstance(rec[1], dict):
+        stats.meta = dict(rec[1])
 
 
 def _default_stats() -> Stats:
@@ -133,56 +524,853 @@ def _default_stats() -> Stats:
     return s
 
 
-def load_stats(path: str) -> Stats:
-    """Safely load stats from JSON.
+def _position_counters(data: Any) -> PositionCounters:
+    # Binary snapshots already decode into dense counters; adopt them as-is.
+    if isinstance(data, PositionCounters):
+        return data
+    return PositionCounters.from_dict(data or {})
+
+
+def _stats_from_raw(raw: dict) -> Stats:
+    """Adopt a current-schema document (see stats_migrate) without re-validating it."""
+    stats = Stats(
+        total_attempts=raw.get("total_attempts", 0),
+        total_correct=raw.get("total_correct", 0),
+        by_mode=raw.get("by_mode") or {},
+        by_note=raw.get("by_note") or {},
+        by_position=_position_counters(raw.get("by_position")),
+        meta=raw.get("meta") or {},
+    )
+
+    _ensure_bucket(stats.by_mode, "A")
+    _ensure_bucket(stats.by_mode, "B")
+    return stats
+
+
+def _stats_payload(stats: Stats, *, dense: bool = False) -> dict:
+    """Build the stats document.
+
+    dense=True keeps by_position as the PositionCounters (binary encoder input).
+    """
+    by_mode = stats.by_mode
+    by_note = stats.by_note.to_dict()
+    by_position = stats.by_position if dense else stats.by_position.to_dict()
+
+    # Totals and meta come first so load_stats_summary() can stop reading
+    # before the bucket maps.
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "total_attempts": _safe_int(stats.total_attempts, 0),
+        "total_correct": _safe_int(stats.total_correct, 0),
+        "meta": stats.meta,
+        "by_mode": by_mode,
+        "by_note": by_note,
+        "by_position": by_position,
+    }
+
+
+def _read_raw_snapshot(path: str) -> Optional[dict]:
+    """Read the snapshot document as stored (None if missing or not an object).
+
+    The format is detected from the content: binary files start with the
+    stats_binary magic, anything else is parsed as JSON. Binary files always
+    decode into the current schema.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if is_binary_stats(data):
+        return {"schema_version": SCHEMA_VERSION, **decode_stats(data)}
+    raw = json.loads(data.decode("utf-8"))
+    return raw if isinstance(raw, dict) else None
+
+
+def _read_snapshot(path: str) -> Optional[dict]:
+    """Read the snapshot document, migrated to the current schema in memory."""
+    raw = _read_raw_snapshot(path)
+    return migrate_document(raw) if raw is not None else None
+
+
+def upgrade_stats_file(path: str) -> bool:
+    """Rewrite a snapshot or SQLite profile stored in an older schema in the current one.
+
+    Returns True if the file was upgraded, False if it is missing or already
+    current. Raises OSError/ValueError (sqlite3.Error for SQLite) if it
+    cannot be read or written.
+    """
+    path = os.fspath(path)
+    if is_sqlite_path(path):
+        return upgrade_sqlite_stats(path)
+    with file_lock(path):
+        raw = _read_raw_snapshot(path)
+        if raw is None or document_version(raw) >= SCHEMA_VERSION:
+            return False
+        doc = migrate_document(raw)
+        _write_snapshot(path, _stats_from_raw(doc), doc.get("journal_folded") or [])
+        return True
+
+
+def _write_snapshot(path: str, stats: Stats, folded: list) -> None:
+    """Write a full snapshot in the format chosen by the path suffix."""
+    binary = is_binary_path(path)
+    payload = _stats_payload(stats, dense=binary)
+    if folded:
+        # Keep the folded ids in the summary head, ahead of the buckets.
+        head = {k: payload[k] for k in ("schema_version", "total_attempts", "total_correct", "meta")}
+        payload = {**head, "journal_folded": folded, **payload}
+    if binary:
+        atomic_write_bytes(path, encode_stats(payload))
+    else:
+        _atomic_write_json(path, payload)
+
+
+_journals: Dict[str, StatsJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def shared_journal(path: str) -> StatsJournal:
+    """Return the process-wide StatsJournal for a stats path.
+
+    Everything that appends to or compacts one journal goes through the same
+    object, so its lock orders appends against journal rotation.
+    """
+    path = os.fspath(path)
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = StatsJournal(path)
+            _journals[path] = journal
+        return journal
+
+
+def _journal_files(path: str) -> list[str]:
+    """Journal files in replay order (an interrupted compaction comes first)."""
+    return [compacting_path_for(path), journal_path_for(path)]
+
+
+def _replay_journals(path: str, stats: Stats, folded: list) -> None:
+    for jpath in _journal_files(path):
+        if not os.path.exists(jpath):
+            continue
+        jid = read_journal_id(jpath)
+        if jid is not None and jid in folded:
+            continue
+        for rec in iter_journal_records(jpath):
+            _replay_record(stats, rec)
+
+
+def _load_recency(path: str) -> RecencyCounters:
+    try:
+        return read_recency(path)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load recency counters for '%s': %s", path, e)
+        return RecencyCounters()
+
+
+def _load_outcomes(path: str) -> OutcomeBits:
+    # Profiles recorded before the registers existed get them rebuilt from history.
+    try:
+        outcomes = read_outcomes(path)
+        return outcomes if outcomes is not None else OutcomeBits.from_history(read_history(path))
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load outcome registers for '%s': %s", path, e)
+        return OutcomeBits()
+
+
+def _load_response_times(path: str) -> ResponseTimes:
+    # Same as the outcome registers: rebuilt from history if there is no file yet.
+    try:
+        times = read_response_times(path)
+        return times if times is not None else ResponseTimes.from_history(read_history(path))
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load response times for '%s': %s", path, e)
+        return ResponseTimes()
+
+
+def _load_confusion(path: str) -> ConfusionMatrix:
+    try:
+        return read_confusion(path)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load note confusions for '%s': %s", path, e)
+        return ConfusionMatrix()
+
+
+def _load_daily(path: str) -> DailyRollups:
+    # Profiles recorded before rollups existed get them rebuilt from history.
+    try:
+        daily = read_daily(path)
+        return daily if daily is not None else DailyRollups.from_history(read_history(path))
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load daily rollups for '%s': %s", path, e)
+        return DailyRollups()
+
+
+def _load_devices(path: str) -> Dict[str, StatsDelta]:
+    try:
+        return read_device_slices(path)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to load other devices' counters for '%s': %s", path, e)
+        return {}
+
+
+def load_stats(path: str, *, journal: bool = False) -> Stats:
+    """Safely load stats from a JSON or binary snapshot (+ journal replay) or SQLite.
 
     - Missing file => default stats
     - Invalid JSON => default stats (no crash)
     - Permission/IO errors => default stats (no crash)
+
+    With journal=True a StatsJournal is attached, so new attempts are
+    appended to it and save_stats() becomes an O(new attempts) flush.
     """
+    path = os.fspath(path)
+    if is_sqlite_path(path):
+        # SQLite keeps its own write-ahead log; rows are upserted on save.
+        journal = False
+
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        if is_sqlite_path(path):
+            raw = read_sqlite_stats(path)
+        else:
+            raw = _read_raw_snapshot(path)
+        # Older documents are migrated in memory only; the file is left as it
+        # is until the next save or "guitar-trainer migrate" upgrades it.
+        outdated = raw is not None and document_version(raw) < SCHEMA_VERSION
+        if raw is not None:
+            raw = migrate_document(raw)
+        stats = _stats_from_raw(raw) if raw is not None else _default_stats()
+        if not is_sqlite_path(path):
+            folded = list((raw or {}).get("journal_folded", []) or [])
+            _replay_journals(path, stats, folded)
+        stats.recency = _load_recency(path)
+        stats.outcomes = _load_outcomes(path)
+        stats.response_times = _load_response_times(path)
+        stats.confusion = _load_confusion(path)
+        stats.daily = _load_daily(path)
+        stats.devices = _load_devices(path)
 
-        if not isinstance(raw, dict):
-            return _default_stats()
+        # The counters now mirror this file; later saves only need the delta.
+        stats._reset_persisted(path, outdated)
+        if META_DEVICES in stats.meta:
+            # Kept in meta before the .devices file; the next save moves them.
+            meta = dict(stats.meta)
+            merge_slices(stats.devices, slices_from_records(meta.pop(META_DEVICES)))
+            stats.meta = meta
+            stats._devices_changed = True
 
-        stats = Stats(
-            total_attempts=_safe_int(raw.get("total_attempts", 0), 0),
-            total_correct=_safe_int(raw.get("total_correct", 0), 0),
-            by_mode=dict(raw.get("by_mode", {}) or {}),
-            by_note=dict(raw.get("by_note", {}) or {}),
-            by_position=dict(raw.get("by_position", {}) or {}),
-            meta=dict(raw.get("meta", {}) or {}),
-        )
+    except (json.JSONDecodeError, ValueError, TypeError, OSError, sqlite3.Error) as e:
+        logger.warning("Failed to load stats from '%s': %s", path, e)
+        stats = _default_stats()
+    except Exception as e:
+        logger.exception("Unexpected error while loading stats from '%s': %s", path, e)
+        stats = _default_stats()
+
+    if journal:
+        _attach(stats, path)
+    return stats
+
+
+def _attach(stats: Stats, path: str) -> None:
+    stats.journal = shared_journal(path)
+    stats.journal.last_meta = json.loads(json.dumps(stats.meta))
+
+
+def attach_journal(stats: Stats, path: str) -> bool:
+    """Attach the shared journal for path to stats that were loaded without one.
 
-        _ensure_bucket(stats.by_mode, "A")
-        _ensure_bucket(stats.by_mode, "B")
-        return stats
+    Only stats that exactly mirror path can switch to journaling (pending
+    increments would otherwise never reach the file). Returns True if stats
+    now journal to path.
+    """
+    path = os.fspath(path)
+    if is_sqlite_path(path):
+        return False
+    with stats._lock:
+        if stats.journal is not None:
+            return stats.journal.stats_path == path
+        if stats.has_unsaved_changes(path):
+            return False
+        _attach(stats, path)
+        return True
+
+
+def _signature_files(path: str) -> list[str]:
+    if is_sqlite_path(path):
+        return [path, path + "-wal"]
+    return [path, *_journal_files(path)]
+
+
+def stats_signature(path: str) -> tuple:
+    """(mtime_ns, size) of a profile and the companion files that hold its data."""
+    sig = []
+    for p in _signature_files(os.fspath(path)):
+        try:
+            st = os.stat(p)
+        except OSError:
+            sig.append(None)
+        else:
+            sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+@dataclass(frozen=True)
+class StatsSummary:
+    """Totals and meta of a profile (what the menu and profile list show)."""
+
+    total_attempts: int = 0
+    total_correct: int = 0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def accuracy(self) -> float:
+        return (self.total_correct / self.total_attempts) if self.total_attempts > 0 else 0.0
+
+    @classmethod
+    def from_stats(cls, stats: Stats) -> "StatsSummary":
+        with stats._lock:
+            return cls(int(stats.total_attempts), int(stats.total_correct), copy.deepcopy(stats.meta))
+
+
+# Leading keys of a JSON snapshot that make up its summary head.
+_SUMMARY_KEYS = frozenset({"schema_version", "total_attempts", "total_correct", "meta", "journal_folded"})
+_HEAD_CHUNK = 4096
+
+
+def _skip_ws(text: str, i: int) -> int:
+    while text[i] in " \t\r\n":
+        i += 1
+    return i
 
+
+def _scan_json_head(text: str) -> dict:
+    """Parse the summary keys at the start of a JSON object.
+
+    Stops at the first other key, so the bucket maps are never parsed.
+    Raises IndexError/JSONDecodeError if text ends too early.
+    """
+    decoder = json.JSONDecoder()
+    i = _skip_ws(text, 0)
+    if text[i] != "{":
+        raise ValueError("stats snapshot is not a JSON object")
+    head: dict = {}
+    i += 1
+    while True:
+        i = _skip_ws(text, i)
+        if text[i] == "}":
+            return head
+        key, i = decoder.raw_decode(text, i)
+        i = _skip_ws(text, i)
+        if text[i] != ":":
+            raise ValueError("malformed stats snapshot")
+        if key not in _SUMMARY_KEYS:
+            return head
+        value, i = decoder.raw_decode(text, _skip_ws(text, i + 1))
+        head[key] = value
+        i = _skip_ws(text, i)
+        if text[i] == ",":
+            i += 1
+        elif text[i] != "}":
+            raise ValueError("malformed stats snapshot")
+
+
+def _read_json_head(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        text = ""
+        while True:
+            chunk = f.read(max(_HEAD_CHUNK, len(text)))
+            text += chunk
+            try:
+                return _scan_json_head(text)
+            except (IndexError, json.JSONDecodeError):
+                if not chunk:
+                    raise ValueError("stats snapshot is truncated") from None
+
+
+def _read_snapshot_head(path: str) -> Optional[dict]:
+    """Read totals, meta and folded journal ids of a snapshot (None if missing)."""
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(8)
     except FileNotFoundError:
-        return _default_stats()
-    except (json.JSONDecodeError, ValueError, TypeError, OSError) as e:
-        logger.warning("Failed to load stats from '%s': %s", path, e)
-        return _default_stats()
+        return None
+    if is_binary_stats(magic):
+        return read_binary_head(path)
+
+    head = _read_json_head(path)
+    if "meta" not in head:
+        # Written before meta moved ahead of the buckets: read it all.
+        head = _read_snapshot(path) or {}
+    return head
+
+
+def _summarize_journals(path: str, totals: list, meta: dict, folded: list) -> dict:
+    """Add unfolded journal records to totals ([attempts, correct]); return the latest meta."""
+    for jpath in _journal_files(path):
+        if not os.path.exists(jpath):
+            continue
+        jid = read_journal_id(jpath)
+        if jid is not None and jid in folded:
+            continue
+        for rec in iter_journal_records(jpath):
+            tag = rec[0]
+            if tag == REC_ATTEMPT and len(rec) >= 6:
+                totals[0] += 1
+                totals[1] += 1 if rec[2] else 0
+            elif tag in (REC_DELTA, REC_META) and len(rec) >= 2 and isinstance(rec[1], dict):
+                body = rec[1]
+                if tag == REC_META:
+                    meta = dict(body)
+                    continue
+                n = body.get("n") or [0, 0]
+                totals[0] += _safe_int(n[0])
+                totals[1] += _safe_int(n[1])
+                if isinstance(body.get("meta"), dict):
+                    meta = dict(body["meta"])
+    return meta
+
+
+def load_stats_summary(path: str) -> StatsSummary:
+    """Read only the totals and meta of a profile.
+
+    Binary and SQLite profiles read their header/totals row; JSON snapshots
+    keep totals and meta ahead of the bucket maps, so parsing stops there.
+    Unfolded journal records are added on top. Errors give an empty summary.
+    """
+    path = os.fspath(path)
+    try:
+        if is_sqlite_path(path):
+            raw = read_sqlite_summary(path) or {}
+            return StatsSummary(
+                _safe_int(raw.get("total_attempts", 0)),
+                _safe_int(raw.get("total_correct", 0)),
+                dict(raw.get("meta") or {}),
+            )
+
+        raw = _read_snapshot_head(path) or {}
+        totals = [_safe_int(raw.get("total_attempts", 0)), _safe_int(raw.get("total_correct", 0))]
+        meta = dict(raw.get("meta") or {})
+        meta = _summarize_journals(path, totals, meta, list(raw.get("journal_folded") or []))
+        return StatsSummary(totals[0], totals[1], meta)
+
+    except (json.JSONDecodeError, ValueError, TypeError, OSError, sqlite3.Error) as e:
+        logger.warning("Failed to read stats summary from '%s': %s", path, e)
     except Exception as e:
-        logger.exception("Unexpected error while loading stats from '%s': %s", path, e)
-        return _default_stats()
+        logger.exception("Unexpected error while reading stats summary from '%s': %s", path, e)
+    return StatsSummary()
 
 
-def save_stats(path: str, stats: Stats) -> None:
-    """Safely save stats to JSON (atomic write, no crash on failure)."""
-    payload = {
-        "total_attempts": _safe_int(stats.total_attempts, 0),
-        "total_correct": _safe_int(stats.total_correct, 0),
-        "by_mode": stats.by_mode,
-        "by_note": stats.by_note,
-        "by_position": stats.by_position,
-        "meta": stats.meta,
-    }
+def compact_stats(path: str, *, journal: Optional[StatsJournal] = None) -> None:
+    """Fold the journal into the snapshot that load_stats() reads.
+
+    The live journal is first moved aside, so appends can continue while the
+    snapshot is rebuilt. The folded journal id is stored in the snapshot,
+    which keeps a crash between "write snapshot" and "delete journal" from
+    replaying the same records twice. Runs under file_lock(path), so other
+    processes flush their journal records before or after, never during.
+    """
+    path = os.fspath(path)
+    journal = journal if journal is not None else shared_journal(path)
+
+    with file_lock(path):
+        _compact_locked(path, journal)
+
+
+def _compact_locked(path: str, journal: StatsJournal) -> None:
+    compacting = journal.rotate()
+    if compacting is None:
+        return
+
+    raw = _read_snapshot(path)
+    stats = _stats_from_raw(raw) if raw is not None else _default_stats()
+    folded = list((raw or {}).get("journal_folded", []) or [])
+
+    jid = read_journal_id(compacting)
+    if jid is None or jid not in folded:
+        for rec in iter_journal_records(compacting):
+            _replay_record(stats, rec)
+
+    _write_snapshot(path, stats, [jid] if jid is not None else [])
 
     try:
-        _atomic_write_json(path, payload)
+        os.remove(compacting)
+    except OSError as e:
+        logger.warning("Failed to remove compacted journal '%s': %s", compacting, e)
+
+
+def compact_in_background(path: str, journal: StatsJournal) -> Optional[threading.Thread]:
+    """Run compact_stats() on a daemon thread (at most one per journal)."""
+    if not journal.begin_compaction():
+        return None
+
+    def run() -> None:
+        try:
+            compact_stats(path, journal=journal)
+        except Exception as e:
+            logger.warning("Failed to compact stats journal for '%s': %s", path, e)
+        finally:
+            journal.end_compaction()
+
+    t = threading.Thread(target=run, name="stats-compaction", daemon=True)
+    t.start()
+    return t
+
+
+def _save_via_journal(path: str, stats: Stats, journal: StatsJournal) -> None:
+    meta = json.loads(json.dumps(stats.meta or {}))
+    if meta != journal.last_meta:
+        journal.append(meta_record(meta))
+        journal.last_meta = meta
+    journal.flush()
+
+    if journal.size() >= JOURNAL_COMPACT_BYTES:
+        compact_in_background(path, journal)
+
+
+def _save_delta(path: str, stats: Stats, delta: StatsDelta) -> None:
+    rec = delta.to_record()
+    if delta.meta != stats._persisted_meta:
+        rec["meta"] = delta.meta
+    elif delta.is_empty():
+        return
+
+    journal = shared_journal(path)
+    journal.append(delta_record(rec))
+    journal.flush()
+
+    if journal.size() >= JOURNAL_COMPACT_BYTES:
+        compact_in_background(path, journal)
+
+
+def _ensure_snapshot(path: str, stats: Stats) -> None:
+    """Give a profile saved only to its journal so far a snapshot file.
+
+    Profile listing, export and migration look for the snapshot, so a new
+    profile folds its journal right away instead of waiting for compaction.
+    """
+    if os.path.exists(path):
+        return
+    with file_lock(path):
+        if os.path.exists(path):
+            return
+        _compact_locked(path, shared_journal(path))
+        if not os.path.exists(path):
+            # Nothing was journaled: stats holds everything there is.
+            _write_snapshot(path, stats, [])
+
+
+def _save_full_snapshot(path: str, stats: Stats) -> None:
+    with file_lock(path):
+        stale = [p for p in _journal_files(path) if os.path.exists(p)]
+        folded = [jid for jid in (read_journal_id(p) for p in stale) if jid is not None]
+        _write_snapshot(path, stats, folded)
+
+        for p in stale:
+            os.remove(p)
+
+
+def _save_history(path: str, stats: Stats, delta: StatsDelta, *, replace: bool) -> None:
+    if not replace and not len(delta.history) and not len(delta.recency) and not len(delta.confusion):
+        return
+    try:
+        with file_lock(path):
+            if replace:
+                replace_history(path, delta.history)
+                write_recency(path, stats.recency)
+                write_outcomes(path, stats.outcomes)
+                write_response_times(path, stats.response_times)
+                write_confusion(path, stats.confusion)
+                write_daily(path, stats.daily)
+            else:
+                # Before the append, so a rebuild from history does not count them twice.
+                append_daily(path, delta.daily)
+                append_outcomes(path, delta.outcomes)
+                append_response_times(path, delta.response_times)
+                append_confusion(path, delta.confusion)
+                append_history(path, delta.history)
+                append_recency(path, delta.recency)
+    except OSError as e:
+        logger.warning("Failed to save attempt history for '%s': %s", path, e)
+
+
+def _save_devices(path: str, stats: Stats) -> None:
+    with stats._lock:
+        devices = {k: v.copy() for k, v in stats.devices.items()}
+    try:
+        with file_lock(path):
+            write_device_slices(path, devices)
+    except OSError as e:
+        logger.warning("Failed to save other devices' counters for '%s': %s", path, e)
+
+
+def _counters_delta(stats: Stats) -> StatsDelta:
+    """All of stats' counters as one increment (the per-device counter layout)."""
+    out = StatsDelta(attempts=_safe_int(stats.total_attempts), correct=_safe_int(stats.total_correct))
+    for into, buckets in ((out.by_mode, stats.by_mode), (out.by_note, stats.by_note)):
+        for key, bucket in buckets.items():
+            a, c = _safe_int(bucket.get("attempts", 0)), _safe_int(bucket.get("correct", 0))
+            if a or c:
+                into[key] = [a, c]
+    for key in stats.by_position:
+        parsed = parse_pos_key(key)
+        if parsed is not None:
+            out.by_position[parsed] = list(stats.by_position.counts(*parsed))
+    return out
+
+
+def claim_for_device(stats: Stats) -> None:
+    """Stamp a profile with this device's id, taking it over from any previous owner.
+
+    The previous owner's counters (everything but the attempts recorded here
+    since loading) move into stats.devices, so later merges keep them apart
+    from this device's progress. A profile saved before device ids
+    were stamped is owned by legacy_device_id() of those counters: every
+    copy of it derives the same id, so their shared base is counted once.
+
+    Call it on the live Stats, not a snapshot: once claimed, the meta says
+    this device owns the profile and later saves leave it alone.
+    """
+    with stats._lock:
+        owner = stats.meta.get(META_DEVICE_ID)
+        local = local_device_id()
+        if owner == local:
+            return
+        loaded = _counters_delta(stats)
+        loaded.subtract(stats._delta)
+        meta = dict(stats.meta)
+        if owner is None and loaded.is_empty():
+            # A new profile: everything in it was recorded here.
+            meta[META_DEVICE_ID] = local
+            stats.meta = meta
+            return
+        if owner is None:
+            owner = legacy_device_id(loaded)
+        slices = profile_slices(loaded, stats.devices, str(owner))
+        slices.pop(local, None)
+        stats.devices = slices
+        stats._devices_changed = True
+        meta[META_DEVICE_ID] = local
+        stats.meta = meta
+
+
+def save_stats(path: str, stats: Stats) -> bool:
+    """Safely save stats (atomic write, no crash on failure).
+
+    Writes are proportional to what changed where possible:
+    - SQLite paths (.sqlite/.db): if stats was loaded from this file, the
+      increments since then are added to the touched rows in one
+      transaction; otherwise the file is rewritten to match stats.
+    - Snapshot files with a journal attached for this path: flush the journal.
+    - Snapshot files loaded from this path: append one delta record with the
+      buckets touched since the last save; compaction merges it into the
+      snapshot. A profile without a snapshot file yet is compacted at once.
+    - Otherwise: write the full snapshot (binary for .gtstats paths, JSON
+      for everything else) and retire any journal files.
+
+    The attempts recorded since the last save are then appended to the
+    profile's history file and merged into its recency counters and daily
+    rollups (all replaced when the profile was rewritten). A file that was
+    loaded in an older schema is upgraded to the current one.
+
+    Returns True if the stats were saved.
+    """
+    path = os.fspath(path)
+    claim_for_device(stats)
+    delta = stats.pending_delta()
+    index_fresh = index_is_fresh(_profile_dir(path))
+    # Stats not loaded from path replace the profile, history included.
+    rewritten = stats._source != path
+    try:
+        if is_sqlite_path(path):
+            if stats._source == path:
+                # Add our increments to whatever the file holds now, so other
+                # processes' updates since we loaded are kept.
+                meta = delta.meta if delta.meta != stats._persisted_meta else None
+                if meta is not None or not delta.is_empty():
+                    add_sqlite_delta(path, delta.to_record(), meta)
+            else:
+                write_sqlite_stats(path, _stats_payload(stats))
+        elif stats.journal is not None and stats.journal.stats_path == path:
+            _save_via_journal(path, stats, stats.journal)
+            _ensure_snapshot(path, stats)
+        elif stats._source == path:
+            _save_delta(path, stats, delta)
+            _ensure_snapshot(path, stats)
+        else:
+            _save_full_snapshot(path, stats)
     except Exception as e:
         logger.warning("Failed to save stats to '%s': %s", path, e)
-        return
+        return False
+
+    _save_history(path, stats, delta, replace=rewritten)
+    if stats._devices_changed or rewritten:
+        _save_devices(path, stats)
+    if stats._outdated and not rewritten:
+        try:
+            upgrade_stats_file(path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning("Failed to upgrade stats file '%s': %s", path, e)
+    stats.mark_persisted(delta, path)
+    if index_fresh:
+        _index_saved_profile(path, StatsSummary.from_stats(stats))
+    return True
+
+
+def stats_companion_files(path: str) -> list[str]:
+    """Files that belong to a profile besides the main stats file."""
+    path = os.fspath(path)
+    sidecars = [
+        history_path_for(path),
+        recency_path_for(path),
+        outcomes_path_for(path),
+        response_path_for(path),
+        confusion_path_for(path),
+        daily_path_for(path),
+        devices_path_for(path),
+        sessions_path_for(path),
+    ]
+    if is_sqlite_path(path):
+        return [path + "-wal", path + "-shm", *sidecars]
+    return [*_journal_files(path), *sidecars]
+
+
+def delete_stats(path: str) -> None:
+    """Delete a stats profile together with its companion files.
+
+    Raises OSError if the main file cannot be removed.
+    """
+    path = os.fspath(path)
+    index_fresh = index_is_fresh(_profile_dir(path))
+    os.remove(path)
+    for p in stats_companion_files(path):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+
+    if index_fresh:
+        try:
+            remove_from_index(path)
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to update stats index for '%s': %s", path, e)
+    # Removing the lock folder would make a remaining manifest look stale.
+    if not os.path.exists(index_path_for(_profile_dir(path))):
+        remove_lock_dir(path)
+
+
+def merge_stats_files(target: str, sources: Iterable[str]) -> Stats:
+    """Merge profile files into target (which may not exist yet) and return the result.
+
+    Each profile's counters are kept per device as grow-only counters, and
+    merging takes the element-wise max per device, so merging is
+    commutative and idempotent: the same progress is never counted twice,
+    whichever copies get merged in whatever order. Files are read one at a
+    time. The result belongs to this device; target's history and recency
+    files are left as they are.
+
+    Raises FileNotFoundError if a source is missing.
+    """
+    target = os.fspath(target)
+    local = local_device_id()
+    slices: Dict[str, StatsDelta] = {}
+    meta: Optional[Dict[str, Any]] = None
+
+    # A missing target loads as empty stats (it may also exist only as a journal).
+    paths = [target]
+    for p in sources:
+        p = os.fspath(p)
+        if not os.path.isfile(p) and not any(os.path.exists(j) for j in _journal_files(p)):
+            raise FileNotFoundError(p)
+        paths.append(p)
+
+    for p in paths:
+        stats = load_stats(p)
+        counters = _counters_delta(stats)
+        owner = stats.meta.get(META_DEVICE_ID) or (local if p == target else legacy_device_id(counters))
+        merge_slices(slices, profile_slices(counters, stats.devices, str(owner)))
+        if meta is None:
+            meta = dict(stats.meta)
+
+    merged = _default_stats()
+    merged.meta = meta or {}
+    for counters in slices.values():
+        merged._apply_delta(counters)
+    slices.pop(local, None)
+    merged.devices = slices
+    merged.meta.pop(META_DEVICES, None)
+    merged.meta[META_DEVICE_ID] = local
+
+    if is_sqlite_path(target):
+        write_sqlite_stats(target, _stats_payload(merged))
+    else:
+        _save_full_snapshot(target, merged)
+    with file_lock(target):
+        write_device_slices(target, slices)
+    merged._reset_persisted(target)
+    if index_is_fresh(_profile_dir(target)):
+        _index_saved_profile(target, StatsSummary.from_stats(merged))
+    return merged
+
+
+def _profile_dir(path: str) -> str:
+    return str(Path(path).parent)
+
+
+def _index_entry(path: str, summary: StatsSummary) -> dict:
+    digest = hashlib.blake2b(
+        json.dumps([summary.total_attempts, summary.total_correct, summary.meta], sort_keys=True, default=str).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+    return {
+        "num_strings": summary.meta.get("num_strings"),
+        "tuning_name": summary.meta.get("tuning_name"),
+        "total_attempts": summary.total_attempts,
+        "total_correct": summary.total_correct,
+        "mtime": mtime,
+        "hash": digest,
+    }
+
+
+def _summary_from_entry(entry: dict) -> StatsSummary:
+    meta = {k: entry[k] for k in ("num_strings", "tuning_name") if entry.get(k) is not None}
+    return StatsSummary(_safe_int(entry.get("total_attempts", 0)), _safe_int(entry.get("total_correct", 0)), meta)
+
+
+def _index_saved_profile(path: str, summary: StatsSummary) -> None:
+    try:
+        update_index(path, _index_entry(path, summary))
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to update stats index for '%s': %s", path, e)
+
+
+def list_stats_profiles(directory: str = ".", pattern: str = "stats_*") -> list[tuple[str, StatsSummary]]:
+    """List profiles (pattern + any profile suffix) in directory with their summaries.
+
+    Served from the directory's stats index manifest while it is fresh; when
+    the directory changed behind its back every profile is re-read with
+    load_stats_summary() and the manifest is rebuilt.
+    """
+    def prefixed(name: str) -> str:
+        return name if directory in ("", ".") else os.path.join(directory, name)
+
+    def wanted(name: str) -> bool:
+        return any(fnmatch(name, pattern + suffix) for suffix in PROFILE_SUFFIXES)
+
+    entries = read_index(directory)
+    if entries is None:
+        entries = {}
+        for suffix in PROFILE_SUFFIXES:
+            for p in glob.glob(os.path.join(glob.escape(directory or "."), pattern + suffix)):
+                if os.path.isfile(p):
+                    entries[os.path.basename(p)] = _index_entry(p, load_stats_summary(p))
+        try:
+            replace_index(directory, entries)
+        except OSError as e:
+            logger.warning("Failed to write stats index in '%s': %s", directory, e)
+
+    return [(prefixed(name), _summary_from_entry(entries[name])) for name in sorted(entries) if wanted(name)]
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+from guitar_trainer.core.position_counters import PositionCounters
+
+BINARY_SUFFIX = ".gtstats"
+MAGIC = b"GTST"
+VERSION = 1
+
+# magic, version, num_strings, max_fret, tuning_len, total_attempts,
+# total_correct, n_modes, n_notes, extra_len
+_HEADER = struct.Struct("<4sHHHHQQHHI")
+_U32_MAX = 0xFFFFFFFF
+
+# Files are little-endian; array('I') uses the machine byte order.
+_SWAP = sys.byteorder != "little"
+
+
+def is_binary_path(path: str) -> bool:
+    return Path(path).suffix.lower() == BINARY_SUFFIX
+
+
+def is_binary_stats(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+def _u32_array(values: Any) -> array:
+    arr = array("I", values)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+
+def _read_u32(view: memoryview, offset: int, count: int) -> tuple[array, int]:
+    end = offset + 4 * count
+    if end > len(view):
+        raise ValueError("binary stats file is truncated")
+    arr = array("I")
+    arr.frombytes(view[offset:end])
+    if _SWAP:
+        arr.byteswap()
+    return arr, end
+
+
+def _clamp(value: Any) -> int:
+    try:
+        return min(_U32_MAX, max(0, int(value)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _pack_names(names: list[str]) -> bytes:
+    out = bytearray()
+    for name in names:
+        # Cut at 255 bytes without splitting a multi-byte character.
+        raw = name.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+        out.append(len(raw))
+        out += raw
+    return bytes(out)
+
+
+def _read_names(view: memoryview, offset: int, count: int) -> tuple[list[str], int]:
+    names = []
+    for _ in range(count):
+        if offset >= len(view):
+            raise ValueError("binary stats file is truncated")
+        n = view[offset]
+        names.append(bytes(view[offset + 1:offset + 1 + n]).decode("utf-8"))
+        offset += 1 + n
+    return names, offset
+
+
+def _pack_buckets(buckets: dict) -> tuple[list[str], bytes]:
+    names = [str(k) for k in buckets]
+    attempts = []
+    correct = []
+    for bucket in buckets.values():
+        bucket = bucket if isinstance(bucket, dict) else {}
+        attempts.append(_clamp(bucket.get("attempts", 0)))
+        correct.append(_clamp(bucket.get("correct", 0)))
+    return names, _u32_array(attempts).tobytes() + _u32_array(correct).tobytes()
+
+
+def encode_stats(doc: dict) -> bytes:
+    """Encode a stats document (the JSON layout) into the binary format.
+
+    doc["by_position"] may be a PositionCounters, which is written as-is.
+    """
+    positions = doc.get("by_position") or {}
+    if not isinstance(positions, PositionCounters):
+        positions = PositionCounters.from_dict(positions)
+
+    meta = doc.get("meta") or {}
+    tuning = meta.get("tuning")
+    if not (isinstance(tuning, list) and all(isinstance(x, int) and -32768 <= x < 32768 for x in tuning)):
+        tuning = []
+
+    extra: dict = {"meta": meta}
+    if doc.get("journal_folded"):
+        extra["journal_folded"] = list(doc["journal_folded"])
+    extra_raw = json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    mode_names, mode_counts = _pack_buckets(doc.get("by_mode") or {})
+    note_names, note_counts = _pack_buckets(doc.get("by_note") or {})
+
+    num_strings = positions.num_strings if positions.stride else 0
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        num_strings,
+        max(0, positions.stride - 1),
+        len(tuning),
+        max(0, int(doc.get("total_attempts", 0) or 0)),
+        max(0, int(doc.get("total_correct", 0) or 0)),
+        len(mode_names),
+        len(note_names),
+        len(extra_raw),
+    )
+
+    parts = [
+        header,
+        struct.pack(f"<{len(tuning)}h", *tuning),
+        extra_raw,
+        _pack_names(mode_names),
+        _pack_names(note_names),
+    ]
+    if num_strings:
+        parts.append(_u32_array(positions.attempts).tobytes())
+        parts.append(_u32_array(positions.correct).tobytes())
+    parts.append(mode_counts)
+    parts.append(note_counts)
+    return b"".join(parts)
+
+
+def _decode_header(view: memoryview) -> tuple:
+    if len(view) < _HEADER.size:
+        raise ValueError("binary stats file is truncated")
+    fields = _HEADER.unpack_from(view, 0)
+    if fields[0] != MAGIC:
+        raise ValueError("not a binary stats file")
+    if fields[1] > VERSION:
+        raise ValueError(f"unsupported binary stats version {fields[1]}")
+    return fields
+
+
+def _decode_extra(view: memoryview, tuning_len: int, extra_len: int) -> tuple[list[int], dict, int]:
+    offset = _HEADER.size
+    end = offset + 2 * tuning_len
+    if end + extra_len > len(view):
+        raise ValueError("binary stats file is truncated")
+    tuning = list(struct.unpack_from(f"<{tuning_len}h", view, offset))
+    extra = json.loads(bytes(view[end:end + extra_len]).decode("utf-8")) if extra_len else {}
+    if not isinstance(extra, dict):
+        raise ValueError("binary stats extra block is not an object")
+    return tuning, extra, end + extra_len
+
+
+def _buckets(names: list[str], attempts: array, correct: array) -> dict:
+    return {n: {"attempts": a, "correct": c} for n, a, c in zip(names, attempts, correct)}
+
+
+def decode_stats(data: bytes) -> dict:
+    """Decode a binary stats file into the stats document layout.
+
+    by_position is returned as a PositionCounters built straight from the
+    packed arrays. Raises ValueError on malformed input.
+    """
+    view = memoryview(data)
+    try:
+        (_magic, _version, num_strings, max_fret, tuning_len,
+         attempts, correct, n_modes, n_notes, extra_len) = _decode_header(view)
+        tuning, extra, offset = _decode_extra(view, tuning_len, extra_len)
+
+        mode_names, offset = _read_names(view, offset, n_modes)
+        note_names, offset = _read_names(view, offset, n_notes)
+
+        num_frets = max_fret + 1 if num_strings else 0
+        cells = num_strings * num_frets
+        pos_attempts, offset = _read_u32(view, offset, cells)
+        pos_correct, offset = _read_u32(view, offset, cells)
+        mode_attempts, offset = _read_u32(view, offset, n_modes)
+        mode_correct, offset = _read_u32(view, offset, n_modes)
+        note_attempts, offset = _read_u32(view, offset, n_notes)
+        note_correct, offset = _read_u32(view, offset, n_notes)
+    except struct.error as e:
+        raise ValueError(str(e)) from e
+
+    meta = extra.get("meta")
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    if tuning and "tuning" not in meta:
+        meta["tuning"] = tuning
+
+    doc = {
+        "total_attempts": attempts,
+        "total_correct": correct,
+        "by_mode": _buckets(mode_names, mode_attempts, mode_correct),
+        "by_note": _buckets(note_names, note_attempts, note_correct),
+        "by_position": PositionCounters.from_arrays(num_strings, num_frets, pos_attempts, pos_correct),
+        "meta": meta,
+    }
+    if extra.get("journal_folded"):
+        doc["journal_folded"] = list(extra["journal_folded"])
+    return doc
+
+
+
+def read_binary_head(path: str) -> dict:
+    """Read totals, meta and folded journal ids without touching the counters.
+
+    Only the fixed header and the meta block at the start of the file are read.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        fields = _decode_header(memoryview(head))
+        tuning_len, extra_len = fields[4], fields[9]
+        data = head + f.read(2 * tuning_len + extra_len)
+
+    tuning, extra, _offset = _decode_extra(memoryview(data), tuning_len, extra_len)
+    meta = extra.get("meta")
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    if tuning and "tuning" not in meta:
+        meta["tuning"] = tuning
+    return {
+        "total_attempts": fields[5],
+        "total_correct": fields[6],
+        "meta": meta,
+        "journal_folded": list(extra.get("journal_folded") or []),
+    }
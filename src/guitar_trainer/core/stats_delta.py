@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from guitar_trainer.core.attempt_history import AttemptColumns
+from guitar_trainer.core.confusion import ConfusionMatrix
+from guitar_trainer.core.daily_rollup import DailyRollups
+from guitar_trainer.core.outcome_bits import OutcomeBits
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+from guitar_trainer.core.recency import RecencyCounters
+from guitar_trainer.core.response_sketch import ResponseTimes
+
+
+def _bump(counters: Dict[Any, list], key: Any, correct: bool) -> None:
+    c = counters.get(key)
+    if c is None:
+        c = [0, 0]
+        counters[key] = c
+    c[0] += 1
+    if correct:
+        c[1] += 1
+
+
+def _max(into: Dict[Any, list], other: Dict[Any, list]) -> None:
+    for key, (a, c) in other.items():
+        cur = into.setdefault(key, [0, 0])
+        cur[0] = max(cur[0], a)
+        cur[1] = max(cur[1], c)
+
+
+def _subtract(into: Dict[Any, list], other: Dict[Any, list]) -> None:
+    for key, (a, c) in other.items():
+        cur = into.get(key)
+        if cur is None:
+            continue
+        cur[0] -= a
+        cur[1] -= c
+        if cur[0] <= 0 and cur[1] <= 0:
+            del into[key]
+
+
+@dataclass
+class StatsDelta:
+    """Counter increments recorded since the last persist.
+
+    Keys are the touched buckets (mode name, note name, (string, fret)) and
+    values are [attempts, correct] increments. meta is the meta dict as of
+    when the delta was taken (filled in by Stats.pending_delta()). history
+    holds the individual attempts, oldest first, for the history file,
+    recency their decayed per-position increments, outcomes the answers
+    to shift into the per-position registers, response_times the answer
+    time histogram increments, confusion the wrong note answers and daily
+    their per-day counters.
+    """
+
+    attempts: int = 0
+    correct: int = 0
+    by_mode: Dict[str, list] = field(default_factory=dict)
+    by_note: Dict[str, list] = field(default_factory=dict)
+    by_position: Dict[Tuple[int, int], list] = field(default_factory=dict)
+    meta: Optional[Dict[str, Any]] = None
+    history: AttemptColumns = field(default_factory=AttemptColumns)
+    recency: RecencyCounters = field(default_factory=RecencyCounters)
+    outcomes: OutcomeBits = field(default_factory=OutcomeBits)
+    response_times: ResponseTimes = field(default_factory=ResponseTimes)
+    confusion: ConfusionMatrix = field(default_factory=ConfusionMatrix)
+    daily: DailyRollups = field(default_factory=DailyRollups)
+
+    def add_attempt(self, mode: str, note_name: Optional[str], correct: bool) -> None:
+        """note_name is the canonical note name; None counts no note bucket."""
+        self.attempts += 1
+        if correct:
+            self.correct += 1
+        _bump(self.by_mode, mode, correct)
+        if note_name is not None:
+            _bump(self.by_note, note_name, correct)
+
+    def add_position(self, string_index: int, fret: int, correct: bool) -> None:
+        _bump(self.by_position, (string_index, fret), correct)
+
+    def is_empty(self) -> bool:
+        return self.attempts == 0 and not (self.by_mode or self.by_note or self.by_position)
+
+    def copy(self) -> "StatsDelta":
+        return StatsDelta(
+            attempts=self.attempts,
+            correct=self.correct,
+            by_mode={k: list(v) for k, v in self.by_mode.items()},
+            by_note={k: list(v) for k, v in self.by_note.items()},
+            by_position={k: list(v) for k, v in self.by_position.items()},
+            meta=copy.deepcopy(self.meta),
+            history=self.history.copy(),
+            recency=self.recency.copy(),
+            outcomes=self.outcomes.copy(),
+            response_times=self.response_times.copy(),
+            confusion=self.confusion.copy(),
+            daily=self.daily.copy(),
+        )
+
+    def subtract(self, other: "StatsDelta") -> None:
+        """Remove increments that other already persisted (newer ones stay)."""
+        self.attempts -= other.attempts
+        self.correct -= other.correct
+        _subtract(self.by_mode, other.by_mode)
+        _subtract(self.by_note, other.by_note)
+        _subtract(self.by_position, other.by_position)
+        self.history.drop_front(len(other.history))
+        self.recency.subtract(other.recency)
+        self.outcomes.subtract(other.outcomes)
+        self.response_times.subtract(other.response_times)
+        self.confusion.subtract(other.confusion)
+        self.daily.subtract(other.daily)
+
+    def merge_max(self, other: "StatsDelta") -> None:
+        """Element-wise max of the counters (merging grow-only counters)."""
+        self.attempts = max(self.attempts, other.attempts)
+        self.correct = max(self.correct, other.correct)
+        _max(self.by_mode, other.by_mode)
+        _max(self.by_note, other.by_note)
+        _max(self.by_position, other.by_position)
+
+    def to_record(self) -> dict:
+        """Compact JSON form used by delta journal records."""
+        rec: dict = {"n": [self.attempts, self.correct]}
+        if self.by_mode:
+            rec["mode"] = self.by_mode
+        if self.by_note:
+            rec["note"] = self.by_note
+        if self.by_position:
+            rec["pos"] = {pos_key(s, f): v for (s, f), v in self.by_position.items()}
+        return rec
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "StatsDelta":
+        out = cls()
+        n = rec.get("n") or [0, 0]
+        out.attempts, out.correct = int(n[0]), int(n[1])
+        out.by_mode = {str(k): [int(v[0]), int(v[1])] for k, v in (rec.get("mode") or {}).items()}
+        out.by_note = {str(k): [int(v[0]), int(v[1])] for k, v in (rec.get("note") or {}).items()}
+        for key, v in (rec.get("pos") or {}).items():
+            parsed = parse_pos_key(key)
+            if parsed is not None:
+                out.by_position[parsed] = [int(v[0]), int(v[1])]
+        return out
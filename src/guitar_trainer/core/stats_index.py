@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from guitar_trainer.core.file_lock import file_lock
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# Hidden so the "stats_*" profile globs never pick it up.
+INDEX_NAME = ".stats_index.json"
+INDEX_VERSION = 1
+
+_lock = threading.Lock()
+
+
+def index_path_for(directory: str) -> str:
+    return os.path.join(directory or ".", INDEX_NAME)
+
+
+def _directory_of(stats_path: str) -> str:
+    return str(Path(stats_path).parent)
+
+
+def _read_entries(index_path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != INDEX_VERSION or not isinstance(raw.get("profiles"), dict):
+        return {}
+    return {str(k): v for k, v in raw["profiles"].items() if isinstance(v, dict)}
+
+
+def _write_entries(directory: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Replace the manifest atomically and stamp it with the directory mtime.
+
+    Renaming the manifest into place itself bumps the directory mtime, so the
+    manifest's own mtime is set to the directory's afterwards. Any later file
+    creation, rename or removal in the directory makes it look stale. The
+    manifest is a cache that can always be rebuilt, so it is not fsynced.
+    """
+    index_path = index_path_for(directory)
+    if not entries:
+        try:
+            os.remove(index_path)
+        except FileNotFoundError:
+            pass
+        return
+
+    fd, tmp_path = tempfile.mkstemp(prefix=INDEX_NAME + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "profiles": entries}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception:
+            pass
+
+    dir_mtime = os.stat(directory or ".").st_mtime_ns
+    os.utime(index_path, ns=(dir_mtime, dir_mtime))
+
+
+def update_index(stats_path: str, entry: Dict[str, Any]) -> None:
+    """Insert or replace the manifest entry for one profile (keyed by file name).
+
+    Only call this if index_is_fresh() was true before the profile file was
+    written; re-stamping a stale manifest would hide the other changes.
+    """
+    directory = _directory_of(stats_path)
+    index_path = index_path_for(directory)
+    with _lock, file_lock(index_path):
+        entries = _read_entries(index_path)
+        entries[Path(stats_path).name] = entry
+        _write_entries(directory, entries)
+
+
+def remove_from_index(stats_path: str) -> None:
+    """Drop a profile from the manifest (the manifest is removed when empty).
+
+    Same freshness rule as update_index().
+    """
+    directory = _directory_of(stats_path)
+    index_path = index_path_for(directory)
+    if not os.path.exists(index_path):
+        return
+    with _lock, file_lock(index_path):
+        entries = _read_entries(index_path)
+        if entries.pop(Path(stats_path).name, None) is not None or not entries:
+            _write_entries(directory, entries)
+
+
+def replace_index(directory: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Write a manifest rebuilt from a full directory scan."""
+    with _lock, file_lock(index_path_for(directory)):
+        _write_entries(directory, entries)
+
+
+def restamp_index(directory: str) -> None:
+    """Mark the manifest fresh again after writing another hidden cache file next to it.
+
+    Same freshness rule as update_index(): only call this if index_is_fresh()
+    was true before that file was written.
+    """
+    index_path = index_path_for(directory)
+    with _lock, file_lock(index_path):
+        dir_mtime = os.stat(directory or ".").st_mtime_ns
+        os.utime(index_path, ns=(dir_mtime, dir_mtime))
+
+
+def index_is_fresh(directory: str) -> bool:
+    """True if the manifest exists and nothing in the directory changed since it was written."""
+    try:
+        return os.stat(directory or ".").st_mtime_ns <= os.stat(index_path_for(directory)).st_mtime_ns
+    except OSError:
+        return False
+
+
+def read_index(directory: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Return the manifest entries, or None if it is missing, unreadable or stale.
+
+    Stale means the directory changed (a file was added, renamed or removed)
+    after the manifest was last written.
+    """
+    index_path = index_path_for(directory)
+    try:
+        with _lock:
+            if not index_is_fresh(directory):
+                return None
+            entries = _read_entries(index_path)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to read stats index '%s': %s", index_path, e)
+        return None
+    return entries or None
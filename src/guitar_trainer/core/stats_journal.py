@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from guitar_trainer.core.file_lock import file_lock
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# Record tags (first element of every journal line).
+REC_HEADER = "j"
+REC_ATTEMPT = "a"
+REC_META = "m"
+REC_DELTA = "d"
+
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".journal.compacting"
+
+
+def sidecar_path(stats_path: str, suffix: str) -> str:
+    """Return the path of a file stored next to a stats profile.
+
+    JSON profiles drop their suffix; other formats keep it so a .json and a
+    binary profile with the same name never share a sidecar.
+    """
+    p = Path(stats_path)
+    base = str(p.with_suffix("")) if p.suffix.lower() == ".json" else str(p)
+    return base + suffix
+
+
+def journal_path_for(stats_path: str) -> str:
+    """Return the live journal path next to a stats snapshot.
+
+    stats_6__e_standard.json -> stats_6__e_standard.journal
+    stats_6__e_standard.gtstats -> stats_6__e_standard.gtstats.journal
+    """
+    return sidecar_path(stats_path, JOURNAL_SUFFIX)
+
+
+def compacting_path_for(stats_path: str) -> str:
+    """Return the path a journal is moved to while it is being folded."""
+    return sidecar_path(stats_path, COMPACTING_SUFFIX)
+
+
+def _encode(record: list) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_journal_records(path: str) -> Iterator[list]:
+    """Yield records from a journal file (header excluded).
+
+    A torn last line (crash mid-append) or any other undecodable line is
+    skipped. Missing file => nothing.
+    """
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+
+    with f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping damaged journal line in '%s'", path)
+                continue
+            if isinstance(rec, list) and rec and rec[0] != REC_HEADER:
+                yield rec
+
+
+def read_journal_id(path: str) -> Optional[str]:
+    """Return only the id from a journal header (None if missing/unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "null")
+    except (OSError, json.JSONDecodeError):
+        return None
+    if isinstance(header, list) and len(header) > 1 and header[0] == REC_HEADER:
+        return str(header[1])
+    return None
+
+
+class StatsJournal:
+    """Append-only attempt log for one stats file.
+
+    Each record is one compact JSON array per line. Appends are buffered in
+    memory and only written + fsynced by flush(), so the cost of a save grows
+    with the number of new records instead of with the size of the profile.
+
+    flush() and rotate() run under the profile's file_lock(), so several
+    processes can append to one journal: a process whose file was rotated
+    away by another one's compaction reopens the live journal before writing.
+    """
+
+    def __init__(self, stats_path: str) -> None:
+        self.stats_path = str(stats_path)
+        self.path = journal_path_for(self.stats_path)
+        self.last_meta: Optional[dict] = None
+
+        self._lock = threading.Lock()
+        self._fh = None
+        self._pending: list[str] = []
+        self._compacting = False
+
+    def _is_live(self) -> bool:
+        """True if the open handle is still the file at self.path."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        own = os.fstat(self._fh.fileno())
+        return (st.st_dev, st.st_ino) == (own.st_dev, own.st_ino)
+
+    def _open(self):
+        if self._fh is not None and not self._is_live():
+            # Rotated (or removed) by a compaction, maybe in another process.
+            self._close_locked()
+        if self._fh is None:
+            p = Path(self.path)
+            if str(p.parent) not in ("", "."):
+                p.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not p.exists() or p.stat().st_size == 0
+            self._fh = open(self.path, "a", encoding="utf-8")
+            if is_new:
+                self._fh.write(_encode([REC_HEADER, uuid.uuid4().hex]))
+        return self._fh
+
+    def append(self, record: list) -> None:
+        with self._lock:
+            self._pending.append(_encode(record))
+
+    def flush(self) -> None:
+        with file_lock(self.stats_path), self._lock:
+            self._write_pending_locked()
+
+    def _write_pending_locked(self) -> None:
+        if not self._pending:
+            return
+        try:
+            fh = self._open()
+            fh.write("".join(self._pending))
+            fh.flush()
+            os.fsync(fh.fileno())
+        except OSError as e:
+            logger.warning("Failed to flush journal '%s': %s", self.path, e)
+            return
+        self._pending.clear()
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def close(self) -> None:
+        with file_lock(self.stats_path), self._lock:
+            self._write_pending_locked()
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+        except OSError:
+            pass
+        self._fh = None
+
+    def rotate(self) -> Optional[str]:
+        """Move the live journal aside for compaction.
+
+        Returns the compacting path, or None if there is nothing to fold.
+        New appends go to a fresh journal file. If a previous compaction was
+        interrupted, its file is returned without rotating again. Callers
+        hold file_lock(stats_path) (see compact_stats()).
+        """
+        compacting = compacting_path_for(self.stats_path)
+        with file_lock(self.stats_path), self._lock:
+            if os.path.exists(compacting):
+                return compacting
+            self._close_locked()
+            if not os.path.exists(self.path):
+                return None
+            os.replace(self.path, compacting)
+            return compacting
+
+    def begin_compaction(self) -> bool:
+        """Mark a compaction as running (False if one is already running)."""
+        with self._lock:
+            if self._compacting:
+                return False
+            self._compacting = True
+            return True
+
+    def end_compaction(self) -> None:
+        with self._lock:
+            self._compacting = False
+
+
+def meta_record(meta: dict[str, Any]) -> list:
+    return [REC_META, meta]
+
+
+def delta_record(delta: dict[str, Any]) -> list:
+    return [REC_DELTA, delta]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from guitar_trainer.core.note_counters import note_key
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# Version of the stats document layout. Files without "schema_version" are
+# version 1 (everything written before versioning, incl. the CLI stats.json).
+SCHEMA_VERSION = 3
+
+
+def document_version(raw: dict) -> int:
+    try:
+        return int(raw.get("schema_version", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _count(value: Any) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _clean_buckets(raw: Any, normalize_key: Callable[[str], Optional[str]]) -> Dict[str, Dict[str, int]]:
+    out: Dict[str, Dict[str, int]] = {}
+    if not isinstance(raw, dict):
+        return out
+    for key, bucket in raw.items():
+        key = normalize_key(str(key))
+        if key is None or not isinstance(bucket, dict):
+            continue
+        merged = out.setdefault(key, {"attempts": 0, "correct": 0})
+        merged["attempts"] += _count(bucket.get("attempts", 0))
+        merged["correct"] += _count(bucket.get("correct", 0))
+    return out
+
+
+def _mode_key(key: str) -> Optional[str]:
+    return key.strip().upper() or None
+
+
+def _position_key(key: str) -> Optional[str]:
+    parsed = parse_pos_key(key)
+    if parsed is None or parsed[0] < 0 or parsed[1] < 0:
+        return None
+    return pos_key(*parsed)
+
+
+def _v1_to_v2(raw: dict) -> dict:
+    """Validate and normalize everything the old loader fixed up on every load.
+
+    Counters become non-negative ints, mode keys are upper-case, position keys
+    canonical "s,f" (duplicates merged), modes A and B always exist, and meta
+    is a dict.
+    """
+    by_mode = _clean_buckets(raw.get("by_mode"), _mode_key)
+    for mode in ("A", "B"):
+        by_mode.setdefault(mode, {"attempts": 0, "correct": 0})
+
+    doc = {
+        "total_attempts": _count(raw.get("total_attempts", 0)),
+        "total_correct": _count(raw.get("total_correct", 0)),
+        "meta": dict(raw["meta"]) if isinstance(raw.get("meta"), dict) else {},
+    }
+    folded = raw.get("journal_folded")
+    if isinstance(folded, list) and folded:
+        doc["journal_folded"] = [str(j) for j in folded]
+    doc["by_mode"] = by_mode
+    doc["by_note"] = _clean_buckets(raw.get("by_note"), lambda k: k)
+    doc["by_position"] = _clean_buckets(raw.get("by_position"), _position_key)
+    return doc
+
+
+def _v2_to_v3(raw: dict) -> dict:
+    """Key note buckets by pitch class.
+
+    Enharmonic spellings ("C#" / "Db") are folded into one bucket under the
+    sharp name; keys that are not notes are dropped.
+    """
+    return {**raw, "by_note": _clean_buckets(raw.get("by_note"), note_key)}
+
+
+# _MIGRATIONS[v] turns a version v document into version v + 1.
+_MIGRATIONS: Dict[int, Callable[[dict], dict]] = {
+    1: _v1_to_v2,
+    2: _v2_to_v3,
+}
+
+
+def migrate_document(raw: dict) -> dict:
+    """Upgrade a stats document to SCHEMA_VERSION (returned as-is if current).
+
+    Documents from a newer version are returned unchanged (with a warning),
+    so an older app never rewrites them into an older layout.
+    """
+    version = document_version(raw)
+    if version > SCHEMA_VERSION:
+        logger.warning("Stats document has schema_version %s (newer than %s)", version, SCHEMA_VERSION)
+        return raw
+
+    doc = raw
+    while version < SCHEMA_VERSION:
+        doc = _MIGRATIONS[version](doc)
+        version += 1
+        doc = {"schema_version": version, **{k: v for k, v in doc.items() if k != "schema_version"}}
+    return doc
+
+
+def _upgrade_one(path: str) -> str:
+    # Runs in a worker process.
+    from guitar_trainer.core.stats import upgrade_stats_file
+
+    try:
+        return "upgraded" if upgrade_stats_file(path) else "current"
+    except Exception as e:
+        return f"failed: {e}"
+
+
+def find_stats_files(directory: str) -> list[str]:
+    """JSON and SQLite profiles in directory (per-tuning stats_* files and the CLI stats.json).
+
+    Binary snapshots are always written in the current schema, so they are
+    not listed.
+    """
+    from guitar_trainer.core.stats_sqlite import SQLITE_SUFFIXES
+
+    base = glob.escape(directory or ".")
+    paths = [p for suffix in (".json", *SQLITE_SUFFIXES) for p in glob.glob(os.path.join(base, "stats*" + suffix))]
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+def migrate_directory(directory: str, *, jobs: Optional[int] = None) -> Dict[str, str]:
+    """Upgrade every JSON and SQLite profile in directory to the current schema, in parallel.
+
+    Returns {path: "upgraded" | "current" | "failed: <reason>"}.
+    """
+    paths = find_stats_files(directory)
+    if not paths:
+        return {}
+    workers = max(1, min(len(paths), jobs or os.cpu_count() or 1))
+    if workers == 1:
+        return {p: _upgrade_one(p) for p in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(_upgrade_one, paths)))
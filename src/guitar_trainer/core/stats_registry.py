@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from guitar_trainer.core.stats import Stats, attach_journal, load_stats
+
+# Profiles kept in memory; the least recently used one is dropped first.
+DEFAULT_MAX_ENTRIES = 8
+
+
+class StatsRegistry:
+    """Process-wide cache of live Stats objects, one per profile path.
+
+    get() hands every screen the same Stats for a path. A cached object is
+    re-read only when the files on disk changed since it last loaded or saved
+    them (their (mtime, size) signature differs) and it has no unsaved data
+    of its own.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        *,
+        load: Callable[..., Stats] = load_stats,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._load = load
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Stats]" = OrderedDict()
+
+    def get(self, path: str, *, journal: bool = False) -> Stats:
+        """Return the live Stats for path, loading it if needed.
+
+        With journal=True the shared journal is attached (see load_stats()).
+        """
+        path = os.fspath(path)
+        with self._lock:
+            stats = self._cached(path)
+            if stats is None:
+                stats = self._load(path, journal=journal)
+                self._store(path, stats)
+            elif journal and stats.journal is None:
+                attach_journal(stats, path)
+            return stats
+
+    def cached(self, path: str) -> Optional[Stats]:
+        """Return the live Stats for path if it is cached and current (never loads)."""
+        path = os.fspath(path)
+        with self._lock:
+            return self._cached(path)
+
+    def put(self, path: str, stats: Stats) -> None:
+        """Make stats the live object for path (e.g. after a reset)."""
+        path = os.fspath(path)
+        with self._lock:
+            self._store(path, stats)
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(os.fspath(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _cached(self, path: str) -> Optional[Stats]:
+        stats = self._entries.get(path)
+        if stats is None:
+            return None
+        if not stats.is_current(path):
+            del self._entries[path]
+            return None
+        self._entries.move_to_end(path)
+        return stats
+
+    def _store(self, path: str, stats: Stats) -> None:
+        self._entries[path] = stats
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_default_registry: Optional[StatsRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_stats_registry() -> StatsRegistry:
+    """Return the process-wide registry."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = StatsRegistry()
+        return _default_registry
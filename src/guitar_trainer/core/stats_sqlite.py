@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from guitar_trainer.core.position_key import parse_pos_key, pos_key
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION, migrate_document
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id       INTEGER PRIMARY KEY CHECK (id = 0),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS by_mode (
+    mode     TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS by_note (
+    note     TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS by_position (
+    string_index INTEGER NOT NULL,
+    fret         INTEGER NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    correct      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (string_index, fret)
+) WITHOUT ROWID;
+"""
+
+
+def is_sqlite_path(path: str) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    p = Path(path)
+    if str(p.parent) not in ("", "."):
+        p.parent.mkdir(parents=True, exist_ok=True)
+
+    created = not p.exists()
+    conn = sqlite3.connect(str(p), timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL is durable across application crashes; only an OS crash
+    # can lose the last transactions.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    if created:
+        _set_version(conn, SCHEMA_VERSION)
+    return conn
+
+
+# The document schema_version is kept in the database header (PRAGMA
+# user_version); 0 means a file written before it was stored (version 1).
+def _read_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0]) or 1
+
+
+def _set_version(conn: sqlite3.Connection, version: int) -> None:
+    # PRAGMA values cannot be bound as parameters.
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def _counts(bucket: Any) -> Tuple[int, int]:
+    if not isinstance(bucket, dict):
+        return 0, 0
+    try:
+        return int(bucket.get("attempts", 0)), int(bucket.get("correct", 0))
+    except (TypeError, ValueError):
+        return 0, 0
+
+
+def _read_totals(conn: sqlite3.Connection) -> Tuple[int, int]:
+    row = conn.execute("SELECT attempts, correct FROM totals WHERE id = 0").fetchone()
+    return (int(row[0]), int(row[1])) if row else (0, 0)
+
+
+def _read_meta(conn: sqlite3.Connection) -> dict:
+    meta: dict = {}
+    for key, value in conn.execute("SELECT key, value FROM meta"):
+        try:
+            meta[key] = json.loads(value)
+        except json.JSONDecodeError:
+            continue
+    return meta
+
+
+def _read_document(conn: sqlite3.Connection) -> dict:
+    attempts, correct = _read_totals(conn)
+    by_mode = {
+        m: {"attempts": a, "correct": c}
+        for m, a, c in conn.execute("SELECT mode, attempts, correct FROM by_mode")
+    }
+    by_note = {
+        n: {"attempts": a, "correct": c}
+        for n, a, c in conn.execute("SELECT note, attempts, correct FROM by_note")
+    }
+    by_position = {
+        pos_key(s, f): {"attempts": a, "correct": c}
+        for s, f, a, c in conn.execute("SELECT string_index, fret, attempts, correct FROM by_position")
+    }
+    return {
+        "schema_version": _read_version(conn),
+        "total_attempts": attempts,
+        "total_correct": correct,
+        "by_mode": by_mode,
+        "by_note": by_note,
+        "by_position": by_position,
+        "meta": _read_meta(conn),
+    }
+
+
+def read_sqlite_stats(path: str) -> Optional[dict]:
+    """Read a SQLite profile into the same document shape as the JSON format.
+
+    The document is returned as stored (see migrate_document()). Returns
+    None if the file does not exist.
+    """
+    if not Path(path).exists():
+        return None
+
+    with closing(_connect(path)) as conn:
+        return _read_document(conn)
+
+
+def read_sqlite_summary(path: str) -> Optional[dict]:
+    """Read only totals + meta (no per-bucket rows). None if the file is missing."""
+    if not Path(path).exists():
+        return None
+
+    with closing(_connect(path)) as conn:
+        attempts, correct = _read_totals(conn)
+        return {
+            "schema_version": _read_version(conn),
+            "total_attempts": attempts,
+            "total_correct": correct,
+            "meta": _read_meta(conn),
+        }
+
+
+def _write_meta(conn: sqlite3.Connection, meta: dict) -> None:
+    conn.execute("DELETE FROM meta")
+    conn.executemany(
+        "INSERT INTO meta (key, value) VALUES (?, ?)",
+        [(str(k), json.dumps(v, ensure_ascii=False)) for k, v in meta.items()],
+    )
+
+
+def _write_document(conn: sqlite3.Connection, payload: dict) -> None:
+    by_mode = payload.get("by_mode") or {}
+    by_note = payload.get("by_note") or {}
+    by_position = payload.get("by_position") or {}
+    meta = payload.get("meta") or {}
+
+    position_rows = []
+    for key, bucket in by_position.items():
+        parsed = parse_pos_key(key)
+        if parsed is None:
+            continue
+        position_rows.append((parsed[0], parsed[1], *_counts(bucket)))
+
+    conn.execute(
+        "INSERT INTO totals (id, attempts, correct) VALUES (0, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET attempts = excluded.attempts, correct = excluded.correct",
+        (int(payload.get("total_attempts", 0)), int(payload.get("total_correct", 0))),
+    )
+    _set_version(conn, int(payload.get("schema_version", SCHEMA_VERSION)))
+
+    _write_meta(conn, meta)
+
+    for table, column, buckets in (("by_mode", "mode", by_mode), ("by_note", "note", by_note)):
+        conn.executemany(
+            f"INSERT INTO {table} ({column}, attempts, correct) VALUES (?, ?, ?) "
+            f"ON CONFLICT({column}) DO UPDATE SET "
+            "attempts = excluded.attempts, correct = excluded.correct",
+            [(str(k), *_counts(b)) for k, b in buckets.items()],
+        )
+        keep = [str(k) for k in buckets]
+        conn.execute(
+            f"DELETE FROM {table} WHERE {column} NOT IN ({','.join('?' * len(keep))})",
+            keep,
+        )
+
+    conn.executemany(
+        "INSERT INTO by_position (string_index, fret, attempts, correct) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(string_index, fret) DO UPDATE SET "
+        "attempts = excluded.attempts, correct = excluded.correct",
+        position_rows,
+    )
+    if len(position_rows) < conn.execute("SELECT COUNT(*) FROM by_position").fetchone()[0]:
+        keep_positions = {(s, f) for s, f, _a, _c in position_rows}
+        stale = [
+            (s, f)
+            for s, f in conn.execute("SELECT string_index, fret FROM by_position")
+            if (s, f) not in keep_positions
+        ]
+        conn.executemany("DELETE FROM by_position WHERE string_index = ? AND fret = ?", stale)
+
+
+def write_sqlite_stats(path: str, payload: dict) -> None:
+    """Upsert a stats document into a SQLite profile in one transaction.
+
+    Buckets missing from payload are removed, so the file always mirrors the
+    in-memory stats (this is what makes "reset stats" work). The file takes
+    the payload's schema_version (the current one if it has none).
+    """
+    with closing(_connect(path)) as conn:
+        with conn:
+            _write_document(conn, payload)
+
+
+def upgrade_sqlite_stats(path: str) -> bool:
+    """Rewrite a SQLite profile stored in an older schema in the current one.
+
+    Reading and rewriting happen in one write transaction, so increments
+    from other writers are not lost. Returns True if the file was upgraded,
+    False if it is missing or already current.
+    """
+    if not Path(path).exists():
+        return False
+
+    with closing(_connect(path)) as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            doc = _read_document(conn)
+            if doc["schema_version"] >= SCHEMA_VERSION:
+                return False
+            _write_document(conn, migrate_document(doc))
+            return True
+
+
+def _increments(values: Any) -> Tuple[int, int]:
+    try:
+        return int(values[0]), int(values[1])
+    except (TypeError, ValueError, IndexError):
+        return 0, 0
+
+
+def add_sqlite_delta(path: str, delta: dict, meta: Optional[dict] = None) -> None:
+    """Add counter increments to a SQLite profile in one transaction.
+
+    delta uses the journal delta record layout:
+    {"n": [a, c], "mode": {m: [a, c]}, "note": {n: [a, c]}, "pos": {"s,f": [a, c]}}.
+    Rows are incremented, never overwritten, so concurrent writers merge.
+    meta (if given) replaces the stored meta.
+    """
+    attempts, correct = _increments(delta.get("n"))
+    position_rows = []
+    for key, values in (delta.get("pos") or {}).items():
+        parsed = parse_pos_key(key)
+        if parsed is not None:
+            position_rows.append((parsed[0], parsed[1], *_increments(values)))
+
+    with closing(_connect(path)) as conn:
+        with conn:
+            conn.execute(
+                "INSERT INTO totals (id, attempts, correct) VALUES (0, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, correct = correct + excluded.correct",
+                (attempts, correct),
+            )
+            if meta is not None:
+                _write_meta(conn, meta)
+
+            for table, column, buckets in (("by_mode", "mode", delta.get("mode")), ("by_note", "note", delta.get("note"))):
+                conn.executemany(
+                    f"INSERT INTO {table} ({column}, attempts, correct) VALUES (?, ?, ?) "
+                    f"ON CONFLICT({column}) DO UPDATE SET "
+                    "attempts = attempts + excluded.attempts, correct = correct + excluded.correct",
+                    [(str(k), *_increments(v)) for k, v in (buckets or {}).items()],
+                )
+
+            conn.executemany(
+                "INSERT INTO by_position (string_index, fret, attempts, correct) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(string_index, fret) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, correct = correct + excluded.correct",
+                position_rows,
+            )
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from guitar_trainer.core.session_log import SessionRecord, append_session
+from guitar_trainer.core.stats import Stats, claim_for_device, save_stats
+
+logger = logging.getLogger("guitar_trainer.stats")
+
+# Requests arriving within this window are coalesced into one write.
+DEFAULT_DELAY_SEC = 0.2
+
+
+class StatsWriter:
+    """Persist stats on a background thread.
+
+    request_save() only records "this path should be saved with this Stats"
+    and returns immediately. A worker thread waits until requests stop
+    arriving for delay_sec, takes a consistent Stats.snapshot() of every
+    pending profile and saves it, so bursts of saves become one write and the
+    caller (usually the Tk thread) never waits on the disk. Finished
+    sessions queued with request_session() are appended after the batch's
+    saves.
+    """
+
+    def __init__(
+        self,
+        *,
+        delay_sec: float = DEFAULT_DELAY_SEC,
+        save: Callable[[str, Stats], bool] = save_stats,
+        append: Callable[[str, SessionRecord], None] = append_session,
+    ) -> None:
+        self.delay_sec = max(0.0, float(delay_sec))
+        self._save = save
+        self._append = append
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Stats] = {}
+        self._inflight: Dict[str, Stats] = {}
+        self._sessions: List[Tuple[str, SessionRecord]] = []
+        self._sessions_inflight: List[Tuple[str, SessionRecord]] = []
+        self._last_request = 0.0
+        self._flush_requested = False
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def request_save(self, path: str, stats: Stats) -> None:
+        """Queue a save; a newer request for the same path replaces the older one."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StatsWriter is closed")
+            self._pending[os.fspath(path)] = stats
+            self._last_request = time.monotonic()
+            self._cond.notify_all()
+
+    def request_session(self, path: str, record: SessionRecord) -> None:
+        """Queue a finished session for the profile's session table (see save_session())."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StatsWriter is closed")
+            self._sessions.append((os.fspath(path), record))
+            self._last_request = time.monotonic()
+            self._cond.notify_all()
+
+    def _busy(self) -> bool:
+        return bool(self._pending or self._inflight or self._sessions or self._sessions_inflight)
+
+    def peek(self, path: str) -> Optional[Stats]:
+        """Return the Stats queued (or being written) for path, if any.
+
+        Readers use this instead of re-reading a file that is about to be
+        replaced.
+        """
+        path = os.fspath(path)
+        with self._cond:
+            return self._pending.get(path) or self._inflight.get(path)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Write pending saves now and block until they are done.
+
+        Returns False if timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._busy():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._flush_requested = False
+            return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending saves and stop the worker thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _take_batch(self) -> Optional[Tuple[Dict[str, Stats], List[Tuple[str, SessionRecord]]]]:
+        with self._cond:
+            while not (self._pending or self._sessions):
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            # Debounce: wait for a quiet period unless someone is waiting on us.
+            while (self._pending or self._sessions) and not (self._closed or self._flush_requested):
+                remaining = self._last_request + self.delay_sec - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, self._pending = self._pending, {}
+            sessions, self._sessions = self._sessions, []
+            self._inflight = batch
+            self._sessions_inflight = sessions
+            return batch, sessions
+
+    def _run(self) -> None:
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            batch, sessions = taken
+
+            for path, stats in batch.items():
+                # On the live object, so its meta keeps the claim (see claim_for_device()).
+                claim_for_device(stats)
+                snap = stats.snapshot()
+                delta = snap.pending_delta()
+                try:
+                    saved = self._save(path, snap)
+                except Exception as e:
+                    logger.warning("Background save of '%s' failed: %s", path, e)
+                    continue
+                if saved:
+                    # Only what the snapshot contained is persisted now.
+                    stats.mark_persisted(delta, path)
+
+            for path, record in sessions:
+                try:
+                    self._append(path, record)
+                except OSError as e:
+                    logger.warning("Failed to record session for '%s': %s", path, e)
+
+            with self._cond:
+                self._inflight = {}
+                self._sessions_inflight = []
+                self._cond.notify_all()
+
+
+_default_writer: Optional[StatsWriter] = None
+_default_lock = threading.Lock()
+
+
+def get_stats_writer() -> StatsWriter:
+    """Return the process-wide writer (flushed automatically at exit)."""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = StatsWriter()
+            atexit.register(_default_writer.close)
+        return _default_writer
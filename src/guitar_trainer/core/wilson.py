@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+# Two-sided 95% normal quantile.
+Z_95 = 1.96
+
+
+def wilson_bounds(correct: float, attempts: float, z: float = Z_95) -> Tuple[float, float]:
+    """Wilson score interval (lower, upper) for an accuracy of correct / attempts.
+
+    Unlike the plain ratio it reflects the sample size: 0 of 1 gives about
+    (0.0, 0.79), 0 of 50 about (0.0, 0.07). Returns (0.0, 1.0) without attempts.
+    """
+    if attempts <= 0:
+        return 0.0, 1.0
+    p = min(1.0, max(0.0, correct / attempts))
+    z2 = z * z
+    denom = 1.0 + z2 / attempts
+    centre = (p + z2 / (2.0 * attempts)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / attempts + z2 / (4.0 * attempts * attempts)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
@@ -3,7 +3,9 @@ import tkinter as tk
 
 from guitar_trainer.gui.dpi import apply_tk_scaling, configure_windows_dpi_awareness
 from guitar_trainer.gui.theme import apply_theme
-from guitar_trainer.core.stats import load_stats
+from guitar_trainer.core.stats import stats_file_suffix
+from guitar_trainer.core.stats_registry import get_stats_registry
+from guitar_trainer.core.stats_writer import get_stats_writer
 from guitar_trainer.core.tuning import get_tuning_by_name
 from guitar_trainer.gui.menu_tk import MenuFrame
 from guitar_trainer.gui.quiz_tk import NoteQuizFrame, PositionsQuizFrame, AdaptiveNoteQuizFrame, StringOnStringQuizFrame
@@ -11,6 +13,7 @@ from guitar_trainer.gui.practice_tk import PracticeSessionFrame
 from guitar_trainer.gui.practice_summary_tk import PracticeSummaryFrame, PracticeSummary
 from guitar_trainer.gui.stats_view_tk import StatsHeatmapFrame
 from guitar_trainer.gui.heatmap_picker_tk import HeatmapPickerFrame
+from guitar_trainer.gui.confusion_view_tk import ConfusionFrame
 
 
 def _slug(text: str) -> str:
@@ -27,12 +30,14 @@ def stats_path_for(num_strings: int, tuning_name: str, custom_tuning: list[int]
       stats_6__e_standard.json
       stats_7__b_standard.json
       stats_6__custom.json  (still unique via meta.tuning)
+
+    The suffix follows the configured storage backend (.json or .sqlite).
     """
     if tuning_name.strip().lower().startswith("custom"):
         slug = "custom"
     else:
         slug = _slug(tuning_name)
-    return f"stats_{int(num_strings)}__{slug}.json"
+    return f"stats_{int(num_strings)}__{slug}{stats_file_suffix()}"
 
 
 def run_gui() -> None:
@@ -81,7 +86,8 @@ def run_gui() -> None:
 
     def open_heatmap_from_file(stats_path: str, max_fret: int) -> None:
         clear_root()
-        stats = load_stats(stats_path)
+        # Copy: the view adds display-only meta that must not be saved.
+        stats = (get_stats_writer().peek(stats_path) or get_stats_registry().get(stats_path)).snapshot()
 
         # store file path in meta for display
         stats.meta = dict(stats.meta or {})
@@ -92,10 +98,20 @@ def run_gui() -> None:
             stats=stats,
             max_fret=max_fret,
             on_back=show_menu,
+            on_confusions=lambda: show_confusions(stats, stats_path, max_fret),
             title_suffix=None,
         )
         frame.pack(fill="both", expand=True, padx=16, pady=16)
 
+    def show_confusions(stats, stats_path: str, max_fret: int) -> None:
+        clear_root()
+        frame = ConfusionFrame(
+            root,
+            stats=stats,
+            on_back=lambda: open_heatmap_from_file(stats_path, max_fret),
+        )
+        frame.pack(fill="both", expand=True, padx=16, pady=16)
+
     def show_heatmap_picker(max_fret: int) -> None:
         clear_root()
         frame = HeatmapPickerFrame(
@@ -170,7 +186,9 @@ def run_gui() -> None:
         clear_root()
 
         stats_path = stats_path_for(num_strings, tuning_name, custom_tuning)
-        stats = load_stats(stats_path)
+        # A save for this profile may still be queued; keep using that object.
+        # Otherwise load journaled: each answer is appended, so saves stay cheap.
+        stats = get_stats_writer().peek(stats_path) or get_stats_registry().get(stats_path, journal=True)
 
         if custom_tuning is not None:
             tuning = list(custom_tuning)
@@ -273,3 +291,6 @@ def run_gui() -> None:
 
     show_menu()
     root.mainloop()
+
+    # Write anything still queued before the process exits.
+    get_stats_writer().wait()
@@ -0,0 +1,98 @@
+import tkinter as tk
+from tkinter import ttk
+
+from guitar_trainer.core.notes import index_to_name
+from guitar_trainer.core.stats import Stats
+
+
+def _shade(share: float) -> str:
+    """Background for a cell holding share (0..1) of the largest count: dark to red."""
+    share = max(0.0, min(1.0, share))
+    r = int(0x2a + (0xd0 - 0x2a) * share)
+    g = int(0x2e + (0x40 - 0x2e) * share)
+    b = int(0x3a + (0x40 - 0x3a) * share)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+class ConfusionFrame(tk.Frame):
+    """12x12 table of wrong note answers (rows: the note asked, columns: the note given).
+
+    The most common confusions are outlined in the table and listed below it.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        *,
+        stats: Stats,
+        on_back=None,
+        prefer_flats: bool = False,
+        top: int = 5,
+    ) -> None:
+        super().__init__(master)
+
+        self.stats = stats
+        self.on_back = on_back
+        self.prefer_flats = prefer_flats
+
+        meta = stats.meta or {}
+        tuning_name = meta.get("tuning_name", "Unknown tuning")
+        stats_file = meta.get("stats_file", "")
+
+        header = ttk.Frame(self)
+        header.pack(fill="x", pady=(0, 8))
+        ttk.Label(header, text=f"Note confusions | {tuning_name}", font=("Arial", 13)).pack(side="left")
+        if self.on_back:
+            ttk.Button(header, text="Back", command=self.on_back).pack(side="right")
+
+        matrix = stats.confusion
+        total = len(matrix)
+        info = ttk.Frame(self)
+        info.pack(fill="x", pady=(0, 6))
+        ttk.Label(info, text=f"Wrong note answers recorded: {total}", foreground="#9aa2b6").pack(side="left")
+        if stats_file:
+            ttk.Label(info, text=f"File: {stats_file}", foreground="#9aa2b6").pack(side="right")
+
+        worst = stats.confusions(top)
+        self._build_table(worst)
+        self._build_list(worst)
+
+    def _name(self, pc: int) -> str:
+        return index_to_name(pc, prefer_flats=self.prefer_flats)
+
+    def _build_table(self, worst: list) -> None:
+        matrix = self.stats.confusion
+        peak = max(matrix.counts)
+        highlighted = {(c, a) for c, a, _n in worst}
+
+        table = tk.Frame(self)
+        table.pack(padx=10, pady=10)
+        tk.Label(table, text="asked \\ given", fg="#9aa2b6").grid(row=0, column=0, padx=2, pady=2)
+        for pc in range(12):
+            tk.Label(table, text=self._name(pc), width=4).grid(row=0, column=pc + 1, padx=1, pady=1)
+            tk.Label(table, text=self._name(pc), width=4).grid(row=pc + 1, column=0, padx=1, pady=1)
+
+        for correct_pc in range(12):
+            for answered_pc in range(12):
+                n = matrix.count(correct_pc, answered_pc)
+                outlined = (correct_pc, answered_pc) in highlighted
+                tk.Label(
+                    table,
+                    text=str(n) if n else "",
+                    width=4,
+                    bg=_shade(n / peak) if peak else _shade(0.0),
+                    fg="white",
+                    relief="solid" if outlined else "flat",
+                    borderwidth=2 if outlined else 0,
+                    font=("Arial", 10, "bold") if outlined else ("Arial", 10),
+                ).grid(row=correct_pc + 1, column=answered_pc + 1, padx=1, pady=1)
+
+    def _build_list(self, worst: list) -> None:
+        box = ttk.LabelFrame(self, text="Most common confusions")
+        box.pack(fill="x", padx=10, pady=(0, 10))
+        if not worst:
+            ttk.Label(box, text="No wrong note answers yet.", style="Hint.TLabel").pack(anchor="w", padx=8, pady=4)
+            return
+        for correct_pc, answered_pc, n in worst:
+            text = f"{self._name(correct_pc)} answered as {self._name(answered_pc)}: {n}×"
+            ttk.Label(box, text=text).pack(anchor="w", padx=8, pady=2)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import glob
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Optional
 
-from guitar_trainer.core.stats import load_stats, save_stats, Stats
+from guitar_trainer.core.stats import delete_stats, list_stats_profiles, StatsSummary
+from guitar_trainer.core.stats_registry import get_stats_registry
+from guitar_trainer.core.stats_writer import get_stats_writer
 
 
 def _safe_float(a: int, b: int) -> float:
@@ -77,11 +78,17 @@ class HeatmapPickerFrame(ttk.Frame):
 
         self._refresh()
 
-    def _scan_stats_files(self) -> list[str]:
-        # We keep it simple: scan current working directory for stats_*.json
-        # This matches how your app already writes stats in repo folder.
-        paths = sorted(glob.glob("stats_*.json"))
-        return [p for p in paths if os.path.isfile(p)]
+    def _list_profiles(self) -> list[tuple[str, StatsSummary]]:
+        # We keep it simple: list stats_* profiles in the current working directory
+        # (JSON, binary and SQLite). This matches how your app already writes stats in repo folder.
+        # The listing comes from the stats index manifest, so it does not open every file.
+        profiles = []
+        writer = get_stats_writer()
+        for path, summary in list_stats_profiles("."):
+            # A save that is still queued is newer than what the index recorded.
+            queued = writer.peek(path)
+            profiles.append((path, StatsSummary.from_stats(queued) if queued is not None else summary))
+        return profiles
 
     def _refresh(self) -> None:
         for iid in self.tree.get_children():
@@ -96,22 +103,20 @@ class HeatmapPickerFrame(ttk.Frame):
             messagebox.showerror("Invalid max fret", "Max fret must be an integer between 0 and 24.")
             return
 
-        paths = self._scan_stats_files()
-        if not paths:
-            self.tree.insert("", "end", values=("—", "—", "0", "0.0%", "No stats_*.json found"))
+        profiles = self._list_profiles()
+        if not profiles:
+            self.tree.insert("", "end", values=("—", "—", "0", "0.0%", "No stats_* files found"))
             return
 
-        for p in paths:
-            st = load_stats(p)
-            meta = st.meta or {}
+        for p, summary in profiles:
+            meta, attempts, correct = summary.meta, summary.total_attempts, summary.total_correct
             num_strings = meta.get("num_strings")
             tuning_name = meta.get("tuning_name")
 
             instrument = f"{num_strings}-string" if isinstance(num_strings, int) else "?"
             tuning = str(tuning_name) if tuning_name else "(unknown tuning)"
 
-            attempts = int(st.total_attempts)
-            acc = 100.0 * _safe_float(int(st.total_correct), attempts)
+            acc = 100.0 * _safe_float(correct, attempts)
             self.tree.insert("", "end", values=(instrument, tuning, str(attempts), f"{acc:.1f}%", p))
 
     def _selected_path(self) -> Optional[str]:
@@ -143,7 +148,10 @@ class HeatmapPickerFrame(ttk.Frame):
         if not messagebox.askyesno("Delete stats", f"Delete stats file?\n\n{p}"):
             return
         try:
-            os.remove(p)
+            # A queued save would recreate the file right after deleting it.
+            get_stats_writer().wait()
+            delete_stats(p)
+            get_stats_registry().discard(p)
         except Exception as e:
             messagebox.showerror("Delete failed", str(e))
             return
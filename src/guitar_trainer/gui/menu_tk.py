@@ -3,7 +3,9 @@ from tkinter import messagebox
 from tkinter import ttk
 from typing import Callable, Tuple
 
-from guitar_trainer.core.stats import Stats, load_stats, save_stats
+from guitar_trainer.core.stats import Stats, StatsSummary, load_stats_summary
+from guitar_trainer.core.stats_registry import get_stats_registry
+from guitar_trainer.core.stats_writer import get_stats_writer
 from guitar_trainer.core.tuning import (
     get_tuning_presets,
     get_default_tuning_name,
@@ -53,7 +55,7 @@ class MenuFrame(ttk.Frame):
         self.plan_heat_thr_var = tk.StringVar(value="0.60")
 
         self.stats_path = self._compute_stats_path()
-        self.stats = load_stats(self.stats_path)
+        self.summary = self._load_profile_summary()
 
         # -----------------------
         # Root layout (dashboard)
@@ -404,6 +406,14 @@ class MenuFrame(ttk.Frame):
                 custom_tuning = None
         return self.stats_path_resolver(num_strings, tuning_name, custom_tuning)
 
+    def _load_profile_summary(self) -> StatsSummary:
+        # Prefer a save that is still queued over the (older) file on disk.
+        # A live profile object (from an earlier screen) needs no file read at all.
+        live = get_stats_writer().peek(self.stats_path) or get_stats_registry().cached(self.stats_path)
+        if live is not None:
+            return StatsSummary.from_stats(live)
+        return load_stats_summary(self.stats_path)
+
     def _refresh_custom_visibility(self) -> None:
         if self.tuning_var.get() == CUSTOM_TUNING_NAME:
             self.custom_outer.grid()
@@ -433,9 +443,9 @@ class MenuFrame(ttk.Frame):
     def _update_profile_summary(self) -> None:
         self.active_file_label.configure(text=f"Active stats file: {self.stats_path}")
 
-        attempts = int(getattr(self.stats, "total_attempts", 0))
-        correct = int(getattr(self.stats, "total_correct", 0))
-        acc = (100.0 * correct / attempts) if attempts > 0 else 0.0
+        attempts = self.summary.total_attempts
+        correct = self.summary.total_correct
+        acc = 100.0 * self.summary.accuracy
 
         self.attempts_label.configure(text=f"Attempts: {attempts}")
         self.correct_label.configure(text=f"Correct: {correct}")
@@ -447,7 +457,7 @@ class MenuFrame(ttk.Frame):
         self._refresh_custom_visibility()
 
         self.stats_path = self._compute_stats_path()
-        self.stats = load_stats(self.stats_path)
+        self.summary = self._load_profile_summary()
 
         self._update_profile_header()
         self._update_profile_summary()
@@ -501,10 +511,10 @@ class MenuFrame(ttk.Frame):
         self.on_heatmap(max_fret)
 
     def _show_stats_clicked(self) -> None:
-        self.stats = load_stats(self.stats_path)
-        attempts = int(self.stats.total_attempts)
-        correct = int(self.stats.total_correct)
-        acc = (100.0 * correct / attempts) if attempts > 0 else 0.0
+        self.summary = self._load_profile_summary()
+        attempts = self.summary.total_attempts
+        correct = self.summary.total_correct
+        acc = 100.0 * self.summary.accuracy
         messagebox.showinfo(
             "Stats",
             f"Stats file: {self.stats_path}\n\nAttempts: {attempts}\nCorrect: {correct}\nAccuracy: {acc:.1f}%",
@@ -517,8 +527,10 @@ class MenuFrame(ttk.Frame):
             f"This will erase stats for this profile:\n{self.stats_path}\n\nContinue?",
         ):
             return
-        self.stats = Stats()
-        save_stats(self.stats_path, self.stats)
+        stats = Stats()
+        get_stats_registry().put(self.stats_path, stats)
+        get_stats_writer().request_save(self.stats_path, stats)
+        self.summary = StatsSummary()
         messagebox.showinfo("Reset stats", f"Stats reset:\n{self.stats_path}")
         self._update_profile_summary()
 
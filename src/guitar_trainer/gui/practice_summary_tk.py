@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import tkinter as tk
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Callable
 
 
@@ -19,6 +19,10 @@ class PracticeSummary:
 
     weak_strings: List[Tuple[str, int, float | None]]
     weak_frets: List[Tuple[str, int, float | None]]
+    # (label, median seconds) of positions answered correctly but slowly.
+    slow_positions: List[Tuple[str, float]] = field(default_factory=list)
+    # (note name, median seconds) of the notes with the slowest correct answers.
+    slow_notes: List[Tuple[str, float]] = field(default_factory=list)
 
 
 class PracticeSummaryFrame(tk.Frame):
@@ -82,6 +86,18 @@ class PracticeSummaryFrame(tk.Frame):
         for label, attempts, acc in summary.weak_frets:
             tk.Label(right, text="• " + fmt_item(label, attempts, acc), fg="gray").pack(anchor="w")
 
+        if summary.slow_positions:
+            slow = tk.LabelFrame(self, text="Right but slow (median time of correct answers)")
+            slow.pack(fill="x", padx=12, pady=8)
+            for label, seconds in summary.slow_positions:
+                tk.Label(slow, text=f"• {label}: {seconds:.1f}s", fg="gray").pack(anchor="w", padx=10)
+
+        if summary.slow_notes:
+            notes = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in summary.slow_notes)
+            tk.Label(self, text=f"Slowest notes (median time of correct answers): {notes}", fg="gray").pack(
+                anchor="w", padx=12
+            )
+
         actions = tk.Frame(self)
         actions.pack(pady=14)
 
@@ -8,21 +8,20 @@ from tkinter import ttk
 from typing import Deque, List, Optional, Set, Tuple
 
 from guitar_trainer.core.adaptive import choose_adaptive_position
-from guitar_trainer.core.position_key import pos_key
+from guitar_trainer.core.checkpoint import SessionCheckpoint
+from guitar_trainer.core.mapping import note_index_at
+from guitar_trainer.core.notes import index_to_name
 from guitar_trainer.core.quiz import check_note_name_answer, question_name_at_position
-from guitar_trainer.core.stats import Stats, save_stats
+from guitar_trainer.core.session_log import PRACTICE, SessionRecorder, save_session
+from guitar_trainer.core.stats import Stats
+from guitar_trainer.core.stats_writer import get_stats_writer
 from guitar_trainer.core.training_plan import TrainingPlanConfig
 from guitar_trainer.gui.fretboard import Fretboard, Position
 from guitar_trainer.gui.practice_summary_tk import PracticeSummary
 
 
 def _get_attempts_correct(stats: Stats, s: int, f: int) -> tuple[int, int]:
-    data = stats.by_position.get(pos_key(s, f))
-    if not data:
-        return 0, 0
-    attempts = int(data.get("attempts", 0))
-    correct = int(data.get("correct", 0))
-    return attempts, correct
+    return stats.by_position.counts(s, f)
 
 
 def _rank_weak_items(items: List[Tuple[str, int, float | None]], top_n: int = 3) -> List[Tuple[str, int, float | None]]:
@@ -82,16 +81,18 @@ class TrainingPlanState:
         if self.cfg.profile == "WEAK_HEATMAP":
             pos: Set[Position] = set()
             thr = max(0.0, min(1.0, float(self.current_heat_threshold)))
-            for s in range(self.num_strings):
-                for f in range(self.max_fret + 1):
-                    attempts, correct = _get_attempts_correct(stats, s, f)
-                    if attempts <= 0:
-                        bad = 1.0
-                    else:
-                        acc = correct / attempts
-                        bad = 1.0 - acc
-                    if bad >= thr:
-                        pos.add((s, f))
+            width = self.max_fret + 1
+            attempts_grid, correct_grid = stats.recent_grid(self.num_strings, self.max_fret)
+            # Same accuracy as _position_weight(): the last few answers where tracked.
+            answered_grid, right_grid = stats.last_outcomes_grid(self.num_strings, self.max_fret)
+            for i, (attempts, correct) in enumerate(zip(attempts_grid, correct_grid)):
+                if attempts <= 0:
+                    bad = 1.0
+                else:
+                    acc = (right_grid[i] / answered_grid[i]) if answered_grid[i] else (correct / attempts)
+                    bad = 1.0 - acc
+                if bad >= thr:
+                    pos.add(divmod(i, width))
             return None, None, pos or None
 
         return None, None, None
@@ -133,13 +134,16 @@ class TrainingPlanState:
         return changed
 
 
-def _position_weight(stats: Stats, s: int, f: int) -> float:
-    attempts, correct = _get_attempts_correct(stats, s, f)
+def _position_weight(stats: Stats, s: int, f: int, confused: float = 0.0) -> float:
+    """confused is the 0..1 confusion weight of the note at (s, f)."""
+    attempts, correct = stats.recent_counts(s, f)
     if attempts <= 0:
         return 5.0
-    acc = correct / attempts
+    # Accuracy over the last few answers here; decayed counts if none are tracked.
+    answered, right = stats.last_outcomes(s, f)
+    acc = (right / answered) if answered else (correct / attempts)
     bad = 1.0 - acc
-    return 1.0 + bad * 4.0 + (1.0 / (attempts + 1)) * 2.0
+    return 1.0 + bad * 4.0 + (1.0 / (attempts + 1)) * 2.0 + confused * 2.0
 
 
 class PracticeSessionFrame(ttk.Frame):
@@ -172,6 +176,8 @@ class PracticeSessionFrame(ttk.Frame):
 
         self.stats = stats
         self.stats_path = stats_path
+        # Persist new attempts every few answers so a crash loses little.
+        self._checkpoint = SessionCheckpoint(lambda: get_stats_writer().request_save(self.stats_path, self.stats))
         self.minutes = int(minutes)
         self.max_fret = int(max_fret)
         self.tuning = list(tuning)
@@ -207,6 +213,18 @@ class PracticeSessionFrame(ttk.Frame):
         self.total = 0
         self.correct = 0
         self.total_time_sec = 0.0
+        self._session = SessionRecorder(
+            PRACTICE,
+            {
+                "minutes": self.minutes,
+                "max_fret": self.max_fret,
+                "tuning_name": self.tuning_name,
+                "num_strings": self.num_strings,
+                "strings": sorted(self.allowed_strings) if self.allowed_strings is not None else None,
+                "frets": sorted(self.allowed_frets) if self.allowed_frets is not None else None,
+                "plan": self.plan_cfg.profile if self.plan_cfg is not None else None,
+            },
+        )
 
         self.session_seconds = self.minutes * 60
         self.end_time = time.monotonic() + self.session_seconds
@@ -313,7 +331,8 @@ class PracticeSessionFrame(ttk.Frame):
 
     def _back(self) -> None:
         self._stop_timer()
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.on_back()
 
     def _stop_timer(self) -> None:
@@ -337,6 +356,7 @@ class PracticeSessionFrame(ttk.Frame):
             self.finish()
             return
         self._update_ui_labels()
+        self._checkpoint.poll()
         self._timer_job = self.after(250, self._tick_timer)
 
     def _format_time(self, seconds: int) -> str:
@@ -420,14 +440,22 @@ class PracticeSessionFrame(ttk.Frame):
             if frets is not None:
                 candidates = [(s, f) for (s, f) in candidates if f in frets]
             if candidates:
-                weights = [_position_weight(self.stats, s, f) for (s, f) in candidates]
+                confused = self.stats.confusion_weights()
+                weights = [
+                    _position_weight(self.stats, s, f, confused[note_index_at(s, f, tuning=self.tuning)])
+                    for (s, f) in candidates
+                ]
                 return self.rng.choices(candidates, weights=weights, k=1)[0]
 
         if strings is None and frets is None:
-            return choose_adaptive_position(self.stats, self.max_fret, self.rng, num_strings=self.num_strings)
+            return choose_adaptive_position(
+                self.stats, self.max_fret, self.rng, num_strings=self.num_strings, tuning=self.tuning
+            )
 
         for _ in range(300):
-            s, f = choose_adaptive_position(self.stats, self.max_fret, self.rng, num_strings=self.num_strings)
+            s, f = choose_adaptive_position(
+                self.stats, self.max_fret, self.rng, num_strings=self.num_strings, tuning=self.tuning
+            )
             if strings is not None and s not in strings:
                 continue
             if frets is not None and f not in frets:
@@ -479,7 +507,16 @@ class PracticeSessionFrame(ttk.Frame):
             self.correct += 1
 
         s, f = self.current_position
-        self.stats.record_position_attempt(correct=is_correct, note_name=self.current_correct_name, string_index=s, fret=f)
+        self.stats.record_position_attempt(
+            correct=is_correct,
+            note_name=self.current_correct_name,
+            string_index=s,
+            fret=f,
+            response_ms=int(dt * 1000),
+            answer=user_answer,
+        )
+        self._checkpoint.record()
+        self._session.record(is_correct, response_ms=int(dt * 1000), position=(s, f))
 
         if self.plan_cfg:
             self._recent.append((time.monotonic(), bool(is_correct)))
@@ -532,13 +569,24 @@ class PracticeSessionFrame(ttk.Frame):
                 items.append((label, attempts_sum, acc))
         return _rank_weak_items(items, top_n=3)
 
+    def _compute_slow_notes(self, top_n: int = 3) -> List[Tuple[str, float]]:
+        items: List[Tuple[str, float]] = []
+        for pc in range(12):
+            name = index_to_name(pc, prefer_flats=self.prefer_flats)
+            ms = self.stats.note_response_quantile(name)
+            if ms is not None:
+                items.append((name, ms / 1000.0))
+        items.sort(key=lambda item: item[1], reverse=True)
+        return items[:top_n]
+
     # -------------------------
     # Finish
     # -------------------------
     def finish(self) -> None:
         self._stop_timer()
         self.fretboard.clear_highlight()
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
 
         self.submit_btn.configure(state="disabled")
         self.answer_entry.configure(state="disabled")
@@ -559,6 +607,11 @@ class PracticeSessionFrame(ttk.Frame):
             avg_time_sec=avg_time,
             weak_strings=self._compute_weak_strings(),
             weak_frets=self._compute_weak_frets(),
+            slow_positions=[
+                (f"String {self.num_strings - s}, fret {f}", ms / 1000.0)
+                for s, f, ms in self.stats.slow_positions(self.num_strings, self.max_fret)
+            ],
+            slow_notes=self._compute_slow_notes(),
         )
 
         if self.on_finish is not None:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import random
+import time
 import tkinter as tk
 from tkinter import ttk
 
 from guitar_trainer.core.adaptive import choose_adaptive_position
+from guitar_trainer.core.checkpoint import SessionCheckpoint
 from guitar_trainer.core.mapping import positions_for_note, note_index_at
 from guitar_trainer.core.notes import index_to_name
 from guitar_trainer.core.quiz import (
@@ -13,11 +15,26 @@ from guitar_trainer.core.quiz import (
     check_note_name_answer,
     check_positions_answer,
 )
-from guitar_trainer.core.stats import Stats, save_stats
+from guitar_trainer.core.session_log import (
+    ADAPTIVE_QUIZ,
+    NOTE_QUIZ,
+    POSITIONS_QUIZ,
+    STRING_QUIZ,
+    SessionRecorder,
+    save_session,
+)
+from guitar_trainer.core.stats import Stats
+from guitar_trainer.core.stats_writer import get_stats_writer
 from guitar_trainer.gui.fretboard import Fretboard, Position
 
 
+def _elapsed_ms(start: float) -> int:
+    return int((time.monotonic() - start) * 1000)
+
+
 class NoteQuizFrame(ttk.Frame):
+    session_kind = NOTE_QUIZ
+
     def __init__(
         self,
         master: tk.Misc,
@@ -36,6 +53,9 @@ class NoteQuizFrame(ttk.Frame):
 
         self.stats = stats
         self.stats_path = stats_path
+        # Persist new attempts every few answers so a crash loses little.
+        self._checkpoint = SessionCheckpoint(lambda: get_stats_writer().request_save(self.stats_path, self.stats))
+        self.question_start_time = time.monotonic()
         self.num_questions = int(num_questions)
         self.max_fret = int(max_fret)
         self.tuning = list(tuning)
@@ -45,6 +65,15 @@ class NoteQuizFrame(ttk.Frame):
 
         self.rng = random.Random(rng_seed) if rng_seed is not None else random.Random()
         self.on_back = on_back
+        self._session = SessionRecorder(
+            self.session_kind,
+            {
+                "num_questions": self.num_questions,
+                "max_fret": self.max_fret,
+                "tuning_name": self.tuning_name,
+                "num_strings": self.num_strings,
+            },
+        )
 
         self.current_index = 0
         self.score = 0
@@ -101,7 +130,8 @@ class NoteQuizFrame(ttk.Frame):
         self._fret_nums_btn.configure(text="Hide fret numbers" if is_showing else "Show fret numbers")
 
     def _back(self) -> None:
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.on_back()
 
     def update_progress(self) -> None:
@@ -113,6 +143,7 @@ class NoteQuizFrame(ttk.Frame):
         return random_position(self.max_fret, tuning=self.tuning, rng=self.rng)
 
     def next_question(self) -> None:
+        self._checkpoint.poll()
         if self.current_index >= self.num_questions:
             self.finish()
             return
@@ -131,6 +162,7 @@ class NoteQuizFrame(ttk.Frame):
         self.answer_var.set("")
         self.feedback.configure(text="", style="Hint.TLabel")
         self.answer_entry.focus_set()
+        self.question_start_time = time.monotonic()
 
     def submit_answer(self) -> None:
         if not self.current_position or not self.current_correct_name:
@@ -140,12 +172,17 @@ class NoteQuizFrame(ttk.Frame):
         correct = check_note_name_answer(self.current_correct_name, user_answer)
 
         s, f = self.current_position
+        response_ms = _elapsed_ms(self.question_start_time)
         self.stats.record_position_attempt(
             correct=correct,
             note_name=self.current_correct_name,
             string_index=s,
             fret=f,
+            response_ms=response_ms,
+            answer=user_answer,
         )
+        self._checkpoint.record()
+        self._session.record(correct, response_ms=response_ms, position=(s, f))
 
         if correct:
             self.score += 1
@@ -158,7 +195,8 @@ class NoteQuizFrame(ttk.Frame):
 
     def finish(self) -> None:
         self.fretboard.clear_single_highlight()
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.progress.configure(text=f"Finished • Score {self.score}/{self.num_questions}")
         self.feedback.configure(text="Statistics saved.", style="Hint.TLabel")
         self.submit_btn.configure(state="disabled")
@@ -166,6 +204,8 @@ class NoteQuizFrame(ttk.Frame):
 
 
 class AdaptiveNoteQuizFrame(NoteQuizFrame):
+    session_kind = ADAPTIVE_QUIZ
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         hint = ttk.Label(self, text="Adaptive: focuses on weak / unseen positions", style="Hint.TLabel")
@@ -173,7 +213,9 @@ class AdaptiveNoteQuizFrame(NoteQuizFrame):
 
     def pick_next_position(self) -> Position:
         # keep original signature used in your project
-        return choose_adaptive_position(self.stats, self.max_fret, self.rng, num_strings=self.num_strings)
+        return choose_adaptive_position(
+            self.stats, self.max_fret, self.rng, num_strings=self.num_strings, tuning=self.tuning
+        )
 
 
 class PositionsQuizFrame(ttk.Frame):
@@ -195,6 +237,9 @@ class PositionsQuizFrame(ttk.Frame):
 
         self.stats = stats
         self.stats_path = stats_path
+        # Persist new attempts every few answers so a crash loses little.
+        self._checkpoint = SessionCheckpoint(lambda: get_stats_writer().request_save(self.stats_path, self.stats))
+        self.question_start_time = time.monotonic()
         self.num_questions = int(num_questions)
         self.max_fret = int(max_fret)
         self.tuning = list(tuning)
@@ -204,6 +249,15 @@ class PositionsQuizFrame(ttk.Frame):
 
         self.rng = random.Random(rng_seed) if rng_seed is not None else random.Random()
         self.on_back = on_back
+        self._session = SessionRecorder(
+            POSITIONS_QUIZ,
+            {
+                "num_questions": self.num_questions,
+                "max_fret": self.max_fret,
+                "tuning_name": self.tuning_name,
+                "num_strings": self.num_strings,
+            },
+        )
 
         self.current_index = 0
         self.score = 0
@@ -256,7 +310,8 @@ class PositionsQuizFrame(ttk.Frame):
         self._fret_nums_btn.configure(text="Hide fret numbers" if is_showing else "Show fret numbers")
 
     def _back(self) -> None:
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.on_back()
 
     def update_progress(self) -> None:
@@ -265,6 +320,7 @@ class PositionsQuizFrame(ttk.Frame):
         )
 
     def next_question(self) -> None:
+        self._checkpoint.poll()
         if self.current_index >= self.num_questions:
             self.finish()
             return
@@ -279,6 +335,7 @@ class PositionsQuizFrame(ttk.Frame):
         self.target_note_index = self.rng.randint(0, 11)
         self.target_note_name = index_to_name(self.target_note_index, prefer_flats=self.prefer_flats)
         self.task.configure(text=f"Click ALL positions for {self.target_note_name} (up to fret {self.max_fret})")
+        self.question_start_time = time.monotonic()
 
     def clear_selection(self) -> None:
         if self.locked:
@@ -304,7 +361,14 @@ class PositionsQuizFrame(ttk.Frame):
             return
 
         correct = check_positions_answer(self.target_note_index, self.max_fret, list(self.selected), tuning=self.tuning)
-        self.stats.record_attempt_mode_b(correct=correct, note_name=self.target_note_name)
+        response_ms = _elapsed_ms(self.question_start_time)
+        self.stats.record_attempt_mode_b(
+            correct=correct,
+            note_name=self.target_note_name,
+            response_ms=response_ms,
+        )
+        self._checkpoint.record()
+        self._session.record(correct, response_ms=response_ms)
 
         correct_positions = set(positions_for_note(self.target_note_index, self.max_fret, tuning=self.tuning))
         self.locked = True
@@ -335,7 +399,8 @@ class PositionsQuizFrame(ttk.Frame):
 
     def finish(self) -> None:
         self.fretboard.clear_all_cell_markers()
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.progress.configure(text=f"Finished • Score {self.score}/{self.num_questions}")
         self.task.configure(text="")
         self.feedback.configure(text="Statistics saved.", style="Hint.TLabel")
@@ -366,6 +431,9 @@ class StringOnStringQuizFrame(ttk.Frame):
 
         self.stats = stats
         self.stats_path = stats_path
+        # Persist new attempts every few answers so a crash loses little.
+        self._checkpoint = SessionCheckpoint(lambda: get_stats_writer().request_save(self.stats_path, self.stats))
+        self.question_start_time = time.monotonic()
         self.num_questions = int(num_questions)
         self.max_fret = int(max_fret)
         self.tuning = list(tuning)
@@ -382,6 +450,16 @@ class StringOnStringQuizFrame(ttk.Frame):
 
         self.rng = random.Random(rng_seed) if rng_seed is not None else random.Random()
         self.on_back = on_back
+        self._session = SessionRecorder(
+            STRING_QUIZ,
+            {
+                "num_questions": self.num_questions,
+                "max_fret": self.max_fret,
+                "tuning_name": self.tuning_name,
+                "num_strings": self.num_strings,
+                "strings": list(self.include_strings),
+            },
+        )
 
         self.current_index = 0
         self.score = 0
@@ -502,10 +580,12 @@ class StringOnStringQuizFrame(ttk.Frame):
             self.next_question()
 
     def _back(self) -> None:
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.on_back()
 
     def reset_progress(self) -> None:
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.current_index = 0
         self.score = 0
         self.locked = False
@@ -530,6 +610,7 @@ class StringOnStringQuizFrame(ttk.Frame):
         self.progress.configure(text=f"{self.score} / {answered} ({pct}%)")
 
     def next_question(self) -> None:
+        self._checkpoint.poll()
         if self.current_index >= self.num_questions:
             self.finish()
             return
@@ -547,6 +628,7 @@ class StringOnStringQuizFrame(ttk.Frame):
         self._update_task_text()
         self.update_progress()
         self.feedback.configure(text="", style="Hint.TLabel")
+        self.question_start_time = time.monotonic()
 
     def on_fretboard_click(self, position: Position) -> None:
         if self.locked or self.target_note_index is None or self.target_string is None or self.target_note_name is None:
@@ -560,13 +642,17 @@ class StringOnStringQuizFrame(ttk.Frame):
         clicked_idx = note_index_at(s, f, tuning=self.tuning)
         correct = clicked_idx == int(self.target_note_index)
 
+        response_ms = _elapsed_ms(self.question_start_time)
         self.stats.record_position_attempt(
             correct=correct,
             note_name=self.target_note_name,
             string_index=s,
             fret=f,
             mode="C",
+            response_ms=response_ms,
         )
+        self._checkpoint.record()
+        self._session.record(correct, response_ms=response_ms, position=(s, f))
 
         self.locked = True
         self.fretboard.clear_all_cell_markers()
@@ -601,7 +687,8 @@ class StringOnStringQuizFrame(ttk.Frame):
     def finish(self) -> None:
         self.fretboard.clear_all_cell_markers()
         self.fretboard.clear_highlighted_string()
-        save_stats(self.stats_path, self.stats)
+        get_stats_writer().request_save(self.stats_path, self.stats)
+        save_session(self.stats_path, self._session, append=get_stats_writer().request_session)
         self.task.configure(text="")
         self.progress.configure(text=f"Finished • Score {self.score}/{self.num_questions}")
         self.feedback.configure(text="Statistics saved.", style="Hint.TLabel")
@@ -5,10 +5,6 @@ from guitar_trainer.core.stats import Stats
 from guitar_trainer.gui.fretboard import Fretboard
 
 
-def _pos_key(s: int, f: int) -> str:
-    return f"{s},{f}"
-
-
 class StatsHeatmapFrame(tk.Frame):
     def __init__(
         self,
@@ -17,6 +13,7 @@ class StatsHeatmapFrame(tk.Frame):
         stats: Stats,
         max_fret: int,
         on_back=None,
+        on_confusions=None,
         title_suffix: str | None = None,
     ) -> None:
         super().__init__(master)
@@ -44,6 +41,8 @@ class StatsHeatmapFrame(tk.Frame):
 
         if self.on_back:
             ttk.Button(header, text="Back", command=self.on_back).pack(side="right")
+        if on_confusions:
+            ttk.Button(header, text="Note confusions…", command=on_confusions).pack(side="right", padx=(0, 8))
 
         info = ttk.Frame(self)
         info.pack(fill="x", pady=(0, 6))
@@ -61,19 +60,17 @@ class StatsHeatmapFrame(tk.Frame):
     def _apply_heatmap(self, *, num_strings: int) -> None:
         values: dict[tuple[int, int], float] = {}
 
-        for s in range(num_strings):
-            for f in range(self.max_fret + 1):
-                data = self.stats.by_position.get(_pos_key(s, f))
-                if not data:
-                    values[(s, f)] = 1.0  # unseen -> highlight
-                    continue
-
-                attempts = int(data.get("attempts", 0))
-                correct = int(data.get("correct", 0))
-                if attempts <= 0:
-                    values[(s, f)] = 1.0
-                else:
-                    acc = correct / attempts
-                    values[(s, f)] = float(1.0 - acc)
+        # Flat row-major board (index s * width + f), scanned in one pass.
+        # Shade by the upper Wilson bound of the recent accuracy, so a cell is
+        # only deep red once the misses are too many to be bad luck (0 of 1
+        # stays light, 0 of 16 does not). Bounds are cached per position.
+        width = self.max_fret + 1
+        attempts_grid, _correct_grid = self.stats.recent_grid(num_strings, self.max_fret)
+        _lower, upper = self.stats.accuracy_bounds_grid(num_strings, self.max_fret)
+        for i, attempts in enumerate(attempts_grid):
+            if attempts <= 0:
+                values[divmod(i, width)] = 1.0  # unseen -> highlight
+            else:
+                values[divmod(i, width)] = 1.0 - upper[i]
 
         self.fretboard.set_heatmap(values)
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from guitar_trainer.core.attempt_history import (
+    AttemptColumns,
+    append_history,
+    decode_history,
+    history_path_for,
+    read_history,
+)
+from guitar_trainer.core.stats import Stats, delete_stats, load_stats, save_stats
+
+
+def test_history_path_matches_profile_kind():
+    assert history_path_for("stats_6__e_standard.json") == "stats_6__e_standard.history"
+    assert history_path_for("stats_6__e_standard.gtstats") == "stats_6__e_standard.gtstats.history"
+
+
+def test_columns_roundtrip_through_blocks(tmp_path):
+    path = str(tmp_path / "stats.json")
+    first = AttemptColumns()
+    first.append(timestamp_ms=1000, mode="A", correct=True, note_name="F#", string_index=1, fret=2, response_ms=850)
+    second = AttemptColumns()
+    second.append(timestamp_ms=2000, mode="B", correct=False, note_name="Bb")
+    append_history(path, first)
+    append_history(path, second)
+
+    rows = list(read_history(path))
+    assert [(r.timestamp_ms, r.string, r.fret, r.note, r.mode, r.correct, r.response_ms) for r in rows] == [
+        (1000, 1, 2, 6, "A", True, 850),
+        (2000, -1, -1, 10, "B", False, 0),
+    ]
+
+
+def test_truncated_last_block_is_ignored(tmp_path):
+    path = str(tmp_path / "stats.json")
+    for ts in (1, 2):
+        cols = AttemptColumns()
+        cols.append(timestamp_ms=ts, mode="A", correct=True, note_name="E")
+        append_history(path, cols)
+
+    with open(history_path_for(path), "rb") as f:
+        data = f.read()
+    assert list(decode_history(data[:-3]).timestamp_ms) == [1]
+
+    with pytest.raises(ValueError):
+        decode_history(b"nope")
+
+
+def test_append_after_a_torn_block_keeps_later_rows(tmp_path):
+    path = str(tmp_path / "stats.json")
+    for ts in (1, 2):
+        cols = AttemptColumns()
+        cols.append(timestamp_ms=ts, mode="A", correct=True, note_name="E", response_ms=700)
+        append_history(path, cols)
+    with open(history_path_for(path), "r+b") as f:
+        f.truncate(os.path.getsize(history_path_for(path)) - 3)  # crash mid-append
+
+    for ts in (3, 4):
+        cols = AttemptColumns()
+        cols.append(timestamp_ms=ts, mode="A", correct=False, note_name="F", response_ms=900)
+        append_history(path, cols)
+
+    history = read_history(path)
+    assert list(history.timestamp_ms) == [1, 3, 4]
+    assert list(history.response_ms) == [700, 900, 900]
+
+
+def test_saves_append_only_new_attempts(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0, response_ms=1200)
+    assert save_stats(path, stats)
+    stats.record_attempt_mode_b(correct=False, note_name="G", response_ms=4000)
+    assert save_stats(path, stats)
+    assert save_stats(path, stats)
+
+    loaded = load_stats(path)
+    loaded.record_position_attempt(correct=False, note_name="A", string_index=1, fret=0, mode="C")
+    assert save_stats(path, loaded)
+
+    history = read_history(path)
+    assert list(history.mode) == [ord("A"), ord("B"), ord("C")]
+    assert list(history.response_ms) == [1200, 4000, 0]
+    assert list(history.correct) == [1, 0, 0]
+    assert history.timestamp_ms[0] <= history.timestamp_ms[-1]
+
+
+def test_rewriting_a_profile_replaces_its_history(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    save_stats(path, stats)
+
+    # A fresh Stats (e.g. a reset) replaces the profile and its history.
+    assert save_stats(path, Stats())
+    assert len(read_history(path)) == 0
+
+    delete_stats(path)
+    assert not os.path.exists(history_path_for(path))
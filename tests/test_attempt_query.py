@@ -0,0 +1,116 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from guitar_trainer.app import main
+from guitar_trainer.core.attempt_history import AttemptColumns
+from guitar_trainer.core.attempt_query import AttemptIndex
+from guitar_trainer.core.session_log import PRACTICE, STRING_QUIZ, SessionRecord, append_session
+from guitar_trainer.core.stats import Stats, save_stats
+
+
+def _columns() -> AttemptColumns:
+    cols = AttemptColumns()
+    t0 = int(datetime(2026, 5, 1, 10, 0).timestamp() * 1000)
+    rows = [
+        # (hours after t0, mode, correct, note, string, fret, response_ms)
+        (0, "A", True, "F#", 5, 2, 800),
+        (1, "A", False, "Gb", 4, 7, 2400),
+        (2, "A", True, "F#", 4, 7, 1200),
+        (30, "C", True, "F#", 5, 6, 0),
+        (50, "B", False, "E", None, None, 3000),
+    ]
+    for h, mode, ok, note, s, f, ms in rows:
+        cols.append(
+            timestamp_ms=t0 + h * 3600 * 1000,
+            mode=mode,
+            correct=ok,
+            note_name=note,
+            string_index=s,
+            fret=f,
+            response_ms=ms,
+        )
+    return cols
+
+
+def test_filters_combine_and_aggregate_latency():
+    index = AttemptIndex(_columns())
+
+    agg = index.attempts(mode="A", strings={4, 5}, frets=range(5, 10), note="F#")
+    assert (agg.attempts, agg.correct) == (2, 1)
+    assert agg.accuracy == 0.5
+    assert agg.mean_response_ms == 1800.0
+    assert agg.p90_response_ms == 2400.0
+
+    assert index.attempts(note="Gb").attempts == 4
+    assert index.attempts().attempts == 5
+    assert index.attempts(note="H").attempts == 0
+    assert index.attempts(mode="c").attempts == 1
+    for mode in ("PRACTICE!", "", "1"):
+        with pytest.raises(ValueError):
+            index.attempts(mode=mode)
+
+
+def test_session_kinds_select_the_rows_of_their_sessions():
+    index = AttemptIndex(_columns())
+    t0 = datetime(2026, 5, 1, 10, 0).timestamp()
+    index.tag_sessions(
+        [
+            SessionRecord(started=t0 - 60, ended=t0 + 1.5 * 3600, mode=PRACTICE),
+            SessionRecord(started=t0 + 29 * 3600, ended=t0 + 31 * 3600, mode=STRING_QUIZ),
+        ]
+    )
+
+    agg = index.attempts(mode="PRACTICE", strings={4, 5}, frets=range(0, 10), note="F#")
+    assert (agg.attempts, agg.correct) == (2, 1)
+    assert index.attempts(mode="string_quiz").attempts == 1
+    assert index.attempts(mode="note_quiz").attempts == 0
+
+
+def test_time_range_and_untimed_attempts():
+    index = AttemptIndex(_columns())
+    since = datetime(2026, 5, 1, 11, 0)
+    until = datetime(2026, 5, 2, 16, 0)
+
+    agg = index.attempts(since=since, until=until)
+    assert agg.attempts == 3
+    # The mode C attempt has no response time.
+    assert agg.timed == 2
+    assert index.attempts(since=since.timestamp() + 3 * 24 * 3600).attempts == 0
+
+
+def test_profile_index_includes_unsaved_attempts(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="A", string_index=0, fret=5, response_ms=900)
+    assert save_stats(path, stats)
+    stats.record_position_attempt(correct=False, note_name="A", string_index=1, fret=0, response_ms=1500)
+
+    index = AttemptIndex.for_profile(path, stats)
+    agg = index.attempts(note="A")
+    assert (agg.attempts, agg.correct, agg.median_response_ms) == (2, 1, 1200.0)
+    assert index.attempts(strings={0}).attempts == 1
+
+    append_session(path, SessionRecord(started=0.0, ended=time.time() + 1, mode=PRACTICE, answered=2))
+    assert AttemptIndex.for_profile(path, stats).attempts(mode="PRACTICE", note="A").attempts == 2
+
+
+def test_query_command_reports_matching_attempts(tmp_path, capsys):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="A", string_index=0, fret=5, response_ms=900)
+    stats.record_position_attempt(correct=False, note_name="Bb", string_index=1, fret=1, response_ms=1500)
+    stats.record_position_attempt(correct=False, note_name="A#", string_index=0, fret=6, response_ms=2100)
+    assert save_stats(path, stats)
+    capsys.readouterr()
+
+    assert main(["query", path, "--note", "A#", "--string", "0,2", "--days", "1"]) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[1].split()[:3] == ["1", "0.0%", "1"]
+
+    assert main(["query", path, "--mode", "practice"]) == 0
+    assert capsys.readouterr().out.strip() == "No matching attempts"
+    assert main(["query", path, "--mode", "??"]) == 1
+    assert main(["query", path, "--fret"]) == 2
+    assert main(["query", str(tmp_path / "nope.json")]) == 1
@@ -0,0 +1,47 @@
+from guitar_trainer.core.checkpoint import SessionCheckpoint
+from guitar_trainer.core.stats import load_stats, save_stats
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_checkpoint_every_n_attempts_or_t_seconds():
+    saves = []
+    clock = _Clock()
+    cp = SessionCheckpoint(lambda: saves.append(clock.now), every_attempts=3, every_sec=10.0, clock=clock)
+
+    assert not cp.record()
+    assert not cp.record()
+    assert cp.record()  # third attempt
+    assert saves == [0.0] and cp.unsaved == 0
+
+    clock.now = 5.0
+    cp.record()
+    clock.now = 14.0
+    assert not cp.poll()  # oldest unsaved attempt is 9 s old
+    clock.now = 15.0
+    assert cp.poll()
+    assert saves == [0.0, 15.0]
+
+    assert not cp.poll()
+    assert not cp.flush()  # nothing new
+
+
+def test_checkpointed_attempts_survive_a_crash(tmp_path):
+    path = str(tmp_path / "stats_6__e_standard.json")
+    stats = load_stats(path, journal=True)
+    cp = SessionCheckpoint(lambda: save_stats(path, stats), every_attempts=5)
+
+    for i in range(12):
+        stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=i % 3)
+        cp.record()
+
+    # "Crash": the last 2 attempts were never checkpointed.
+    recovered = load_stats(path)
+    assert recovered.total_attempts == 10
+    assert sum(recovered.by_position.counts(0, f)[0] for f in range(3)) == 10
@@ -0,0 +1,97 @@
+import os
+import random
+
+import pytest
+
+from guitar_trainer.core.adaptive import choose_adaptive_position
+from guitar_trainer.core.confusion import ConfusionMatrix, append_confusion, confusion_path_for, read_confusion
+from guitar_trainer.core.sidecar_file import append_sidecar, write_sidecar
+from guitar_trainer.core.stats import Stats, load_stats, save_stats, stats_companion_files
+
+
+def test_matrix_counts_and_ranks_confusions():
+    m = ConfusionMatrix()
+    for _ in range(3):
+        m.add(4, 5)  # E answered as F
+    m.add(11, 0)
+    assert m.count(4, 5) == 3 and m.count(5, 4) == 0
+    assert m.most_common(1) == [(4, 5, 3)]
+    weights = m.involvement()
+    assert weights[4] == weights[5] == 1.0
+    assert weights[11] == pytest.approx(1 / 3) and weights[7] == 0.0
+
+
+def test_merge_subtract_and_fixed_size_bytes():
+    a, b = ConfusionMatrix(), ConfusionMatrix()
+    a.add(0, 1)
+    size = len(a.to_bytes())
+    for _ in range(1000):
+        b.add(9, 10)
+    assert len(b.to_bytes()) == size
+
+    merged = a.copy()
+    merged.merge(b)
+    assert len(merged) == 1001
+    merged.subtract(b)
+    assert merged.counts == a.counts
+    assert ConfusionMatrix.from_bytes(b.to_bytes()).counts == b.counts
+    with pytest.raises(ValueError):
+        ConfusionMatrix.from_bytes(b.to_bytes()[:-4])
+
+
+def test_wrong_answers_are_saved_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0, answer="F")
+    stats.record_position_attempt(correct=False, note_name="A#", string_index=0, fret=6, answer="b")
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0, answer="E")
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0, answer="??")
+    stats.record_attempt(mode="A", correct=False, note_name="Bb", answer="B")
+    assert save_stats(path, stats)
+
+    assert read_confusion(path).count(10, 11) == 2
+    loaded = load_stats(path)
+    assert loaded.confusions() == [(10, 11, 2), (4, 5, 1)]
+    assert confusion_path_for(path) in stats_companion_files(path)
+
+
+def test_adaptive_picker_favours_confused_notes():
+    stats = Stats()
+    tuning = [4]  # one string tuned to E: fret 0 = E, fret 1 = F, fret 2 = F#
+    for f in range(3):
+        stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=f)
+    for _ in range(5):
+        stats.record_attempt(mode="A", correct=False, note_name="G#", answer="F#")
+
+    rng = random.Random(1)
+    picks = [choose_adaptive_position(stats, 2, rng, num_strings=1, tuning=tuning) for _ in range(600)]
+    assert picks.count((0, 2)) > 2 * max(picks.count((0, 0)), picks.count((0, 1)))
+
+
+def test_saves_update_the_fixed_size_table_in_place(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_attempt(mode="A", correct=False, note_name="E", answer="F")
+    assert save_stats(path, stats)
+    stats = load_stats(path)
+    size = os.path.getsize(confusion_path_for(path))
+    assert size == len(ConfusionMatrix().to_bytes())
+
+    for _ in range(20):
+        stats.record_attempt(mode="A", correct=False, note_name="E", answer="F")
+        assert save_stats(path, stats)
+    assert os.path.getsize(confusion_path_for(path)) == size
+    assert read_confusion(path).count(4, 5) == 21
+
+
+def test_framed_confusion_files_are_folded_into_the_table(tmp_path):
+    path = str(tmp_path / "stats.json")
+    first, more = ConfusionMatrix(), ConfusionMatrix()
+    first.add(4, 5)
+    more.add(4, 5, 2)
+    write_sidecar(confusion_path_for(path), first)  # the earlier appended-frames layout
+    append_sidecar(confusion_path_for(path), more, ConfusionMatrix, missing=ConfusionMatrix)
+
+    append_confusion(path, more)
+    assert os.path.getsize(confusion_path_for(path)) == len(ConfusionMatrix().to_bytes())
+    assert read_confusion(path).count(4, 5) == 5
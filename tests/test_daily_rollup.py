@@ -0,0 +1,113 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from guitar_trainer.app import main
+from guitar_trainer.core.attempt_history import AttemptColumns, append_history
+from guitar_trainer.core.daily_rollup import DailyRollups, daily_path_for, read_daily, write_daily
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+
+def _ts(day: int) -> float:
+    return datetime(2026, 3, day, 12, 0).timestamp()
+
+
+def test_range_queries_only_cover_requested_days():
+    rollups = DailyRollups()
+    for day in (1, 2, 15, 31):
+        rollups.add(_ts(day), "A", "E", day != 15, 5, 3)
+    rollups.add(_ts(2), "B", "F#", False)
+
+    march_first_half = rollups.total(date(2026, 3, 1), date(2026, 3, 14))
+    assert (march_first_half.attempts, march_first_half.correct) == (3, 2)
+    assert march_first_half.by_mode == {"A": [2, 2], "B": [1, 0]}
+    assert march_first_half.string_counts(5) == (2, 2)
+
+    days = [d for d, _c in rollups.between(date(2026, 3, 2), date(2026, 3, 15))]
+    assert days == [date(2026, 3, 2), date(2026, 3, 15)]
+    assert rollups.total(date(2026, 4, 1)).attempts == 0
+
+
+def test_bytes_roundtrip_and_bad_data():
+    rollups = DailyRollups()
+    rollups.add(_ts(3), "A", "Bb", True, 0, 1)
+    back = DailyRollups.from_bytes(rollups.to_bytes())
+    assert back.total().to_record() == rollups.total().to_record()
+
+    with pytest.raises(ValueError):
+        DailyRollups.from_bytes(b"{}")
+    with pytest.raises(ValueError):
+        DailyRollups.from_bytes(b"\xff")
+
+
+def test_rollups_are_saved_incrementally_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+    stats.record_attempt_mode_b(correct=False, note_name="G")
+    assert save_stats(path, stats)
+
+    today = read_daily(path).total(date.today(), date.today())
+    assert (today.attempts, today.correct) == (2, 1)
+    assert load_stats(path).daily.total().by_mode == {"A": [1, 1], "B": [1, 0]}
+
+
+def test_rollups_are_rebuilt_from_history_for_older_profiles(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats(total_attempts=1, total_correct=1))
+    cols = AttemptColumns()
+    cols.append(timestamp_ms=int(_ts(7) * 1000), mode="A", correct=True, note_name="C#", string_index=2, fret=4)
+    append_history(path, cols)
+    assert not os.path.exists(daily_path_for(path))
+
+    stats = load_stats(path)
+    assert stats.daily.total().by_position == {(2, 4): [1, 1]}
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    assert save_stats(path, stats)
+    assert read_daily(path).total().attempts == 2
+
+
+def test_a_save_only_writes_the_days_it_touched(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = load_stats(path)
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    assert save_stats(path, stats)
+
+    year = read_daily(path)
+    start = datetime(2025, 1, 1, 12, 0)
+    for i in range(365):
+        for s in range(6):
+            year.add((start + timedelta(days=i)).timestamp(), "A", "E", i % 3 != 0, s, i % 13)
+    write_daily(path, year)
+    size = os.path.getsize(daily_path_for(path))
+
+    stats = load_stats(path)
+    stats.record_position_attempt(correct=False, note_name="F", string_index=0, fret=1)
+    assert save_stats(path, stats)
+    assert size < os.path.getsize(daily_path_for(path)) < size + 200
+
+    loaded = load_stats(path).daily
+    assert len(loaded) == 366
+    today = loaded.total(date.today(), date.today())
+    assert (today.attempts, today.correct) == (2, 1)
+
+
+def test_days_command_breaks_recent_days_down_by_string_and_fret(tmp_path, capsys):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="A", string_index=0, fret=5)
+    stats.record_position_attempt(correct=False, note_name="B", string_index=1, fret=0)
+    stats.record_position_attempt(correct=True, note_name="A#", string_index=0, fret=6)
+    assert save_stats(path, stats)
+    capsys.readouterr()
+
+    assert main(["days", path, "-n", "3"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split() == [date.today().isoformat(), "3", "66.7%"]
+    at = [line.startswith("String") for line in lines].index(True)
+    assert [line.split() for line in lines[at + 1 : at + 3]] == [["0", "2", "100.0%"], ["1", "1", "0.0%"]]
+    assert [line.split() for line in lines[-3:]] == [["0", "1", "0.0%"], ["5", "1", "100.0%"], ["6", "1", "100.0%"]]
+
+    assert main(["days", str(tmp_path / "nope.json")]) == 1
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from guitar_trainer.app import main
+from guitar_trainer.core.device_counters import DEVICE_ID_ENV, devices_path_for
+from guitar_trainer.core.stats import Stats, load_stats, merge_stats_files, save_stats
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION
+
+
+def _practice(path, device, monkeypatch, n, *, fret=0):
+    monkeypatch.setenv(DEVICE_ID_ENV, device)
+    stats = load_stats(path)
+    for i in range(n):
+        stats.record_position_attempt(correct=i % 2 == 0, note_name="E", string_index=0, fret=fret)
+    assert save_stats(path, stats)
+
+
+def test_merge_adds_progress_from_two_devices(tmp_path, monkeypatch):
+    laptop = str(tmp_path / "laptop.json")
+    desktop = str(tmp_path / "desktop.json")
+    _practice(laptop, "laptop", monkeypatch, 3)
+    _practice(desktop, "desktop", monkeypatch, 4, fret=1)
+
+    monkeypatch.setenv(DEVICE_ID_ENV, "laptop")
+    merged = merge_stats_files(laptop, [desktop])
+    assert merged.total_attempts == 7
+    assert merged.meta["device_id"] == "laptop"
+    assert list(merged.devices) == ["desktop"]
+    assert "devices" not in merged.meta and os.path.exists(devices_path_for(laptop))
+
+    loaded = load_stats(laptop)
+    assert loaded.total_attempts == 7
+    assert loaded.by_position["0,1"] == {"attempts": 4, "correct": 2}
+
+
+def test_merge_is_idempotent_and_commutative(tmp_path, monkeypatch):
+    a = str(tmp_path / "a.json")
+    b = str(tmp_path / "b.json")
+    _practice(a, "dev-a", monkeypatch, 2)
+    # The profile is copied to device B, which keeps practising.
+    shutil.copy(a, b)
+    _practice(b, "dev-b", monkeypatch, 5, fret=2)
+    _practice(a, "dev-a", monkeypatch, 1)
+
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev-a")
+    ab = merge_stats_files(str(tmp_path / "ab.json"), [a, b, b, a])
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev-b")
+    ba = merge_stats_files(str(tmp_path / "ba.json"), [b, a])
+
+    assert ab.total_attempts == ba.total_attempts == 8
+    assert ab.by_position.to_dict() == ba.by_position.to_dict()
+
+    # Merging the result back in changes nothing.
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev-a")
+    again = merge_stats_files(a, [str(tmp_path / "ab.json"), b])
+    assert again.total_attempts == 8
+
+
+def test_copies_of_a_saved_profile_share_their_base(tmp_path, monkeypatch):
+    dev1 = str(tmp_path / "dev1.json")
+    dev2 = str(tmp_path / "dev2.json")
+    _practice(dev1, "dev1", monkeypatch, 100)
+    shutil.copy(dev1, dev2)
+    _practice(dev1, "dev1", monkeypatch, 10)
+    _practice(dev2, "dev2", monkeypatch, 20, fret=3)
+
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev1")
+    assert main(["merge", dev1, dev2]) == 0
+    merged = load_stats(dev1)
+    assert merged.total_attempts == 130
+    assert merged.by_position["0,3"]["attempts"] == 20
+
+
+def test_copies_of_a_legacy_profile_share_their_base(tmp_path, monkeypatch):
+    # Saved before device ids were stamped: each copy claims the same legacy base.
+    a = str(tmp_path / "a.json")
+    b = str(tmp_path / "b.json")
+    with open(a, "w", encoding="utf-8") as f:
+        json.dump({"schema_version": SCHEMA_VERSION, "total_attempts": 50, "total_correct": 20}, f)
+    shutil.copy(a, b)
+    _practice(a, "dev-a", monkeypatch, 5)
+    _practice(b, "dev-b", monkeypatch, 7)
+
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev-a")
+    assert merge_stats_files(a, [b]).total_attempts == 62
+
+
+def test_devices_kept_in_meta_move_to_their_own_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "stats.json")
+    old = {"n": [4, 3], "pos": {"0,5": [4, 3]}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "schema_version": SCHEMA_VERSION,
+                "total_attempts": 4,
+                "total_correct": 3,
+                "meta": {"device_id": "dev-a", "devices": {"dev-b": old}},
+            },
+            f,
+        )
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev-a")
+    stats = load_stats(path)
+    assert "devices" not in stats.meta and stats.devices["dev-b"].attempts == 4
+    assert save_stats(path, stats)
+
+    loaded = load_stats(path)
+    assert loaded.meta == {"device_id": "dev-a"}
+    assert loaded.devices["dev-b"].to_record() == old
+
+
+def test_merge_into_sqlite_and_missing_source(tmp_path, monkeypatch):
+    monkeypatch.setenv(DEVICE_ID_ENV, "dev")
+    src = str(tmp_path / "stats.json")
+    save_stats(src, Stats(total_attempts=3, total_correct=1))
+    target = str(tmp_path / "stats.sqlite")
+
+    assert main(["merge", target, src]) == 0
+    assert load_stats(target).total_attempts == 3
+    assert main(["merge", target, str(tmp_path / "nope.json")]) == 1
+    assert main(["merge", target]) == 2
+
+    with pytest.raises(FileNotFoundError):
+        merge_stats_files(target, [str(tmp_path / "nope.json")])
@@ -0,0 +1,66 @@
+import json
+
+from guitar_trainer.core.note_counters import NoteCounters, note_key
+from guitar_trainer.core.stats import Stats, load_stats, save_stats, upgrade_stats_file
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION
+
+
+def test_enharmonic_names_share_a_bucket():
+    stats = Stats()
+    stats.record_attempt(mode="A", correct=True, note_name="C#")
+    stats.record_attempt(mode="A", correct=False, note_name="Db")
+    stats.record_attempt(mode="A", correct=True, note_name="not a note")
+
+    assert stats.total_attempts == 3
+    assert list(stats.by_note) == ["C#"]
+    assert stats.by_note["Db"] == {"attempts": 2, "correct": 1}
+    assert stats.by_note.counts(1) == (2, 1)
+    assert stats.by_note.named(prefer_flats=True) == {"Db": {"attempts": 2, "correct": 1}}
+    assert stats.pending_delta().by_note == {"C#": [2, 1]}
+
+
+def test_from_dict_folds_and_skips_bad_keys():
+    counters = NoteCounters.from_dict(
+        {"A#": {"attempts": 1, "correct": 1}, "bb": {"attempts": 2}, "H": {"attempts": 9}, "E": "junk"}
+    )
+    assert counters.to_dict() == {"A#": {"attempts": 3, "correct": 1}}
+    assert note_key("gb") == "F#"
+    assert note_key(3) is None
+
+
+def test_v2_files_are_migrated_on_load_and_by_upgrade(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text(
+        json.dumps(
+            {
+                "schema_version": 2,
+                "total_attempts": 3,
+                "total_correct": 2,
+                "meta": {},
+                "by_mode": {"A": {"attempts": 3, "correct": 2}, "B": {"attempts": 0, "correct": 0}},
+                "by_note": {"G#": {"attempts": 1, "correct": 1}, "Ab": {"attempts": 2, "correct": 1}},
+                "by_position": {},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    stats = load_stats(str(path))
+    assert stats.by_note.to_dict() == {"G#": {"attempts": 3, "correct": 2}}
+    assert json.loads(path.read_text(encoding="utf-8"))["schema_version"] == 2
+
+    assert upgrade_stats_file(str(path))
+    on_disk = json.loads(path.read_text(encoding="utf-8"))
+    assert on_disk["schema_version"] == SCHEMA_VERSION
+    assert on_disk["by_note"] == {"G#": {"attempts": 3, "correct": 2}}
+
+
+def test_binary_and_delta_saves_keep_pitch_classes(tmp_path):
+    path = str(tmp_path / "stats.gtstats")
+    stats = Stats()
+    stats.record_attempt(mode="A", correct=True, note_name="Eb")
+    assert save_stats(path, stats)
+    stats.record_attempt(mode="A", correct=True, note_name="D#")
+    assert save_stats(path, stats)
+
+    assert load_stats(path).by_note.to_dict() == {"D#": {"attempts": 2, "correct": 2}}
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from guitar_trainer.core.attempt_history import AttemptColumns, append_history
+from guitar_trainer.core.outcome_bits import OUTCOME_BITS, OutcomeBits, outcomes_path_for, read_outcomes
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+
+def test_register_keeps_only_the_last_answers():
+    bits = OutcomeBits()
+    assert bits.recent(0, 0) == (0, 0)
+    for _ in range(OUTCOME_BITS):
+        bits.add(0, 0, False)
+    for _ in range(5):
+        bits.add(0, 0, True)
+    assert bits.recent(0, 0) == (OUTCOME_BITS, 5)
+    bits.add(1, 3, True)
+    assert bits.recent(1, 3) == (1, 1)
+
+    answers, correct = bits.grid(2, 3)
+    assert (answers[0], correct[0]) == (OUTCOME_BITS, 5)
+    assert (answers[1 * 4 + 3], correct[1 * 4 + 3]) == (1, 1)
+
+
+def test_merge_and_subtract_compose_like_one_register():
+    whole = OutcomeBits()
+    older, newer = OutcomeBits(), OutcomeBits()
+    pattern = [True, False, True, True, False] * 5
+    for i, ok in enumerate(pattern):
+        whole.add(2, 7, ok)
+        (older if i < 11 else newer).add(2, 7, ok)
+
+    merged = older.copy()
+    merged.merge(newer)
+    assert merged.cells == whole.cells
+
+    pending = whole.copy()
+    pending.subtract(older)
+    assert pending.cells == newer.cells
+    pending.subtract(newer)
+    assert len(pending) == 0
+
+
+def test_bytes_roundtrip_and_bad_data():
+    bits = OutcomeBits()
+    for ok in (True, False, True):
+        bits.add(5, 12, ok)
+    assert OutcomeBits.from_bytes(bits.to_bytes()).cells == bits.cells
+    with pytest.raises(ValueError):
+        OutcomeBits.from_bytes(b"GTOB")
+    with pytest.raises(ValueError):
+        OutcomeBits.from_bytes(bits.to_bytes()[:-1])
+
+
+def test_registers_are_saved_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+
+    assert read_outcomes(path).recent(0, 0) == (2, 1)
+    assert load_stats(path).last_outcomes(0, 0) == (2, 1)
+
+
+def test_registers_are_rebuilt_from_history_for_older_profiles(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats(total_attempts=2, total_correct=1))
+    cols = AttemptColumns()
+    for ok in (True, False):
+        cols.append(timestamp_ms=1_700_000_000_000, mode="A", correct=ok, note_name="A", string_index=1, fret=0)
+    append_history(path, cols)
+    os.remove(outcomes_path_for(path))  # as written before the registers existed
+
+    stats = load_stats(path)
+    assert stats.last_outcomes(1, 0) == (2, 1)
+    stats.record_position_attempt(correct=True, note_name="A", string_index=1, fret=0)
+    assert save_stats(path, stats)
+    assert read_outcomes(path).recent(1, 0) == (3, 2)
+
+
+def test_a_save_appends_only_the_touched_registers(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    for s in range(6):
+        for f in range(13):
+            stats.record_position_attempt(correct=True, note_name="E", string_index=s, fret=f)
+    assert save_stats(path, stats)
+    stats = load_stats(path)
+    size = os.path.getsize(outcomes_path_for(path))
+
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+    assert size < os.path.getsize(outcomes_path_for(path)) < size + 64
+    assert read_outcomes(path).recent(0, 0) == (2, 1)
@@ -0,0 +1,67 @@
+from guitar_trainer.app import main
+from guitar_trainer.core import pitch_report as pitch_mod
+from guitar_trainer.core.pitch_report import pitch_report, profile_tuning
+from guitar_trainer.core.stats import Stats, list_stats_profiles, save_stats
+from guitar_trainer.core.stats_index import index_is_fresh
+
+
+def _save(path, meta, positions):
+    stats = Stats(meta=meta)
+    for s, f, ok in positions:
+        stats.record_position_attempt(correct=ok, note_name="?", string_index=s, fret=f)
+    save_stats(str(path), stats)
+
+
+def test_positions_fold_onto_pitch_classes_across_tunings(tmp_path, capsys):
+    # F# is fret 2 on the low string in E Standard and fret 4 in Drop D.
+    _save(tmp_path / "stats_6__e_standard.json", {"num_strings": 6, "tuning_name": "E Standard"}, [(0, 2, True)])
+    _save(
+        tmp_path / "stats_6__drop_d.json",
+        {"num_strings": 6, "tuning_name": "Drop D", "tuning": [2, 9, 2, 7, 11, 4]},
+        [(0, 4, False), (2, 0, True)],
+    )
+    _save(tmp_path / "stats_6__custom.json", {"num_strings": 6, "tuning_name": "Custom..."}, [(0, 0, True)])
+
+    report = pitch_report(str(tmp_path), jobs=2)
+    assert len(report.profiles) == 2
+    assert [p.endswith("custom.json") for p in report.skipped] == [True]
+    assert report.by_note["F#"] == {"attempts": 2, "correct": 1}
+    assert report.by_string_pitch["D"] == {"attempts": 2, "correct": 1}
+    assert report.by_string_pitch["E"] == {"attempts": 1, "correct": 1}
+
+    assert main(["notes", str(tmp_path)]) == 0
+    assert "F#" in capsys.readouterr().out
+
+
+def test_unchanged_profiles_come_from_the_cache(tmp_path, monkeypatch):
+    path = tmp_path / "stats_6__e_standard.json"
+    _save(path, {"num_strings": 6, "tuning_name": "E Standard"}, [(1, 0, True)])
+    assert pitch_report(str(tmp_path), jobs=1).by_note["A"]["attempts"] == 1
+    assert (tmp_path / pitch_mod.CACHE_NAME).exists()
+
+    calls = []
+    real = pitch_mod._profile_partial
+    monkeypatch.setattr(pitch_mod, "_profile_partial", lambda p: calls.append(p) or real(p))
+    assert pitch_report(str(tmp_path), jobs=1).by_note["A"]["attempts"] == 1
+    assert calls == []
+
+    _save(path, {"num_strings": 6, "tuning_name": "E Standard"}, [(1, 0, True), (1, 0, True)])
+    assert pitch_report(str(tmp_path), jobs=1).by_note["A"]["attempts"] == 2
+    assert len(calls) == 1
+
+
+def test_cache_file_keeps_the_stats_index_fresh(tmp_path):
+    _save(tmp_path / "stats_6__e_standard.json", {"num_strings": 6, "tuning_name": "E Standard"}, [(1, 0, True)])
+    list_stats_profiles(str(tmp_path))
+    assert index_is_fresh(str(tmp_path))
+    pitch_report(str(tmp_path), jobs=1)
+    assert index_is_fresh(str(tmp_path))
+
+    (tmp_path / pitch_mod.CACHE_NAME).write_text("{not json", encoding="utf-8")
+    assert pitch_report(str(tmp_path), jobs=1).by_note["A"]["attempts"] == 1
+
+
+def test_profile_tuning_prefers_stored_tuning():
+    assert profile_tuning({"tuning": [4, 9, 2, 7, 11, 16]}) == [4, 9, 2, 7, 11, 4]
+    assert profile_tuning({"num_strings": 7, "tuning_name": "Drop A"}) == [9, 4, 9, 2, 7, 11, 4]
+    assert profile_tuning({"num_strings": 6, "tuning_name": "Nope"}) is None
@@ -0,0 +1,52 @@
+import pytest
+
+from guitar_trainer.core.position_counters import PositionCounters
+from guitar_trainer.core.stats import Stats
+
+
+def test_add_and_counts_grow_on_demand():
+    pc = PositionCounters()
+    pc.add(0, 0, True)
+    pc.add(11, 24, False)
+
+    assert pc.counts(0, 0) == (1, 1)
+    assert pc.counts(11, 24) == (1, 0)
+    assert pc.counts(3, 3) == (0, 0)
+    assert pc.counts(40, 0) == (0, 0)
+
+
+def test_mapping_view_matches_legacy_dict():
+    legacy = {"0,0": {"attempts": 2, "correct": 1}, "5,12": {"attempts": 3, "correct": 3}, "bad": {}}
+    pc = PositionCounters.from_dict(legacy)
+
+    assert dict(pc) == {"0,0": {"attempts": 2, "correct": 1}, "5,12": {"attempts": 3, "correct": 3}}
+    assert pc.get("1,1") is None
+    assert "5,12" in pc and "1,1" not in pc
+    assert len(pc) == 2
+
+    # Reads are copies; whole-bucket assignment writes through.
+    pc["0,0"]["attempts"] = 99
+    assert pc.counts(0, 0) == (2, 1)
+    pc["0,0"] = {"attempts": 4, "correct": 2}
+    assert pc.counts(0, 0) == (4, 2)
+
+    del pc["0,0"]
+    with pytest.raises(KeyError):
+        pc["0,0"]
+
+
+def test_grid_is_row_major_and_zero_padded():
+    pc = PositionCounters()
+    pc.add(1, 2, True)
+
+    attempts, correct = pc.grid(2, 3)
+    assert len(attempts) == 8
+    assert attempts[1 * 4 + 2] == 1
+    assert correct[1 * 4 + 2] == 1
+    assert sum(attempts) == 1
+
+
+def test_stats_accepts_plain_dict_positions():
+    stats = Stats(by_position={"2,3": {"attempts": 1, "correct": 0}})
+    assert isinstance(stats.by_position, PositionCounters)
+    assert stats.by_position.counts(2, 3) == (1, 0)
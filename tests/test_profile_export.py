@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from guitar_trainer.app import main
+from guitar_trainer.core.attempt_history import read_history
+from guitar_trainer.core.device_counters import DEVICE_ID_ENV
+from guitar_trainer.core.profile_export import ATTEMPTS_CSV, import_profile
+from guitar_trainer.core.recency import read_recency
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+
+def _profile(tmp_path) -> str:
+    path = str(tmp_path / "stats_6__e_standard.json")
+    stats = Stats(meta={"num_strings": 6, "tuning_name": "E Standard"})
+    stats.record_position_attempt(correct=True, note_name="F#", string_index=0, fret=2, response_ms=700)
+    save_stats(path, stats)
+    stats.record_position_attempt(correct=False, note_name="C", string_index=1, fret=1, mode="C")
+    stats.record_attempt_mode_b(correct=True, note_name="Bb")
+    save_stats(path, stats)
+    return path
+
+
+@pytest.mark.parametrize("out_name", ["export", "profile.gtexport"])
+def test_export_import_roundtrip(tmp_path, out_name, monkeypatch):
+    monkeypatch.setenv(DEVICE_ID_ENV, "laptop")
+    src = _profile(tmp_path)
+    monkeypatch.setenv(DEVICE_ID_ENV, "desktop")  # takes the profile over from the laptop
+    stats = load_stats(src)
+    for _ in range(7):
+        stats.record_attempt(mode="A", correct=False, note_name="F", answer="E")
+    save_stats(src, stats)
+    out = str(tmp_path / out_name)
+    dst = str(tmp_path / "copy" / "stats.json")
+    os.makedirs(os.path.dirname(dst))
+
+    assert main(["export", src, out]) == 0
+    assert main(["import", out, dst]) == 0
+
+    a, b = load_stats(src), load_stats(dst)
+    assert (b.total_attempts, b.total_correct) == (a.total_attempts, a.total_correct)
+    assert b.by_mode == a.by_mode
+    assert b.by_note == a.by_note
+    assert b.by_position.to_dict() == a.by_position.to_dict()
+    assert b.meta == a.meta
+    assert list(read_history(dst)) == list(read_history(src))
+    assert read_recency(dst).accuracy(0, 2) == pytest.approx(1.0)
+    assert b.confusions() == a.confusions() == [(5, 4, 7)]
+    assert {k: v.to_record() for k, v in b.devices.items()} == {k: v.to_record() for k, v in a.devices.items()}
+    assert b.devices["laptop"].attempts == 3
+
+    # Importing over an existing profile needs --force.
+    assert main(["import", out, dst]) == 1
+    assert main(["import", out, dst, "--force"]) == 0
+
+
+def test_csv_attempts_are_streamed_in_blocks(tmp_path, monkeypatch):
+    src = _profile(tmp_path)
+    out = str(tmp_path / "export")
+    assert main(["export", src, out]) == 0
+    with open(os.path.join(out, ATTEMPTS_CSV), encoding="utf-8") as f:
+        assert f.readline().strip() == "timestamp_ms,mode,correct,note,string,fret,response_ms"
+
+    monkeypatch.setattr("guitar_trainer.core.profile_export.IMPORT_BLOCK_ROWS", 1)
+    dst = str(tmp_path / "dst.json")
+    import_profile(out, dst)
+    with open(dst.replace(".json", ".history"), "rb") as f:
+        assert f.read().count(b"BLK\x00") == 3
+
+
+def test_import_rejects_other_files(tmp_path):
+    bad = tmp_path / "bad.gtexport"
+    bad.write_bytes(b"nope, not an export")
+    assert main(["import", str(bad), str(tmp_path / "stats.json")]) == 1
+    assert main(["export", str(tmp_path / "missing.json"), str(tmp_path / "out")]) == 1
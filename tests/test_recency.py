@@ -0,0 +1,94 @@
+import random
+import time
+
+import pytest
+
+from guitar_trainer.core.adaptive import choose_adaptive_position
+from guitar_trainer.core.recency import HALF_LIFE_SEC, RecencyCounters, read_recency, recency_path_for
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+
+def test_recency_path_matches_profile_kind():
+    assert recency_path_for("stats_6__e_standard.json") == "stats_6__e_standard.recency"
+    assert recency_path_for("stats_6__e_standard.gtstats") == "stats_6__e_standard.gtstats.recency"
+
+
+def test_mass_halves_after_half_life_and_accuracy_tracks_recent_results():
+    rec = RecencyCounters()
+    for _ in range(10):
+        rec.add(0, 3, True, now=0.0)
+    assert rec.mass(0, 3, now=HALF_LIFE_SEC) == pytest.approx(5.0)
+
+    # A month later a couple of misses outweigh the old streak.
+    rec.add(0, 3, False, now=4 * HALF_LIFE_SEC)
+    rec.add(0, 3, False, now=4 * HALF_LIFE_SEC)
+    assert rec.accuracy(0, 3) == pytest.approx(0.625 / 2.625)
+    assert rec.accuracy(1, 1) is None
+
+
+def test_merge_and_subtract_are_inverse():
+    base = RecencyCounters()
+    base.add(0, 0, True, now=100.0)
+    inc = RecencyCounters()
+    inc.add(0, 0, False, now=200.0)
+    inc.add(2, 5, True, now=200.0)
+
+    merged = base.copy()
+    merged.merge(inc)
+    merged.subtract(inc)
+    assert set(merged) == {(0, 0)}
+    assert merged.mass(0, 0, now=300.0) == pytest.approx(base.mass(0, 0, now=300.0))
+    assert merged.accuracy(0, 0) == pytest.approx(1.0)
+
+
+def test_bytes_roundtrip_and_bad_data():
+    rec = RecencyCounters(half_life_sec=60.0)
+    rec.add(1, 2, True, now=10.0)
+    rec.add(6, 24, False, now=20.0)
+    back = RecencyCounters.from_bytes(rec.to_bytes())
+    assert back.half_life_sec == 60.0
+    assert back.cells == rec.cells
+
+    with pytest.raises(ValueError):
+        RecencyCounters.from_bytes(b"nope")
+    with pytest.raises(ValueError):
+        RecencyCounters.from_bytes(rec.to_bytes()[:-1])
+
+
+def test_recency_persists_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    stats.record_position_attempt(mode="A", correct=True, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+    stats.record_position_attempt(mode="A", correct=False, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, stats)
+
+    on_disk = read_recency(path)
+    assert on_disk.accuracy(0, 0) == pytest.approx(0.5, abs=1e-6)
+    loaded = load_stats(path)
+    assert loaded.recency.accuracy(0, 0) == pytest.approx(0.5, abs=1e-6)
+
+
+def test_recent_counts_fall_back_to_lifetime_counts():
+    stats = Stats()
+    stats.by_position["1,1"] = {"attempts": 4, "correct": 3}
+    assert stats.recent_counts(1, 1) == (4.0, 3.0)
+
+    attempts, correct = stats.recent_grid(2, 1)
+    assert list(attempts) == [0.0, 0.0, 0.0, 4.0]
+    assert list(correct) == [0.0, 0.0, 0.0, 3.0]
+
+
+def test_adaptive_picker_favours_recently_missed_positions():
+    stats = Stats()
+    stats.by_position["0,0"] = {"attempts": 100, "correct": 95}
+    stats.by_position["0,1"] = {"attempts": 100, "correct": 95}
+    # Both spots have the same lifetime record, but 0,1 was just missed.
+    now = time.time()
+    stats.recency.add(0, 0, True, now=now)
+    for _ in range(3):
+        stats.recency.add(0, 1, False, now=now)
+
+    rng = random.Random(0)
+    picks = [choose_adaptive_position(stats, max_fret=1, rng=rng, num_strings=1) for _ in range(500)]
+    assert picks.count((0, 1)) > 2 * picks.count((0, 0))
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from guitar_trainer.core.attempt_history import AttemptColumns, append_history
+from guitar_trainer.core.response_sketch import (
+    SKETCH_BUCKETS,
+    ResponseTimes,
+    bucket_of,
+    read_response_times,
+    response_path_for,
+)
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+
+
+def test_quantiles_are_within_one_bucket():
+    times = ResponseTimes()
+    for ms in range(500, 5500, 10):
+        times.add(ms, 2, 5, 4)
+    median = times.position_quantile(2, 5)
+    assert median == pytest.approx(3000, rel=0.2)
+    assert times.position_quantile(2, 5, 0.9) == pytest.approx(5000, rel=0.2)
+    assert times.note_quantile(4) == median
+    assert times.position_count(2, 5) == 500
+    assert times.position_quantile(0, 0) is None
+
+
+def test_size_does_not_grow_with_answers():
+    times = ResponseTimes()
+    for ms in (50, 120, 999_999):
+        times.add(ms, 0, 0, None)
+    assert bucket_of(50) == 0 and bucket_of(999_999) == SKETCH_BUCKETS - 1
+    size = len(times.to_bytes())
+    for _ in range(1000):
+        times.add(700, 0, 0, None)
+    assert len(times.to_bytes()) == size
+
+
+def test_merge_subtract_and_bytes_roundtrip():
+    a, b = ResponseTimes(), ResponseTimes()
+    a.add(800, 1, 1, 0)
+    b.add(1600, 1, 1, 0)
+    b.add(400, 3, 2, None)
+    merged = a.copy()
+    merged.merge(b)
+    assert merged.position_count(1, 1) == 2
+    merged.subtract(b)
+    assert merged.positions == a.positions and merged.notes == a.notes
+
+    back = ResponseTimes.from_bytes(merged.to_bytes())
+    assert back.positions == merged.positions and back.notes == merged.notes
+    with pytest.raises(ValueError):
+        ResponseTimes.from_bytes(merged.to_bytes()[:-2])
+
+
+def test_correct_answer_times_are_saved_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    for ms, ok in ((4000, True), (4200, True), (3900, True), (900, False)):
+        stats.record_position_attempt(correct=ok, note_name="Bb", string_index=1, fret=1, response_ms=ms)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0, response_ms=600)
+    assert save_stats(path, stats)
+
+    loaded = load_stats(path)
+    assert loaded.response_times.position_count(1, 1) == 3
+    assert loaded.note_response_quantile("A#") == pytest.approx(4000, rel=0.2)
+    assert [(s, f) for s, f, _ms in loaded.slow_positions(6, 12, min_answers=1)] == [(1, 1), (0, 0)]
+    assert loaded.slow_positions(6, 12) == [(1, 1, loaded.response_quantile(1, 1))]
+
+
+def test_times_are_rebuilt_from_history_for_older_profiles(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats(total_attempts=1, total_correct=1))
+    cols = AttemptColumns()
+    cols.append(timestamp_ms=1_700_000_000_000, mode="B", correct=True, note_name="G", response_ms=2500)
+    append_history(path, cols)
+    os.remove(response_path_for(path))
+
+    assert load_stats(path).note_response_quantile("G") == pytest.approx(2500, rel=0.2)
+    assert read_response_times(path) is None
+
+
+def test_a_save_appends_only_the_new_counts(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = Stats()
+    for s in range(6):
+        for f in range(13):
+            stats.record_position_attempt(correct=True, note_name="E", string_index=s, fret=f, response_ms=900)
+    assert save_stats(path, stats)
+    stats = load_stats(path)
+    size = os.path.getsize(response_path_for(path))
+
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0, response_ms=5000)
+    assert save_stats(path, stats)
+    # One position and one note histogram, not the whole file.
+    assert size < os.path.getsize(response_path_for(path)) < size + 2 * 4 * SKETCH_BUCKETS + 64
+    assert read_response_times(path).position_count(0, 0) == 2
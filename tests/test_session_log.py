@@ -0,0 +1,98 @@
+import os
+
+from guitar_trainer.app import main
+from guitar_trainer.core import session_log
+from guitar_trainer.core.session_log import (
+    PRACTICE,
+    SessionRecorder,
+    append_session,
+    read_sessions,
+    save_session,
+    sessions_path_for,
+)
+from guitar_trainer.core.stats import Stats, delete_stats, save_stats
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_recorder_aggregates_answers():
+    clock = _Clock()
+    rec = SessionRecorder(PRACTICE, {"minutes": 5}, clock=clock)
+    for i, ms in enumerate((400, 800, 1200, 1600, 2000)):
+        rec.record(i % 2 == 0, response_ms=ms, position=(i % 2, 3))
+    rec.record(False)  # untimed, no position
+    clock.now += 90
+
+    record = rec.finish()
+    assert (record.answered, record.correct) == (6, 3)
+    assert record.duration_sec == 90
+    assert record.avg_ms == 1200 and record.p50_ms == 1200 and record.p90_ms == 2000
+    assert record.positions == ((0, 3), (1, 3))
+    assert record.settings == {"minutes": 5}
+
+
+def test_sessions_append_and_tail_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_log, "_TAIL_CHUNK", 64)
+    path = str(tmp_path / "stats.json")
+    assert read_sessions(path) == []
+
+    clock = _Clock()
+    rec = SessionRecorder("note_quiz", clock=clock)
+    for n in range(1, 31):
+        for _ in range(n):
+            rec.record(True, response_ms=500)
+        assert save_session(path, rec).answered == n
+        assert rec.answered == 0
+
+    last = read_sessions(path, 3)
+    assert [r.answered for r in last] == [28, 29, 30]
+    assert len(read_sessions(path)) == 30
+    assert read_sessions(path, 0) == []
+
+
+def test_empty_sessions_are_not_stored_and_torn_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "stats.json")
+    assert save_session(path, SessionRecorder("note_quiz")) is None
+    assert not os.path.exists(sessions_path_for(path))
+
+    rec = SessionRecorder("positions_quiz")
+    rec.record(True)
+    append_session(path, rec.finish())
+    with open(sessions_path_for(path), "ab") as f:
+        f.write(b'{"start": 1, "end"')
+    assert [r.mode for r in read_sessions(path, 5)] == ["positions_quiz"]
+
+    # The next session replaces the torn line instead of being joined to it.
+    rec = SessionRecorder(PRACTICE)
+    rec.record(False)
+    append_session(path, rec.finish())
+    assert [r.mode for r in read_sessions(path)] == ["positions_quiz", PRACTICE]
+
+
+def test_session_table_is_deleted_with_the_profile(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats())
+    rec = SessionRecorder(PRACTICE)
+    rec.record(True, position=(0, 0))
+    save_session(path, rec)
+
+    delete_stats(path)
+    assert not os.path.exists(sessions_path_for(path))
+
+
+def test_sessions_command_lists_last_sessions(tmp_path, capsys):
+    path = str(tmp_path / "stats.json")
+    rec = SessionRecorder(PRACTICE)
+    rec.record(True, response_ms=700, position=(2, 5))
+    save_session(path, rec)
+
+    assert main(["sessions", path, "-n", "5"]) == 0
+    out = capsys.readouterr().out
+    assert "practice" in out and "100.0%" in out
+    assert main(["sessions"]) == 2
@@ -0,0 +1,88 @@
+import os
+
+from guitar_trainer.core import sidecar_file
+from guitar_trainer.core.recency import RecencyCounters
+from guitar_trainer.core.sidecar_file import append_sidecar, read_sidecar, write_sidecar
+
+
+def _counters(*cells):
+    out = RecencyCounters()
+    for s, f, ok in cells:
+        out.add(s, f, ok, now=1000.0)
+    return out
+
+
+def test_appends_only_write_the_increment(tmp_path):
+    path = str(tmp_path / "x.recency")
+    write_sidecar(path, _counters(*[(s, f, True) for s in range(6) for f in range(13)]))
+    size = os.path.getsize(path)
+
+    append_sidecar(path, _counters((0, 0, False)), RecencyCounters, missing=RecencyCounters)
+    assert size < os.path.getsize(path) < size + 64
+
+    back = read_sidecar(path, RecencyCounters)
+    assert back.mass(0, 0, now=1000.0) == 2.0 and back.accuracy(0, 0) == 0.5
+    assert len(back) == 78
+
+
+def test_missing_and_legacy_files_are_rewritten(tmp_path):
+    path = str(tmp_path / "x.recency")
+    append_sidecar(path, _counters((1, 1, True)), RecencyCounters, missing=lambda: _counters((2, 2, True)))
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(1, 1), (2, 2)]
+
+    with open(path, "wb") as f:  # as written before frames existed
+        f.write(_counters((3, 3, True)).to_bytes())
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(3, 3)]
+    append_sidecar(path, _counters((4, 4, True)), RecencyCounters, missing=RecencyCounters)
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(3, 3), (4, 4)]
+
+
+def test_increments_are_folded_once_they_outweigh_the_first_frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(sidecar_file, "FOLD_MIN_BYTES", 0)
+    path = str(tmp_path / "x.recency")
+    write_sidecar(path, _counters((0, 0, True)))
+    single = os.path.getsize(path)
+
+    append_sidecar(path, _counters((0, 0, True)), RecencyCounters, missing=RecencyCounters)
+    grown = os.path.getsize(path)
+    assert grown > single
+    append_sidecar(path, _counters((0, 0, True)), RecencyCounters, missing=RecencyCounters)
+    assert os.path.getsize(path) == single
+    assert read_sidecar(path, RecencyCounters).mass(0, 0, now=1000.0) == 3.0
+
+
+def test_torn_last_frame_is_ignored(tmp_path):
+    path = str(tmp_path / "x.recency")
+    write_sidecar(path, _counters((0, 0, True)))
+    append_sidecar(path, _counters((0, 1, True)), RecencyCounters, missing=RecencyCounters)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(0, 0)]
+
+
+def test_appends_after_a_crash_replace_the_torn_frame(tmp_path):
+    path = str(tmp_path / "x.recency")
+    write_sidecar(path, _counters((0, 0, True)))
+    append_sidecar(path, _counters((0, 1, True)), RecencyCounters, missing=RecencyCounters)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)  # crash mid-append
+
+    for cell in ((5, 5, True), (6, 6, False)):
+        append_sidecar(path, _counters(cell), RecencyCounters, missing=RecencyCounters)
+    back = read_sidecar(path, RecencyCounters)
+    assert sorted(back) == [(0, 0), (5, 5), (6, 6)]
+    assert back.mass(6, 6, now=1000.0) == 1.0 and back.accuracy(6, 6) == 0.0
+
+
+def test_a_last_frame_failing_its_checksum_is_dropped(tmp_path):
+    path = str(tmp_path / "x.recency")
+    write_sidecar(path, _counters((0, 0, True)))
+    append_sidecar(path, _counters((0, 1, True)), RecencyCounters, missing=RecencyCounters)
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"\xff\xff")  # full length, garbage content
+    sidecar_file._appended.clear()  # the app restarts after the crash
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(0, 0)]
+
+    append_sidecar(path, _counters((2, 2, True)), RecencyCounters, missing=RecencyCounters)
+    assert sorted(read_sidecar(path, RecencyCounters)) == [(0, 0), (2, 2)]
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from guitar_trainer.core.stats import Stats, compact_stats, load_stats, save_stats, stats_file_suffix
+from guitar_trainer.core.stats_binary import MAGIC, decode_stats, encode_stats
+
+
+def _full_board_stats(num_strings: int = 12, max_fret: int = 24) -> Stats:
+    stats = Stats(meta={"num_strings": num_strings, "tuning_name": "Custom", "tuning": list(range(40, 40 + num_strings))})
+    for s in range(num_strings):
+        for f in range(max_fret + 1):
+            stats.record_position_attempt(correct=(s + f) % 3 != 0, note_name="C#", string_index=s, fret=f)
+    stats.record_attempt_mode_b(correct=True, note_name="Gb")
+    return stats
+
+
+def test_binary_round_trip_matches_json(tmp_path):
+    stats = _full_board_stats()
+    bin_path = str(tmp_path / "stats_12__custom.gtstats")
+    json_path = str(tmp_path / "stats_12__custom.json")
+    assert save_stats(bin_path, stats)
+    assert save_stats(json_path, stats)
+
+    with open(bin_path, "rb") as f:
+        assert f.read(4) == MAGIC
+
+    a = load_stats(bin_path)
+    b = load_stats(json_path)
+    assert a.total_attempts == b.total_attempts == 12 * 25 + 1
+    assert a.by_mode == b.by_mode
+    assert a.by_note == b.by_note
+    assert a.by_position.to_dict() == b.by_position.to_dict()
+    assert a.meta == b.meta
+
+    # A fraction of the JSON size.
+    assert (tmp_path / "stats_12__custom.gtstats").stat().st_size * 5 < (tmp_path / "stats_12__custom.json").stat().st_size
+
+
+def test_format_is_detected_from_content(tmp_path):
+    # A binary payload under a .json name still loads; plain JSON is the fallback.
+    path = tmp_path / "stats.json"
+    path.write_bytes(encode_stats({"total_attempts": 3, "total_correct": 2, "meta": {"x": 1}}))
+    assert load_stats(str(path)).total_attempts == 3
+
+    path.write_text(json.dumps({"total_attempts": 4}), encoding="utf-8")
+    assert load_stats(str(path)).total_attempts == 4
+
+
+def test_truncated_binary_file_falls_back_to_defaults(tmp_path):
+    path = tmp_path / "stats.gtstats"
+    save_stats(str(path), _full_board_stats(6, 12))
+    path.write_bytes(path.read_bytes()[:-10])
+    assert load_stats(str(path)).total_attempts == 0
+
+    with pytest.raises(ValueError):
+        decode_stats(MAGIC + b"\x01")
+
+
+def test_binary_profile_deltas_and_compaction(tmp_path):
+    path = str(tmp_path / "stats.gtstats")
+    save_stats(path, _full_board_stats(6, 12))
+
+    stats = load_stats(path)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    save_stats(path, stats)
+    assert (tmp_path / "stats.gtstats.journal").exists()
+
+    compact_stats(path)
+    with open(path, "rb") as f:
+        doc = decode_stats(f.read())
+    assert doc["total_attempts"] == 6 * 13 + 2
+    assert doc["by_position"].counts(0, 0) == (2, 1)
+    assert load_stats(path).total_attempts == 6 * 13 + 2
+
+
+def test_backend_setting_selects_binary_suffix(monkeypatch):
+    monkeypatch.setenv("GUITAR_TRAINER_STATS_BACKEND", "binary")
+    assert stats_file_suffix() == ".gtstats"
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+
+from guitar_trainer.core.stats import Stats, compact_stats, load_stats, save_stats
+from guitar_trainer.core.stats_journal import journal_path_for
+
+
+def _journal_lines(path: str) -> list:
+    with open(journal_path_for(path), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_delta_tracks_touched_buckets_only():
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    stats.record_attempt_mode_b(correct=True, note_name="G")
+
+    delta = stats.pending_delta()
+    assert (delta.attempts, delta.correct) == (3, 2)
+    assert delta.by_mode == {"A": [2, 1], "B": [1, 1]}
+    assert delta.by_note == {"E": [2, 1], "G": [1, 1]}
+    assert delta.by_position == {(0, 0): [2, 1]}
+
+
+def test_save_of_loaded_stats_appends_delta_record(tmp_path):
+    path = str(tmp_path / "stats.json")
+    base = Stats()
+    for f in range(12):
+        base.record_position_attempt(correct=True, note_name="E", string_index=0, fret=f)
+    save_stats(path, base)
+    snapshot_before = (tmp_path / "stats.json").read_text(encoding="utf-8")
+
+    stats = load_stats(path)
+    stats.record_position_attempt(correct=False, note_name="A", string_index=1, fret=0)
+    assert save_stats(path, stats)
+
+    # The snapshot is untouched; only the touched buckets were written.
+    assert (tmp_path / "stats.json").read_text(encoding="utf-8") == snapshot_before
+    (rec,) = [r for r in _journal_lines(path) if r[0] == "d"]
+    assert rec[1]["pos"] == {"1,0": [1, 0]}
+    assert rec[1]["note"] == {"A": [1, 0]}
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 13
+    assert loaded.by_position["1,0"] == {"attempts": 1, "correct": 0}
+
+    # Saving again without changes writes nothing new.
+    assert save_stats(path, stats)
+    assert len(_journal_lines(path)) == 2
+
+
+def test_merge_step_rebuilds_full_document(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats())
+
+    stats = load_stats(path)
+    stats.record_position_attempt(correct=True, note_name="C", string_index=1, fret=3)
+    stats.meta["tuning_name"] = "E Standard"
+    save_stats(path, stats)
+    stats.record_position_attempt(correct=True, note_name="C", string_index=1, fret=3)
+    save_stats(path, stats)
+
+    compact_stats(path)
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    assert doc["total_attempts"] == 2
+    assert doc["by_position"]["1,3"] == {"attempts": 2, "correct": 2}
+    assert doc["meta"]["tuning_name"] == "E Standard"
+
+
+def test_mark_persisted_keeps_newer_increments():
+    stats = Stats()
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    taken = stats.pending_delta()
+    stats.record_attempt_mode_b(correct=False, note_name="C")
+
+    stats.mark_persisted(taken, "stats.json")
+    left = stats.pending_delta()
+    assert (left.attempts, left.correct) == (1, 0)
+    assert left.by_note == {"C": [1, 0]}
+
+
+def test_sqlite_save_of_loaded_stats_upserts_touched_rows_only(tmp_path):
+    path = str(tmp_path / "stats.sqlite")
+    base = Stats()
+    base.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    base.record_position_attempt(correct=True, note_name="F", string_index=0, fret=1)
+    save_stats(path, base)
+
+    stats = load_stats(path)
+    stats.record_position_attempt(correct=False, note_name="F", string_index=0, fret=1)
+
+    # An untouched row changed behind our back must survive a delta save.
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE by_position SET attempts = 7 WHERE string_index = 0 AND fret = 0")
+    save_stats(path, stats)
+
+    loaded = load_stats(path)
+    assert loaded.by_position["0,0"]["attempts"] == 7
+    assert loaded.by_position["0,1"] == {"attempts": 2, "correct": 1}
@@ -0,0 +1,72 @@
+import json
+
+import guitar_trainer.core.stats as stats_mod
+from guitar_trainer.core.stats import Stats, delete_stats, list_stats_profiles, load_stats, save_stats
+from guitar_trainer.core.stats_index import INDEX_NAME, index_is_fresh, read_index
+
+
+def _profile(num_strings: int, attempts: int) -> Stats:
+    stats = Stats(meta={"num_strings": num_strings, "tuning_name": "Standard"})
+    for i in range(attempts):
+        stats.record_attempt_mode_b(correct=i % 2 == 0, note_name="E")
+    return stats
+
+
+def _no_file_reads(monkeypatch):
+    def fail(path):
+        raise AssertionError(f"profile {path} was opened")
+
+    monkeypatch.setattr(stats_mod, "load_stats_summary", fail)
+
+
+def test_listing_builds_and_then_uses_manifest(tmp_path, monkeypatch):
+    d = str(tmp_path)
+    save_stats(str(tmp_path / "stats_6__standard.json"), _profile(6, 3))
+    save_stats(str(tmp_path / "stats_7__standard.gtstats"), _profile(7, 4))
+    (tmp_path / "notes.txt").write_text("not a profile", encoding="utf-8")
+
+    first = list_stats_profiles(d)
+    assert [s.total_attempts for _p, s in first] == [3, 4]
+    assert (tmp_path / INDEX_NAME).exists()
+    assert index_is_fresh(d)
+
+    _no_file_reads(monkeypatch)
+    again = list_stats_profiles(d)
+    assert again == first
+    assert again[1][1].meta == {"num_strings": 7, "tuning_name": "Standard"}
+    entry = read_index(d)["stats_6__standard.json"]
+    assert set(entry) >= {"num_strings", "tuning_name", "total_attempts", "total_correct", "mtime", "hash"}
+
+
+def test_save_and_delete_keep_manifest_fresh(tmp_path, monkeypatch):
+    d = str(tmp_path)
+    path = str(tmp_path / "stats_6__standard.json")
+    other = str(tmp_path / "stats_7__standard.json")
+    save_stats(path, _profile(6, 3))
+    save_stats(other, _profile(7, 1))
+    list_stats_profiles(d)
+
+    stats = load_stats(path)
+    stats.record_attempt_mode_b(correct=True, note_name="A")
+    save_stats(path, stats)  # appends a delta and creates the journal file
+    save_stats(other, _profile(7, 5))  # full snapshot rewrite
+    delete_stats(other)
+    assert index_is_fresh(d)
+
+    _no_file_reads(monkeypatch)
+    ((p, summary),) = list_stats_profiles(d)
+    assert p.endswith("stats_6__standard.json")
+    assert summary.total_attempts == 4
+
+
+def test_directory_changes_trigger_rescan(tmp_path):
+    d = str(tmp_path)
+    save_stats(str(tmp_path / "stats_6__standard.json"), _profile(6, 3))
+    list_stats_profiles(d)
+
+    # Written by something that does not maintain the manifest.
+    (tmp_path / "stats_8__standard.json").write_text(json.dumps({"total_attempts": 9}), encoding="utf-8")
+    assert not index_is_fresh(d)
+    assert read_index(d) is None
+    assert [s.total_attempts for _p, s in list_stats_profiles(d)] == [3, 9]
+    assert index_is_fresh(d)
@@ -0,0 +1,104 @@
+import json
+import os
+
+from guitar_trainer.core.stats import Stats, compact_stats, list_stats_profiles, load_stats, save_stats
+from guitar_trainer.core.stats_journal import compacting_path_for, journal_path_for
+
+
+def test_journal_appends_and_replays(tmp_path):
+    path = str(tmp_path / "stats_6__e_standard.json")
+
+    stats = load_stats(path, journal=True)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    stats.meta["num_strings"] = 6
+    save_stats(path, stats)
+
+    # A new profile gets its snapshot on the first save.
+    assert os.path.exists(path)
+    assert not os.path.exists(journal_path_for(path))
+
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    stats.record_attempt_mode_b(correct=False, note_name="F")
+    save_stats(path, stats)
+    with open(journal_path_for(path), encoding="utf-8") as f:
+        assert len(f.readlines()) == 3  # header + 2 attempts
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 3
+    assert loaded.total_correct == 2
+    assert loaded.by_mode["B"]["attempts"] == 1
+    assert loaded.by_position["0,0"]["correct"] == 2
+    assert loaded.meta["num_strings"] == 6
+
+
+def test_first_save_of_a_new_profile_is_listed(tmp_path):
+    for journal in (True, False):
+        path = str(tmp_path / f"stats_6__{'journal' if journal else 'delta'}.json")
+        stats = load_stats(path, journal=journal)
+        stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+        assert save_stats(path, stats)
+        assert load_stats(path).total_attempts == 1
+
+    listed = {os.path.basename(p): s.total_attempts for p, s in list_stats_profiles(str(tmp_path))}
+    assert listed == {"stats_6__delta.json": 1, "stats_6__journal.json": 1}
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "stats.json")
+
+    stats = load_stats(path, journal=True)
+    for _ in range(3):
+        stats.record_position_attempt(correct=True, note_name="A", string_index=1, fret=0)
+    save_stats(path, stats)
+
+    compact_stats(path, journal=stats.journal)
+    assert os.path.exists(path)
+    assert not os.path.exists(journal_path_for(path))
+    assert not os.path.exists(compacting_path_for(path))
+
+    # Appends after compaction go to a fresh journal.
+    stats.record_position_attempt(correct=False, note_name="A", string_index=1, fret=0)
+    save_stats(path, stats)
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 4
+    assert loaded.by_position["1,0"] == {"attempts": 4, "correct": 3}
+
+
+def test_interrupted_compaction_is_not_replayed_twice(tmp_path):
+    path = str(tmp_path / "stats.json")
+
+    stats = load_stats(path, journal=True)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    save_stats(path, stats)
+    compact_stats(path, journal=stats.journal)
+
+    # Simulate a crash after the snapshot was written but before the folded
+    # journal was removed: put the folded file back.
+    with open(path, encoding="utf-8") as f:
+        folded_id = json.load(f)["journal_folded"][0]
+    with open(compacting_path_for(path), "w", encoding="utf-8") as f:
+        f.write(json.dumps(["j", folded_id]) + "\n")
+        f.write(json.dumps(["a", "A", 1, "E", 0, 0]) + "\n")
+
+    assert load_stats(path).total_attempts == 1
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    path = str(tmp_path / "stats.json")
+    with open(journal_path_for(path), "w", encoding="utf-8") as f:
+        f.write('["a","A",1,"E",0,0]\n["a","A",1,"E",0')
+
+    assert load_stats(path).total_attempts == 1
+
+
+def test_full_save_retires_journal(tmp_path):
+    path = str(tmp_path / "stats.json")
+
+    stats = load_stats(path, journal=True)
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    save_stats(path, stats)
+
+    save_stats(path, Stats())
+    assert not os.path.exists(journal_path_for(path))
+    assert load_stats(path).total_attempts == 0
@@ -0,0 +1,94 @@
+import multiprocessing
+
+import pytest
+
+import guitar_trainer.core.stats as stats_mod
+from guitar_trainer.core.file_lock import fcntl, file_lock
+from guitar_trainer.core.stats import Stats, compact_stats, load_stats, save_stats
+
+
+def _drill(path: str, rounds: int, journal: bool) -> None:
+    # Tiny threshold so the two processes also race journal compactions.
+    stats_mod.JOURNAL_COMPACT_BYTES = 200
+    stats = load_stats(path, journal=journal)
+    for i in range(rounds):
+        stats.record_position_attempt(correct=i % 2 == 0, note_name="E", string_index=0, fret=i % 5)
+        assert save_stats(path, stats)
+    if stats.journal is not None:
+        stats.journal.close()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+@pytest.mark.parametrize("name,journal", [("stats.json", False), ("stats.json", True), ("stats.gtstats", False), ("stats.sqlite", False)])
+def test_concurrent_processes_do_not_lose_attempts(tmp_path, name, journal):
+    path = str(tmp_path / name)
+    save_stats(path, Stats(total_attempts=5, total_correct=5))
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_drill, args=(path, 40, journal)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    if not name.endswith(".sqlite"):
+        compact_stats(path)
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 85
+    assert loaded.total_correct == 45
+    assert sum(loaded.by_position[f"0,{f}"]["attempts"] for f in range(5)) == 80
+
+
+def test_sqlite_saves_merge_with_other_writers(tmp_path):
+    path = str(tmp_path / "stats.sqlite")
+    save_stats(path, Stats())
+
+    a = load_stats(path)
+    b = load_stats(path)
+    a.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    b.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    b.meta["tuning_name"] = "E Standard"
+    save_stats(path, a)
+    save_stats(path, b)
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 2
+    assert loaded.by_position["0,0"] == {"attempts": 2, "correct": 1}
+    assert loaded.by_note["E"] == {"attempts": 2, "correct": 1}
+    assert loaded.meta["tuning_name"] == "E Standard"
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    path = str(tmp_path / "stats.json")
+    lock_file = tmp_path / ".locks" / "stats.json.lock"
+    with file_lock(path):
+        with file_lock(path):
+            assert lock_file.exists()
+        assert lock_file.exists()
+    assert lock_file.exists() == (fcntl is None)
+
+
+def _bump(path: str, rounds: int) -> None:
+    for _ in range(rounds):
+        with file_lock(path):
+            with open(path) as f:
+                n = int(f.read())
+            with open(path, "w") as f:
+                f.write(str(n + 1))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_file_lock_excludes_processes_while_removing_its_file(tmp_path):
+    path = str(tmp_path / "counter")
+    with open(path, "w") as f:
+        f.write("0")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_bump, args=(path, 200)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    with open(path) as f:
+        assert int(f.read()) == 600
@@ -0,0 +1,91 @@
+import json
+import sqlite3
+
+from guitar_trainer.app import main
+from guitar_trainer.core.stats import Stats, load_stats, save_stats, upgrade_stats_file
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION, migrate_directory, migrate_document
+
+LEGACY = {
+    "total_attempts": "7",
+    "total_correct": 5,
+    "by_mode": {"a": {"attempts": 4, "correct": 3}, "A": {"attempts": 2}, "x": "junk"},
+    "by_note": {"E": {"attempts": 7, "correct": -1}},
+    "by_position": {"0, 3": {"attempts": 2, "correct": 1}, "0,3": {"attempts": 1, "correct": 1}, "bad": {}, "-1,0": {}},
+    "meta": None,
+}
+
+
+def test_v1_document_is_normalized():
+    doc = migrate_document(LEGACY)
+    assert doc["schema_version"] == SCHEMA_VERSION
+    assert list(doc)[:4] == ["schema_version", "total_attempts", "total_correct", "meta"]
+    assert doc["total_attempts"] == 7
+    assert doc["by_mode"] == {"A": {"attempts": 6, "correct": 3}, "B": {"attempts": 0, "correct": 0}}
+    assert doc["by_note"]["E"] == {"attempts": 7, "correct": 0}
+    assert doc["by_position"] == {"0,3": {"attempts": 3, "correct": 2}}
+    assert doc["meta"] == {}
+
+    # Current documents pass through untouched.
+    assert migrate_document(doc) is doc
+
+
+def test_legacy_file_is_migrated_on_load_and_upgraded_on_save(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text(json.dumps(LEGACY), encoding="utf-8")
+
+    stats = load_stats(str(path))
+    assert stats.total_attempts == 7
+    assert stats.by_position["0,3"] == {"attempts": 3, "correct": 2}
+    assert stats.by_mode["B"] == {"attempts": 0, "correct": 0}
+    assert json.loads(path.read_text(encoding="utf-8")) == LEGACY
+
+    stats.record_attempt_mode_b(correct=True, note_name="E")
+    assert save_stats(str(path), stats)
+    on_disk = json.loads(path.read_text(encoding="utf-8"))
+    assert on_disk["schema_version"] == SCHEMA_VERSION
+    assert on_disk["by_position"] == {"0,3": {"attempts": 3, "correct": 2}}
+    assert load_stats(str(path)).total_attempts == 8
+
+
+def test_newer_documents_are_not_downgraded(tmp_path):
+    path = tmp_path / "stats.json"
+    newer = {"schema_version": SCHEMA_VERSION + 1, "total_attempts": 2, "total_correct": 1, "future": [1]}
+    path.write_text(json.dumps(newer), encoding="utf-8")
+
+    assert load_stats(str(path)).total_attempts == 2
+    assert json.loads(path.read_text(encoding="utf-8")) == newer
+
+
+def test_migrate_directory_in_parallel(tmp_path, capsys):
+    for name in ("stats.json", "stats_6__e_standard.json", "stats_7__b_standard.json"):
+        (tmp_path / name).write_text(json.dumps(LEGACY), encoding="utf-8")
+    (tmp_path / "stats_bad.json").write_text("{oops", encoding="utf-8")
+
+    results = migrate_directory(str(tmp_path), jobs=2)
+    assert results[str(tmp_path / "stats_bad.json")].startswith("failed")
+    assert sorted(results.values())[1:] == ["upgraded"] * 3
+
+    (tmp_path / "stats_bad.json").unlink()
+    assert main(["migrate", str(tmp_path), "--jobs", "2"]) == 0
+    out = capsys.readouterr().out
+    assert out.count("current") == 3
+
+
+def test_sqlite_note_rows_are_merged_by_migrate(tmp_path, capsys):
+    path = tmp_path / "stats_6__e_standard.sqlite"
+    save_stats(str(path), Stats())
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("PRAGMA user_version = 0")
+        conn.executemany(
+            "INSERT INTO by_note (note, attempts, correct) VALUES (?, ?, ?)",
+            [("C#", 2, 1), ("Db", 3, 3), ("Xy", 1, 1)],
+        )
+
+    assert load_stats(str(path)).by_note["C#"] == {"attempts": 5, "correct": 4}
+
+    assert main(["migrate", str(tmp_path)]) == 0
+    assert "upgraded" in capsys.readouterr().out
+    with sqlite3.connect(str(path)) as conn:
+        assert conn.execute("SELECT note, attempts, correct FROM by_note").fetchall() == [("C#", 5, 4)]
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert not upgrade_stats_file(str(path))
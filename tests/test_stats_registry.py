@@ -0,0 +1,72 @@
+import json
+
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+from guitar_trainer.core.stats_registry import StatsRegistry
+
+
+def _counting_loader(calls):
+    def load(path, *, journal=False):
+        calls.append(path)
+        return load_stats(path, journal=journal)
+
+    return load
+
+
+def test_same_live_object_until_file_changes(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats(total_attempts=2))
+    calls = []
+    reg = StatsRegistry(load=_counting_loader(calls))
+
+    stats = reg.get(path)
+    assert reg.get(path) is stats
+    assert reg.cached(path) is stats
+
+    # Our own saves keep the object current.
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    assert reg.get(path) is stats  # unsaved changes are newer than the file
+    save_stats(path, stats)
+    assert reg.get(path) is stats
+    assert calls == [path]
+
+    # Someone else rewrote the file: the next get() re-reads it.
+    (tmp_path / "stats.json").write_text(json.dumps({"total_attempts": 40}), encoding="utf-8")
+    assert reg.cached(path) is None
+    fresh = reg.get(path)
+    # 40 from the new snapshot + our delta still in the journal.
+    assert fresh is not stats and fresh.total_attempts == 41
+    assert len(calls) == 2
+
+
+def test_lru_bound_and_put(tmp_path):
+    calls = []
+    reg = StatsRegistry(max_entries=2, load=_counting_loader(calls))
+    a, b, c = (str(tmp_path / f"stats_{n}.json") for n in "abc")
+
+    sa = reg.get(a)
+    reg.get(b)
+    reg.get(a)  # a is now most recently used
+    reg.get(c)  # evicts b
+    assert reg.cached(a) is sa
+    assert reg.cached(b) is None
+
+    reset = Stats()
+    reg.put(a, reset)
+    assert reg.get(a) is reset
+    assert calls == [a, b, c]
+
+
+def test_journal_is_attached_to_clean_cached_stats(tmp_path):
+    path = str(tmp_path / "stats.json")
+    save_stats(path, Stats())
+    reg = StatsRegistry()
+
+    stats = reg.get(path)
+    assert stats.journal is None
+    assert reg.get(path, journal=True) is stats
+    assert stats.journal is not None and stats.journal.stats_path == path
+
+    stats.record_attempt_mode_b(correct=True, note_name="D")
+    save_stats(path, stats)
+    assert reg.get(path) is stats
+    assert load_stats(path).total_attempts == 1
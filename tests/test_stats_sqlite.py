@@ -0,0 +1,83 @@
+import sqlite3
+
+from guitar_trainer.core.stats import Stats, delete_stats, load_stats, save_stats, stats_file_suffix
+from guitar_trainer.core.stats_migrate import SCHEMA_VERSION
+from guitar_trainer.core.stats_sqlite import read_sqlite_stats, read_sqlite_summary
+
+
+def _sample_stats() -> Stats:
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    stats.record_position_attempt(correct=True, note_name="F#", string_index=1, fret=9, mode="C")
+    stats.record_attempt_mode_b(correct=False, note_name="G")
+    stats.meta = {"num_strings": 6, "tuning_name": "E Standard", "tuning": [4, 9, 2, 7, 11, 4]}
+    return stats
+
+
+def test_sqlite_roundtrip(tmp_path):
+    path = str(tmp_path / "stats_6__e_standard.sqlite")
+    save_stats(path, _sample_stats())
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 4
+    assert loaded.total_correct == 2
+    assert loaded.by_mode["C"] == {"attempts": 1, "correct": 1}
+    assert loaded.by_note["E"] == {"attempts": 2, "correct": 1}
+    assert loaded.by_position["0,0"] == {"attempts": 2, "correct": 1}
+    assert loaded.meta["tuning"] == [4, 9, 2, 7, 11, 4]
+
+
+def test_sqlite_summary_read(tmp_path):
+    path = str(tmp_path / "stats.db")
+    save_stats(path, _sample_stats())
+
+    summary = read_sqlite_summary(path)
+    assert summary["total_attempts"] == 4
+    assert summary["meta"]["tuning_name"] == "E Standard"
+
+
+def test_sqlite_files_record_their_schema_version(tmp_path):
+    path = str(tmp_path / "stats.sqlite")
+    stats = load_stats(path)
+    stats.record_attempt_mode_b(correct=True, note_name="E")
+    save_stats(path, stats)  # a delta save creates the file
+    assert read_sqlite_summary(path)["schema_version"] == SCHEMA_VERSION
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA user_version = 0")
+    assert read_sqlite_stats(path)["schema_version"] == 1
+
+    save_stats(path, _sample_stats())
+    assert read_sqlite_stats(path)["schema_version"] == SCHEMA_VERSION
+
+
+def test_sqlite_save_replaces_removed_buckets(tmp_path):
+    path = str(tmp_path / "stats.sqlite")
+    save_stats(path, _sample_stats())
+    save_stats(path, Stats())
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 0
+    assert "0,0" not in loaded.by_position
+    assert "E" not in loaded.by_note
+
+
+def test_sqlite_missing_file_gives_defaults(tmp_path):
+    path = tmp_path / "missing.sqlite"
+    assert load_stats(str(path)).total_attempts == 0
+    assert not path.exists()
+
+
+def test_backend_setting_selects_suffix(monkeypatch):
+    monkeypatch.delenv("GUITAR_TRAINER_STATS_BACKEND", raising=False)
+    assert stats_file_suffix() == ".json"
+    monkeypatch.setenv("GUITAR_TRAINER_STATS_BACKEND", "sqlite")
+    assert stats_file_suffix() == ".sqlite"
+
+
+def test_delete_stats_removes_companions(tmp_path):
+    path = str(tmp_path / "stats.sqlite")
+    save_stats(path, _sample_stats())
+    delete_stats(path)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from guitar_trainer.core.stats import Stats, compact_stats, load_stats, load_stats_summary, save_stats
+
+
+def _stats() -> Stats:
+    stats = Stats(meta={"num_strings": 7, "tuning_name": "B Standard"})
+    for f in range(20):
+        stats.record_position_attempt(correct=f % 2 == 0, note_name="B", string_index=6, fret=f)
+    return stats
+
+
+@pytest.mark.parametrize("name", ["stats.json", "stats.gtstats", "stats.sqlite"])
+def test_summary_matches_full_load(tmp_path, name):
+    path = str(tmp_path / name)
+    save_stats(path, _stats())
+
+    # Journaled and delta-saved attempts are part of the summary too.
+    stats = load_stats(path, journal=True)
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    stats.meta["tuning_name"] = "Drop A"
+    save_stats(path, stats)
+    stats = load_stats(path)
+    stats.record_attempt_mode_b(correct=False, note_name="C")
+    save_stats(path, stats)
+
+    full = load_stats(path)
+    summary = load_stats_summary(path)
+    assert (summary.total_attempts, summary.total_correct) == (full.total_attempts, full.total_correct) == (22, 11)
+    assert summary.meta == full.meta
+    assert summary.meta["tuning_name"] == "Drop A"
+
+    # After compaction the folded journal is not counted twice.
+    if not name.endswith(".sqlite"):
+        compact_stats(path)
+        assert load_stats_summary(path).total_attempts == 22
+
+
+def test_json_summary_stops_before_buckets(tmp_path):
+    path = tmp_path / "stats.json"
+    save_stats(str(path), _stats())
+    doc = path.read_text(encoding="utf-8")
+    # Corrupt the bucket maps: the summary never parses them.
+    head, _sep, _rest = doc.partition('"by_mode"')
+    path.write_text(head + '"by_mode": {not json', encoding="utf-8")
+
+    summary = load_stats_summary(str(path))
+    assert summary.total_attempts == 20
+    assert summary.meta["num_strings"] == 7
+
+
+def test_summary_of_old_layout_and_bad_files(tmp_path):
+    old = tmp_path / "old.json"
+    old.write_text(json.dumps({"total_attempts": 5, "total_correct": 4, "by_mode": {}, "meta": {"x": 1}}), encoding="utf-8")
+    summary = load_stats_summary(str(old))
+    assert (summary.total_attempts, summary.meta) == (5, {"x": 1})
+    assert summary.accuracy == 0.8
+
+    bad = tmp_path / "bad.json"
+    bad.write_text("{broken", encoding="utf-8")
+    assert load_stats_summary(str(bad)).total_attempts == 0
+    assert load_stats_summary(str(tmp_path / "missing.json")).total_attempts == 0
@@ -0,0 +1,121 @@
+import threading
+
+from guitar_trainer.core.device_counters import DEVICE_ID_ENV
+from guitar_trainer.core.session_log import SessionRecorder, read_sessions, save_session
+from guitar_trainer.core.stats import Stats, load_stats, save_stats
+from guitar_trainer.core.stats_writer import StatsWriter
+
+
+def test_burst_of_requests_is_coalesced_into_one_write():
+    calls: list[tuple[str, int]] = []
+    writer = StatsWriter(delay_sec=0.05, save=lambda p, st: calls.append((p, st.total_attempts)))
+    stats = Stats()
+
+    for _ in range(5):
+        stats.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+        writer.request_save("stats.json", stats)
+
+    assert writer.peek("stats.json") is stats
+    assert writer.wait(timeout=5)
+    assert calls == [("stats.json", 5)]
+    assert writer.peek("stats.json") is None
+    writer.close()
+
+
+def test_writer_saves_snapshot_not_live_object(tmp_path):
+    path = str(tmp_path / "stats.json")
+    seen: list[Stats] = []
+    writer = StatsWriter(delay_sec=0, save=lambda p, st: seen.append(st))
+    stats = Stats()
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+
+    writer.request_save(path, stats)
+    writer.wait(timeout=5)
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+
+    assert seen[0] is not stats
+    assert seen[0].total_attempts == 1
+    writer.close()
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    path = str(tmp_path / "stats.json")
+    writer = StatsWriter(delay_sec=10)
+    stats = Stats()
+    stats.record_position_attempt(correct=True, note_name="A", string_index=1, fret=0)
+
+    writer.request_save(path, stats)
+    writer.close(timeout=5)
+
+    assert load_stats(path).total_attempts == 1
+
+
+def test_recording_while_writing_is_safe(tmp_path):
+    path = str(tmp_path / "stats.json")
+    writer = StatsWriter(delay_sec=0)
+    stats = Stats()
+
+    def record() -> None:
+        for i in range(500):
+            stats.record_position_attempt(correct=i % 2 == 0, note_name="E", string_index=i % 6, fret=i % 13)
+
+    t = threading.Thread(target=record)
+    t.start()
+    for _ in range(20):
+        writer.request_save(path, stats)
+    t.join()
+    writer.request_save(path, stats)
+    writer.wait(timeout=5)
+    writer.close()
+
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 500
+    assert sum(b["attempts"] for b in loaded.by_position.values()) == 500
+
+
+def test_background_saves_claim_a_profile_from_another_device_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "stats.json")
+    monkeypatch.setenv(DEVICE_ID_ENV, "other")
+    other = Stats(meta={"device_id": "other"})
+    other.record_position_attempt(correct=True, note_name="E", string_index=0, fret=0)
+    assert save_stats(path, other)
+
+    monkeypatch.setenv(DEVICE_ID_ENV, "local")
+    writer = StatsWriter(delay_sec=0)
+    stats = load_stats(path)
+    for _ in range(3):
+        for _ in range(5):
+            stats.record_position_attempt(correct=True, note_name="F", string_index=0, fret=1)
+        writer.request_save(path, stats)
+        assert writer.wait(timeout=5)
+    writer.close()
+
+    assert stats.meta["device_id"] == "local"
+    assert not stats.has_unsaved_changes(path)
+    loaded = load_stats(path)
+    assert loaded.total_attempts == 16
+    slices = loaded.devices
+    assert "devices" not in loaded.meta
+    assert list(slices) == ["other"] and slices["other"].attempts == 1
+    assert (0, 1) not in slices["other"].by_position
+
+
+def test_sessions_are_appended_on_the_writer_thread(tmp_path):
+    path = str(tmp_path / "stats.json")
+    threads: list[str] = []
+    writer = StatsWriter(delay_sec=0)
+    real_append = writer._append
+    writer._append = lambda p, rec: (threads.append(threading.current_thread().name), real_append(p, rec))
+
+    stats = Stats()
+    rec = SessionRecorder("note_quiz")
+    stats.record_attempt_mode_b(correct=True, note_name="C")
+    rec.record(True, response_ms=800)
+    writer.request_save(path, stats)
+    assert save_session(path, rec, append=writer.request_session).answered == 1
+    assert writer.wait(timeout=5)
+    writer.close()
+
+    assert threads == ["stats-writer"]
+    assert [s.answered for s in read_sessions(path)] == [1]
+    assert load_stats(path).total_attempts == 1
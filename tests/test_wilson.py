@@ -0,0 +1,62 @@
+import pytest
+
+from guitar_trainer.core import stats as stats_module
+from guitar_trainer.core.stats import Stats
+from guitar_trainer.core.wilson import wilson_bounds
+
+
+def test_bounds_reflect_sample_size():
+    assert wilson_bounds(0, 0) == (0.0, 1.0)
+    lo1, hi1 = wilson_bounds(0, 1)
+    lo50, hi50 = wilson_bounds(0, 50)
+    assert lo1 == lo50 == 0.0
+    assert hi1 == pytest.approx(0.793, abs=1e-3)
+    assert hi50 == pytest.approx(0.071, abs=1e-3)
+    lo, hi = wilson_bounds(8, 16)
+    assert lo < 0.5 < hi and lo + hi == pytest.approx(1.0)
+
+
+def test_recorded_answers_only_invalidate_their_own_position(monkeypatch):
+    calls = []
+
+    def counting(correct, attempts):
+        calls.append((correct, attempts))
+        return wilson_bounds(correct, attempts)
+
+    monkeypatch.setattr(stats_module, "wilson_bounds", counting)
+    stats = Stats()
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+
+    lower, upper = stats.accuracy_bounds_grid(2, 2)
+    assert len(calls) == 6
+    assert (lower[0], upper[0]) == wilson_bounds(0, 1)
+    assert (lower[1], upper[1]) == (0.0, 1.0)
+
+    stats.accuracy_bounds_grid(2, 2)
+    assert len(calls) == 6
+
+    stats.record_position_attempt(correct=False, note_name="E", string_index=0, fret=0)
+    assert stats.accuracy_bounds(0, 0) == wilson_bounds(0, 2)
+    stats.accuracy_bounds_grid(2, 2)
+    assert len(calls) == 7
+
+
+def test_bounds_fall_back_to_lifetime_counts():
+    stats = Stats()
+    stats.by_position["1,3"] = {"attempts": 50, "correct": 0}
+    assert stats.accuracy_bounds(1, 3) == wilson_bounds(0, 50)
+
+
+def test_bounds_from_decayed_counts_widen_as_they_age(monkeypatch):
+    from guitar_trainer.core import recency
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(recency.time, "time", lambda: now[0])
+    stats = Stats()
+    for _ in range(20):
+        stats.recency.add(0, 0, False)
+    lo, hi = stats.accuracy_bounds(0, 0)
+    assert hi == pytest.approx(wilson_bounds(0, 20)[1])
+
+    now[0] += 4 * recency.HALF_LIFE_SEC
+    assert stats.accuracy_bounds(0, 0)[1] > hi